@@ -2,26 +2,68 @@
 """
 analyze.py — Lee los CSVs de benchmarks y genera gráficas PNG.
 
-Uso: python3 analyze.py
-Requiere: matplotlib (pip install matplotlib)
-Lee de: results/exp1_startup.csv, results/exp2_scale.csv, results/exp3_runtime.csv
-Escribe en: results/*.png e images/*.png
+Uso: python3 analyze.py [-j PROCESOS] [-f]
+     python3 analyze.py --compare BASE NUEVO [...] [--threshold PCT] [--alpha A]
+     python3 analyze.py --runs | --history
+Requiere: numpy; matplotlib para las gráficas (pip install -r requirements.txt)
+Código de salida: 1 si --compare encuentra regresiones, 2 si falta una
+dependencia o los argumentos no son válidos
+Lee de: results/exp1_startup.csv, results/exp2_scale.csv, results/exp3_runtime.csv,
+        results/exp4_nested.csv, results/exp5_concurrency.csv (una sola vez,
+        ver results_store.py)
+Estadística (medianas, cuartiles, IC bootstrap, outliers, percentiles):
+bench_stats.py
+Escribe en: results/*.png e images/*.png (cada figura se dibuja en paralelo
+            y se rasteriza una sola vez)
+
+Con --compare no se dibuja nada: se comparan corridas guardadas en
+directorios o en el historial results/archive.db (@ID, ver
+results_archive.py y compare_results.py) y el código de salida es 1 si
+hay alguna regresión. --runs lista el historial y --history muestra
+la mediana de cada configuración corrida a corrida.
+
+Solo se redibujan las gráficas cuyo CSV o código cambió desde la última
+vez (results/.plots_manifest.json); -f las redibuja todas.
 """
 
-import csv
-import statistics
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Código de salida para errores de instalación; 1 queda para "hay
+# regresiones" en --compare
+EXIT_SETUP = 2
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy no está instalado.")
+    print("Instálalo con: pip install -r requirements.txt")
+    sys.exit(EXIT_SETUP)
+
+import bench_stats
+import compare_results
+import results_store
+from bench_stats import BenchStats
+from results_archive import Archive
+from results_store import ResultStore
+
+# matplotlib solo hace falta para dibujar: --compare, --runs y --history
+# funcionan sin él (main() avisa si falta al generar gráficas)
 try:
     import matplotlib
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
     import matplotlib.ticker as ticker
 except ImportError:
-    print("Error: matplotlib no está instalado.")
-    print("Instálalo con: pip install matplotlib")
-    sys.exit(1)
+    matplotlib = plt = ticker = None
 
 RESULTS_DIR = Path(__file__).parent / "results"
 IMAGES_DIR = Path(__file__).parent.parent / "images"
@@ -44,27 +86,22 @@ LABELS = {
 }
 
 
-def read_csv(filename):
-    """Lee un CSV y retorna una lista de diccionarios."""
-    filepath = RESULTS_DIR / filename
-    if not filepath.exists():
-        print(f"  Archivo no encontrado: {filepath}")
-        return []
-    with open(filepath) as f:
-        return list(csv.DictReader(f))
-
-
 def save_fig(fig, name):
-    """Guarda una figura como PNG en results/ y en images/."""
-    path = RESULTS_DIR / name
-    fig.savefig(path, dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
-    print(f"  Guardado: {path}")
-    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-    img_path = IMAGES_DIR / name
-    fig.savefig(img_path, dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
-    print(f"  Guardado: {img_path}")
+    """
+    Guarda una figura como PNG en results/ y en images/. Se rasteriza una
+    sola vez en memoria y los mismos bytes se escriben en ambos lugares.
+    Retorna las rutas escritas.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight", facecolor="#1a1a2e")
     plt.close(fig)
 
+    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+    paths = [RESULTS_DIR / name, IMAGES_DIR / name]
+    for path in paths:
+        path.write_bytes(buf.getvalue())
+    return paths
+
 
 def style_ax(ax, title, ylabel):
     """Aplica estilo consistente a un eje."""
@@ -76,34 +113,17 @@ def style_ax(ax, title, ylabel):
         spine.set_color("#333")
 
 
-def median_iqr(values):
-    """Retorna mediana, Q1, Q3."""
-    if not values:
-        return 0, 0, 0
-    med = statistics.median(values)
-    q1 = statistics.median(sorted(values)[:len(values) // 2]) if len(values) > 1 else med
-    q3 = statistics.median(sorted(values)[-(len(values) // 2):]) if len(values) > 1 else med
-    return med, q1, q3
+def overhead_label(ov):
+    """Texto de un overhead: '+4.2%', con '(ruido)' si su IC 95% contiene 0."""
+    text = f"{ov['pct']:+.1f}%"
+    return text if ov["significant"] else text + "\n(ruido)"
 
 
-def plot_exp1_startup():
+def plot_exp1_startup(table):
     """Exp 1: Grouped bar chart — 5 bars (bare, docker/ubuntu, docker/alpine,
     podman/ubuntu, podman/alpine), median + IQR whiskers."""
-    rows = read_csv("exp1_startup.csv")
-    if not rows:
-        return
-
     # Group by (runtime, image)
-    data = {}
-    for row in rows:
-        key = (row["runtime"], row["image"])
-        try:
-            data.setdefault(key, []).append(float(row["startup_ms"]))
-        except (ValueError, KeyError):
-            continue
-
-    if not data:
-        return
+    data = table.groups("startup_ms", "runtime", "image")
 
     # Order: bare, docker/ubuntu, docker/alpine, podman/ubuntu, podman/alpine
     order = [
@@ -119,16 +139,11 @@ def plot_exp1_startup():
         else:
             labels.append(f"{rt.title()}\n{img.title()}")
 
-    medians = []
-    q1s = []
-    q3s = []
-    colors = []
-    for k in keys:
-        med, q1, q3 = median_iqr(data[k])
-        medians.append(med)
-        q1s.append(q1)
-        q3s.append(q3)
-        colors.append(COLORS.get(k[0], "#aaa"))
+    summary = BenchStats(data).summary()
+    medians = [summary[k]["median"] for k in keys]
+    q1s = [summary[k]["q1"] for k in keys]
+    q3s = [summary[k]["q3"] for k in keys]
+    colors = [COLORS.get(k[0], "#aaa") for k in keys]
 
     # Whisker errors: lower = med - q1, upper = q3 - med
     yerr_low = [m - q for m, q in zip(medians, q1s)]
@@ -150,33 +165,19 @@ def plot_exp1_startup():
     ax.set_xticklabels(labels, fontsize=10, color="white")
     style_ax(ax, "Exp 1: Startup Latency (mediana + IQR)", "Tiempo (ms)")
 
-    save_fig(fig, "exp1_startup.png")
+    return save_fig(fig, "exp1_startup.png")
 
 
-def plot_exp2_scale():
+def plot_exp2_scale(table):
     """Exp 2: 2 panels — launch time vs N (lines), per-container KB + daemon RSS."""
-    rows = read_csv("exp2_scale.csv")
-    if not rows:
-        return
-
-    data = {}
-    for row in rows:
-        rt = row["runtime"]
-        try:
-            count = int(row["count"])
-            launch = float(row["launch_time_s"])
-            per_kb = float(row["per_container_kb"])
-            daemon_kb = float(row["daemon_rss_kb"])
-        except (ValueError, KeyError):
-            continue
-        data.setdefault(rt, {"counts": [], "launch": [], "per_kb": [], "daemon_kb": []})
-        data[rt]["counts"].append(count)
-        data[rt]["launch"].append(launch)
-        data[rt]["per_kb"].append(per_kb)
-        data[rt]["daemon_kb"].append(daemon_kb)
-
-    if not data:
-        return
+    launch = table.groups("launch_time_s", "runtime")
+    per_kb = table.groups("per_container_kb", "runtime")
+    daemon_kb = table.groups("daemon_rss_kb", "runtime")
+    data = {
+        rt: {"counts": counts, "launch": launch[rt],
+             "per_kb": per_kb[rt], "daemon_kb": daemon_kb[rt]}
+        for rt, counts in table.groups("count", "runtime").items()
+    }
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
 
@@ -244,26 +245,15 @@ def plot_exp2_scale():
     ax2.legend(h1 + h2, l1 + l2, facecolor="#16213e", edgecolor="#333",
                labelcolor="white", fontsize=8, loc="upper left")
 
-    save_fig(fig, "exp2_scale.png")
+    return save_fig(fig, "exp2_scale.png")
 
 
-def plot_exp3_runtime():
+def plot_exp3_runtime(table):
     """Exp 3: 2 panels — grouped bars per workload + overhead % comparison."""
-    rows = read_csv("exp3_runtime.csv")
-    if not rows:
-        return
-
     # Group by (runtime, workload)
-    data = {}
-    for row in rows:
-        key = (row["runtime"], row["workload"])
-        try:
-            data.setdefault(key, []).append(float(row["time_s"]))
-        except (ValueError, KeyError):
-            continue
-
-    if not data:
-        return
+    data = table.groups("time_s", "runtime", "workload")
+    stats = BenchStats(data)
+    summary = stats.summary()
 
     workloads = ["hash", "sort"]
     runtimes = ["bare", "docker", "podman"]
@@ -278,10 +268,9 @@ def plot_exp3_runtime():
         x_base = wi * (len(runtimes) + 1)
         for ri, rt in enumerate(runtimes):
             key = (rt, wl)
-            vals = data.get(key, [])
-            if not vals:
+            if key not in stats:
                 continue
-            med = statistics.median(vals)
+            med = summary[key]["median"]
             x_pos = x_base + ri
             bar = ax.bar(x_pos, med, width=0.7,
                          color=COLORS.get(rt, "#aaa"),
@@ -309,63 +298,52 @@ def plot_exp3_runtime():
     ax1.legend(handles=legend_elements, facecolor="#16213e",
                edgecolor="#333", labelcolor="white")
 
-    # Panel 2: Overhead % per workload
+    # Panel 2: Overhead % per workload, con IC 95% bootstrap
     overhead_data = {}
     for wl in workloads:
-        bare_vals = data.get(("bare", wl), [])
-        if not bare_vals:
-            continue
-        bare_med = statistics.median(bare_vals)
-        for rt in ["docker", "podman"]:
-            vals = data.get((rt, wl), [])
-            if not vals:
-                continue
-            med = statistics.median(vals)
-            pct = ((med - bare_med) / bare_med) * 100
-            overhead_data.setdefault(rt, {})[wl] = pct
+        ratios = stats.overhead(("bare", wl), [(rt, wl) for rt in ["docker", "podman"]])
+        for (rt, _), ov in ratios.items():
+            overhead_data.setdefault(rt, {})[wl] = ov
 
     x = list(range(len(workloads)))
+    no_data = {"pct": 0, "ci_low": 0, "ci_high": 0, "significant": True}
     for ri, rt in enumerate(["docker", "podman"]):
         if rt not in overhead_data:
             continue
-        vals = [overhead_data[rt].get(wl, 0) for wl in workloads]
+        ovs = [overhead_data[rt].get(wl, no_data) for wl in workloads]
+        vals = [ov["pct"] for ov in ovs]
         offset = (ri - 0.5) * width * 2
         bars = ax2.bar([xi + offset for xi in x], vals,
                        width=width * 2, label=LABELS[rt],
-                       color=COLORS.get(rt), edgecolor="#333", linewidth=0.5)
-        for bar, val in zip(bars, vals):
-            y_pos = bar.get_height() if val >= 0 else bar.get_height() - 1.5
-            ax2.text(bar.get_x() + bar.get_width() / 2, y_pos + 0.5,
-                     f"{val:+.1f}%", ha="center", va="bottom",
+                       color=COLORS.get(rt), edgecolor="#333", linewidth=0.5,
+                       yerr=[[ov["pct"] - ov["ci_low"] for ov in ovs],
+                             [ov["ci_high"] - ov["pct"] for ov in ovs]],
+                       capsize=5, error_kw={"ecolor": "white", "linewidth": 1.2})
+        # Etiqueta fuera del intervalo: arriba si es positivo, abajo si no
+        for bar, ov in zip(bars, ovs):
+            above = ov["pct"] >= 0
+            ax2.text(bar.get_x() + bar.get_width() / 2,
+                     ov["ci_high"] + 0.5 if above else ov["ci_low"] - 0.5,
+                     overhead_label(ov), ha="center", va="bottom" if above else "top",
                      color="white", fontsize=10, fontweight="bold")
+    ax2.margins(y=0.2)
 
     ax2.axhline(y=0, color="#666", linewidth=0.8, linestyle="--")
     ax2.set_xticks(x)
     ax2.set_xticklabels([workload_labels[wl] for wl in workloads],
                         color="white", fontsize=11)
     ax2.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white")
-    style_ax(ax2, "Overhead vs Bare Metal (%)", "Overhead (%)")
+    style_ax(ax2, "Overhead vs Bare Metal (%, IC 95%)", "Overhead (%)")
 
-    save_fig(fig, "exp3_runtime.png")
+    return save_fig(fig, "exp3_runtime.png")
 
 
-def plot_exp4_nested():
+def plot_exp4_nested(table):
     """Exp 4: 2 panels — startup latency (bars) + CPU overhead (bars) at nesting levels."""
-    rows = read_csv("exp4_nested.csv")
-    if not rows:
-        return
-
     # Group by (method, metric)
-    data = {}
-    for row in rows:
-        key = (row["method"], row["metric"])
-        try:
-            data.setdefault(key, []).append(float(row["value"]))
-        except (ValueError, KeyError):
-            continue
-
-    if not data:
-        return
+    data = table.groups("value", "method", "metric")
+    stats = BenchStats(data)
+    summary = stats.summary()
 
     methods = ["bare", "docker", "dind", "podman", "podman-nested"]
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
@@ -377,9 +355,9 @@ def plot_exp4_nested():
     startup_yerr_lo = []
     startup_yerr_hi = []
     for m in methods:
-        vals = data.get((m, "startup_ms"), [])
-        if vals:
-            med, q1, q3 = median_iqr(vals)
+        if (m, "startup_ms") in stats:
+            s = summary[(m, "startup_ms")]
+            med, q1, q3 = s["median"], s["q1"], s["q3"]
             startup_meds.append(med)
             startup_yerr_lo.append(med - q1)
             startup_yerr_hi.append(q3 - med)
@@ -416,9 +394,9 @@ def plot_exp4_nested():
     cpu_yerr_lo = []
     cpu_yerr_hi = []
     for m in methods:
-        vals = data.get((m, "cpu_s"), [])
-        if vals:
-            med, q1, q3 = median_iqr(vals)
+        if (m, "cpu_s") in stats:
+            s = summary[(m, "cpu_s")]
+            med, q1, q3 = s["median"], s["q1"], s["q3"]
             cpu_meds.append(med)
             cpu_yerr_lo.append(med - q1)
             cpu_yerr_hi.append(q3 - med)
@@ -438,10 +416,10 @@ def plot_exp4_nested():
                     yerr=[cpu_yerr_lo, cpu_yerr_hi], capsize=5,
                     error_kw={"color": "white", "linewidth": 1.2})
 
-    bare_med = cpu_meds[0] if cpu_meds[0] > 0 else 1
-    for bar, med in zip(bars2, cpu_meds):
-        pct = ((med - bare_med) / bare_med) * 100
-        label = f"{med:.3f}s" if med == bare_med else f"{med:.3f}s\n({pct:+.0f}%)"
+    cpu_overhead = stats.overhead(("bare", "cpu_s"), [(m, "cpu_s") for m in methods])
+    for m, bar, med in zip(methods, bars2, cpu_meds):
+        ov = cpu_overhead.get((m, "cpu_s"))
+        label = f"{med:.3f}s\n({overhead_label(ov)})" if ov else f"{med:.3f}s"
         ax2.text(bar.get_x() + bar.get_width() / 2,
                  bar.get_height() + max(cpu_meds) * 0.03,
                  label, ha="center", va="bottom",
@@ -449,122 +427,363 @@ def plot_exp4_nested():
 
     ax2.set_xticks(range(len(methods)))
     ax2.set_xticklabels(cpu_labels, fontsize=9, color="white")
-    style_ax(ax2, "CPU Overhead (sha256sum 50MB, exec)", "Tiempo (s)")
+    style_ax(ax2, "CPU Overhead (sha256sum 50MB, exec; IC 95%)", "Tiempo (s)")
 
     fig.suptitle("Exp 4: Nested Container Performance", color="white",
                  fontsize=16, fontweight="bold", y=1.02)
     fig.tight_layout()
-    save_fig(fig, "exp4_nested.png")
+    return save_fig(fig, "exp4_nested.png")
+
+
+def launch_throughput(table):
+    """
+    Exp 5: (runtime, concurrency) -> contenedores/s de cada ronda. La ronda
+    dura hasta que termina su último arranque (offset_ms + latency_ms).
+    """
+    keys = ("runtime", "concurrency", "round")
+    offsets = table.groups("offset_ms", *keys)
+    throughput = {}
+    for (rt, c, rnd), latencies in table.groups("latency_ms", *keys).items():
+        wall_ms = max(o + l for o, l in zip(offsets[(rt, c, rnd)], latencies))
+        throughput.setdefault((rt, c), []).append(len(latencies) / wall_ms * 1000)
+    return throughput
+
+
+def plot_exp5_concurrency(table):
+    """Exp 5: 2 panels — start latency p50/p95/p99 vs concurrency + throughput."""
+    pcts = bench_stats.percentiles(table.groups("latency_ms", "runtime", "concurrency"))
+    throughput = launch_throughput(table)
+    runtimes = list(dict.fromkeys(rt for rt, _ in pcts))
+    levels = sorted({c for _, c in pcts})
+    # Un color por runtime (los de prueba, p. ej. fake_runtime.py, usan el ciclo de matplotlib)
+    colors = {rt: COLORS.get(rt, f"C{i}") for i, rt in enumerate(runtimes)}
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5), facecolor="#1a1a2e")
+
+    # Panel 1: percentiles de latencia (p50 sólida, p95/p99 punteadas)
+    for rt in runtimes:
+        xs = [c for c in levels if (rt, c) in pcts]
+        for q, style, alpha in (("p50", "o-", 1.0), ("p95", "s--", 0.8), ("p99", "^:", 0.6)):
+            ax1.plot(xs, [pcts[(rt, c)][q] for c in xs], style,
+                     color=colors[rt], label=f"{LABELS.get(rt, rt)} {q}",
+                     linewidth=2 if q == "p50" else 1.5, markersize=6, alpha=alpha)
+
+    style_ax(ax1, "Latencia de Arranque vs Concurrencia", "Tiempo (ms)")
+    ax1.set_xticks(levels)
+    ax1.set_xlabel("Arranques simultáneos", color="white", fontsize=11)
+    ax1.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white", fontsize=8)
+
+    # Panel 2: throughput (mediana de las rondas, bigotes min-max)
+    for rt in runtimes:
+        xs = [c for c in levels if (rt, c) in throughput]
+        rounds = [sorted(throughput[(rt, c)]) for c in xs]
+        meds = [float(np.median(r)) for r in rounds]
+        ax2.errorbar(xs, meds,
+                     yerr=[[m - r[0] for m, r in zip(meds, rounds)],
+                           [r[-1] - m for m, r in zip(meds, rounds)]],
+                     fmt="o-", color=colors[rt], label=LABELS.get(rt, rt),
+                     linewidth=2, markersize=8, capsize=4)
+        for x, y in zip(xs, meds):
+            ax2.text(x, y, f"  {y:.1f}/s", ha="left", va="bottom",
+                     color="white", fontsize=9)
+
+    style_ax(ax2, "Throughput de Arranque", "Contenedores / s")
+    ax2.set_xticks(levels)
+    ax2.set_xlabel("Arranques simultáneos", color="white", fontsize=11)
+    ax2.set_ylim(bottom=0)
+    ax2.legend(facecolor="#16213e", edgecolor="#333", labelcolor="white")
+
+    fig.suptitle("Exp 5: Concurrent Container Launch", color="white",
+                 fontsize=16, fontweight="bold", y=1.02)
+    fig.tight_layout()
+    return save_fig(fig, "exp5_concurrency.png")
+
+
+def overhead_note(ov):
+    """' (+4.2%, IC [+3.1, +5.0])' para el resumen; '' para la línea base."""
+    if not ov:
+        return ""
+    noise = ", ruido" if not ov["significant"] else ""
+    return f" ({ov['pct']:+.1f}%, IC [{ov['ci_low']:+.1f}, {ov['ci_high']:+.1f}]{noise})"
+
 
+def outlier_note(s):
+    """' — 2 outliers de 10' si el grupo tiene outliers (z modificado)."""
+    return f" — {s['outliers']} outlier{'s' if s['outliers'] != 1 else ''} de {s['n']}" if s["outliers"] else ""
 
-def print_summary():
+
+def print_summary(store):
     """Imprime una tabla resumen en texto."""
     print("\n" + "=" * 60)
     print("  RESUMEN DE BENCHMARKS")
     print("=" * 60)
 
     # Exp 1
-    rows = read_csv("exp1_startup.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = f"{row['runtime']}/{row['image']}"
-            try:
-                data.setdefault(key, []).append(float(row["startup_ms"]))
-            except (ValueError, KeyError):
-                pass
-        print("\nExp 1 — Startup Latency (mediana):")
-        for key in ["bare/none", "docker/ubuntu", "docker/alpine",
-                     "podman/ubuntu", "podman/alpine"]:
-            if key in data:
-                med = statistics.median(data[key])
-                print(f"  {key:20s} {med:8.1f} ms")
+    table = store.table("exp1_startup")
+    if table:
+        summary = BenchStats(table.groups("startup_ms", "runtime", "image")).summary()
+        print("\nExp 1 — Startup Latency (mediana, IC 95%):")
+        for rt, img in [("bare", "none"), ("docker", "ubuntu"), ("docker", "alpine"),
+                        ("podman", "ubuntu"), ("podman", "alpine")]:
+            if (rt, img) in summary:
+                s = summary[(rt, img)]
+                print(f"  {rt + '/' + img:20s} {s['median']:8.1f} ms "
+                      f"[{s['ci_low']:.1f}, {s['ci_high']:.1f}]{outlier_note(s)}")
 
     # Exp 2
-    rows = read_csv("exp2_scale.csv")
-    if rows:
+    table = store.table("exp2_scale")
+    if table:
         print("\nExp 2 — Scale (launch time + memory):")
-        for row in rows:
-            try:
-                rt = row["runtime"]
-                count = row["count"]
-                launch = float(row["launch_time_s"])
-                per_kb = float(row["per_container_kb"])
-                daemon_kb = float(row["daemon_rss_kb"])
-                print(f"  {LABELS.get(rt, rt):10s} {count:>2s} cont: "
-                      f"{launch:6.2f}s, {per_kb:.0f} KB/cont, "
-                      f"daemon={daemon_kb:.0f} KB")
-            except (ValueError, KeyError):
-                pass
+        for rt, count, launch, per_kb, daemon_kb in zip(
+                table["runtime"], table["count"], table["launch_time_s"],
+                table["per_container_kb"], table["daemon_rss_kb"]):
+            print(f"  {LABELS.get(rt, rt):10s} {count:>2d} cont: "
+                  f"{launch:6.2f}s, {per_kb:.0f} KB/cont, "
+                  f"daemon={daemon_kb:.0f} KB")
 
     # Exp 3
-    rows = read_csv("exp3_runtime.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = (row["runtime"], row["workload"])
-            try:
-                data.setdefault(key, []).append(float(row["time_s"]))
-            except (ValueError, KeyError):
-                pass
-        print("\nExp 3 — Runtime Overhead (mediana):")
+    table = store.table("exp3_runtime")
+    if table:
+        stats = BenchStats(table.groups("time_s", "runtime", "workload"))
+        summary = stats.summary()
+        print("\nExp 3 — Runtime Overhead (mediana, overhead con IC 95%):")
         for wl in ["hash", "sort"]:
             print(f"  {wl}:")
-            bare_med = statistics.median(data.get(("bare", wl), [1]))
+            overhead = stats.overhead(("bare", wl))
             for rt in ["bare", "docker", "podman"]:
-                vals = data.get((rt, wl), [])
-                if vals:
-                    med = statistics.median(vals)
-                    if rt == "bare":
-                        print(f"    {LABELS.get(rt, rt):15s} {med:.4f}s")
-                    else:
-                        pct = ((med - bare_med) / bare_med) * 100
-                        print(f"    {LABELS.get(rt, rt):15s} {med:.4f}s ({pct:+.1f}%)")
+                if (rt, wl) in summary:
+                    s = summary[(rt, wl)]
+                    print(f"    {LABELS.get(rt, rt):15s} {s['median']:.4f}s"
+                          f"{overhead_note(overhead.get((rt, wl)))}{outlier_note(s)}")
 
     # Exp 4
-    rows = read_csv("exp4_nested.csv")
-    if rows:
-        data = {}
-        for row in rows:
-            key = (row["method"], row["metric"])
-            try:
-                data.setdefault(key, []).append(float(row["value"]))
-            except (ValueError, KeyError):
-                pass
+    table = store.table("exp4_nested")
+    if table:
+        stats = BenchStats(table.groups("value", "method", "metric"))
+        summary = stats.summary()
         methods = ["bare", "docker", "dind", "podman", "podman-nested"]
         print("\nExp 4 — Nested Containers:")
-        print("  Startup (mediana):")
+        print("  Startup (mediana, IC 95%):")
         for m in methods:
-            vals = data.get((m, "startup_ms"), [])
-            if vals:
-                med = statistics.median(vals)
-                print(f"    {LABELS.get(m, m):22s} {med:8.1f} ms")
-        print("  CPU sha256sum 50MB (mediana):")
-        bare_cpu = statistics.median(data.get(("bare", "cpu_s"), [1]))
+            if (m, "startup_ms") in summary:
+                s = summary[(m, "startup_ms")]
+                print(f"    {LABELS.get(m, m):22s} {s['median']:8.1f} ms "
+                      f"[{s['ci_low']:.1f}, {s['ci_high']:.1f}]{outlier_note(s)}")
+        print("  CPU sha256sum 50MB (mediana, overhead con IC 95%):")
+        overhead = stats.overhead(("bare", "cpu_s"))
         for m in methods:
-            vals = data.get((m, "cpu_s"), [])
-            if vals:
-                med = statistics.median(vals)
-                if m == "bare":
-                    print(f"    {LABELS.get(m, m):22s} {med:.3f}s")
-                else:
-                    pct = ((med - bare_cpu) / bare_cpu) * 100
-                    print(f"    {LABELS.get(m, m):22s} {med:.3f}s ({pct:+.1f}%)")
+            if (m, "cpu_s") in summary:
+                s = summary[(m, "cpu_s")]
+                print(f"    {LABELS.get(m, m):22s} {s['median']:.3f}s"
+                      f"{overhead_note(overhead.get((m, 'cpu_s')))}{outlier_note(s)}")
+
+    # Exp 5
+    table = store.table("exp5_concurrency")
+    if table:
+        pcts = bench_stats.percentiles(table.groups("latency_ms", "runtime", "concurrency"))
+        throughput = launch_throughput(table)
+        print("\nExp 5 — Concurrent Launch (latencia de arranque, throughput mediano):")
+        for (rt, c), p in pcts.items():
+            print(f"  {LABELS.get(rt, rt):15s} c={c:<3d} p50 {p['p50']:8.1f}  p95 {p['p95']:8.1f}  "
+                  f"p99 {p['p99']:8.1f} ms  {np.median(throughput[(rt, c)]):6.1f} cont/s")
 
     print("\n" + "=" * 60)
 
 
+# CSV de results/ -> función que dibuja su gráfica (<nombre>.png)
+PLOTS = {
+    "exp1_startup": plot_exp1_startup,
+    "exp2_scale": plot_exp2_scale,
+    "exp3_runtime": plot_exp3_runtime,
+    "exp4_nested": plot_exp4_nested,
+    "exp5_concurrency": plot_exp5_concurrency,
+}
+
+# Código que comparten todas las gráficas (incluida la lectura de los CSVs
+# en results_store): si cambia, se redibujan todas
+PLOT_HELPERS = (save_fig, style_ax, overhead_label, launch_throughput, bench_stats, results_store)
+
+# Qué entradas produjeron cada PNG (ver render_figures)
+MANIFEST_PATH = RESULTS_DIR / ".plots_manifest.json"
+ARCHIVE_PATH = RESULTS_DIR / "archive.db"
+MANIFEST_VERSION = 1
+
+
+def file_digest(path):
+    """SHA-256 de un archivo, o None si no se puede leer."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def code_digest(plot):
+    """SHA-256 del código fuente de una gráfica, sus helpers y su paleta."""
+    parts = [inspect.getsource(f) for f in (plot,) + PLOT_HELPERS]
+    parts.append(repr(sorted(COLORS.items())) + repr(sorted(LABELS.items())))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def load_manifest():
+    """Manifiesto de gráficas ya generadas ({} si no existe o es de otra versión)."""
+    try:
+        data = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("figures", {})
+
+
+def save_manifest(figures):
+    """Escribe el manifiesto de forma atómica."""
+    tmp_path = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    tmp_path.write_text(json.dumps({"version": MANIFEST_VERSION, "figures": figures},
+                                   indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def render_figures(store, jobs=None, force=False):
+    """
+    Dibuja las gráficas de los CSVs disponibles.
+
+    Una gráfica se salta si su CSV y su código (ver code_digest) son los
+    mismos que la última vez y sus dos PNG siguen ahí; force=True las
+    redibuja todas. El manifiesto en results/ guarda esas huellas.
+
+    Con más de una gráfica pendiente y más de un proceso, cada figura se
+    rasteriza en su propio proceso (el backend Agg no comparte estado
+    entre procesos); solo viaja la tabla ya leída, no el CSV.
+
+    Retorna (rutas escritas, nombres de PNG sin cambios), en el orden de
+    PLOTS.
+    """
+    manifest = load_manifest()
+    tasks = []
+    skipped = []
+    for name, plot in PLOTS.items():
+        png = f"{name}.png"
+        inputs = {f"{name}.csv": file_digest(RESULTS_DIR / f"{name}.csv")}
+        if None in inputs.values():
+            store.table(name)  # avisa que falta el CSV
+            continue
+        entry = {"inputs": inputs, "code": code_digest(plot)}
+        outputs = [RESULTS_DIR / png, IMAGES_DIR / png]
+        if not force and manifest.get(png) == entry and all(path.exists() for path in outputs):
+            skipped.append(png)
+            continue
+        table = store.table(name)
+        if table:
+            tasks.append((png, plot, table, entry))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            futures = [executor.submit(plot, table) for _, plot, table, _ in tasks]
+            results = [future.result() for future in futures]
+    else:
+        results = [plot(table) for _, plot, table, _ in tasks]
+
+    for png, _, _, entry in tasks:
+        manifest[png] = entry
+    if tasks:
+        save_manifest(manifest)
+
+    return [path for paths in results for path in paths], skipped
+
+
+def print_runs(archive):
+    """Lista las corridas archivadas con su entorno."""
+    runs = archive.runs()
+    if not runs:
+        print(f"No hay corridas archivadas en {archive.path}")
+        return
+    for run in runs:
+        env = run["environment"]
+        print(f"@{run['id']:<4d} {run['recorded_at']}  [{run['fingerprint']}]  "
+              f"{', '.join(run['experiments'])}")
+        print(f"       {env.get('hostname')}  kernel {env.get('kernel')}  "
+              f"cgroup {env.get('cgroup')}  {env.get('cpu_model')}")
+        print(f"       {env.get('docker') or 'sin docker'}  |  {env.get('podman') or 'sin podman'}")
+
+
+def print_history(archive, last=8):
+    """Tendencia de la mediana de cada configuración en las últimas `last` corridas."""
+    for name, (value, keys, unit) in compare_results.COMPARISONS.items():
+        trend = archive.medians(name, value, keys)
+        if not trend:
+            continue
+        run_ids = sorted({run_id for points in trend.values() for run_id, _, _ in points})[-last:]
+        print(f"\n{name} ({value}{', ' + unit if unit else ''}):")
+        print(f"  {'':24s}" + "".join(f"{'@' + str(r):>10s}" for r in run_ids))
+        for config, points in trend.items():
+            by_run = {run_id: med for run_id, _, med in points}
+            cells = "".join(f"{by_run[r]:10.4g}" if r in by_run else f"{'-':>10s}" for r in run_ids)
+            print(f"  {'/'.join(map(str, config)):24s}{cells}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Genera las gráficas de los benchmarks.")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="procesos para dibujar (por defecto, uno por CPU)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="redibujar todas las gráficas aunque sus CSVs no hayan cambiado")
+    parser.add_argument("--compare", nargs="+", metavar="DIR|@ID",
+                        help="comparar corridas (directorios o corridas archivadas @ID); "
+                             "la primera es la base (no genera gráficas)")
+    parser.add_argument("--threshold", type=float, default=compare_results.THRESHOLD_PCT,
+                        help="cambio mínimo de la mediana, en %%, para reportar (default: %(default)g)")
+    parser.add_argument("--alpha", type=float, default=compare_results.ALPHA,
+                        help="nivel de significancia de Mann–Whitney (default: %(default)g)")
+    parser.add_argument("--runs", action="store_true",
+                        help="listar las corridas archivadas en results/archive.db")
+    parser.add_argument("--history", action="store_true",
+                        help="medianas de cada configuración a lo largo de las corridas archivadas")
+    args = parser.parse_args()
+
+    if args.runs or args.history:
+        archive = Archive(ARCHIVE_PATH)
+        if args.runs:
+            print_runs(archive)
+        else:
+            print_history(archive)
+        return
+
+    if args.compare:
+        if len(args.compare) < 2:
+            parser.error("--compare necesita al menos dos corridas")
+        archive = None
+        sources = []
+        for spec in args.compare:
+            if re.fullmatch(r"@\d+", spec):
+                archive = archive or Archive(ARCHIVE_PATH)
+                sources.append((spec, archive.store(int(spec[1:]))))
+            elif Path(spec).is_dir():
+                sources.append((spec, ResultStore(spec)))
+            else:
+                parser.error(f"no es un directorio ni una corrida @ID: {spec}")
+        regressions = compare_results.compare_sources(sources, args.threshold, args.alpha)
+        sys.exit(1 if regressions else 0)
+
+    if matplotlib is None:
+        print("Error: matplotlib no está instalado.")
+        print("Instálalo con: pip install matplotlib")
+        sys.exit(EXIT_SETUP)
+
     print("Generando gráficas de benchmarks...")
     print(f"Directorio de resultados: {RESULTS_DIR}")
     print()
 
-    plot_exp1_startup()
-    plot_exp2_scale()
-    plot_exp3_runtime()
-    plot_exp4_nested()
+    # Cada CSV se lee una vez y se comparte entre gráficas y resumen
+    store = ResultStore(RESULTS_DIR)
+
+    written, skipped = render_figures(store, args.jobs, args.force)
+    for path in written:
+        print(f"  Guardado: {path}")
+    for png in skipped:
+        print(f"  Sin cambios: {png}")
 
-    print_summary()
+    print_summary(store)
 
     print("\nGráficas generadas:")
     for png in sorted(RESULTS_DIR.glob("exp*.png")):
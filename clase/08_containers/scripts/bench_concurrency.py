@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+bench_concurrency.py — Exp 5: arranque concurrente de contenedores.
+
+bench_scale.sh lanza 1, 5, 10 y 20 contenedores uno tras otro y da un
+solo tiempo total; no dice qué pasa cuando muchos arrancan a la vez,
+como en CI. Aquí un scheduler de asyncio lanza N contenedores
+(`<runtime> run -d`) con a lo más C arranques en vuelo al mismo tiempo
+(un asyncio.Semaphore) y mide la latencia de cada uno: desde que su
+proceso se lanza hasta que termina, que es cuando el contenedor ya está
+corriendo. Con el daemon de Docker los arranques compiten por dockerd;
+Podman no tiene daemon y cada arranque es un fork-exec independiente.
+
+Por cada runtime, ronda y nivel de concurrencia escribe una fila por
+contenedor en results/exp5_concurrency.csv:
+
+    runtime,concurrency,round,container,offset_ms,latency_ms
+
+offset_ms es cuándo se lanzó, contado desde el inicio de la ronda;
+offset_ms + latency_ms del último contenedor da la duración de la ronda
+y de ahí el throughput (contenedores/s). Un arranque fallido queda con
+latency_ms = "error". analyze.py calcula p50/p95/p99 y dibuja
+results/exp5_concurrency.png; el CSV queda archivado en
+results/archive.db.
+
+Las rondas intercalan los niveles de concurrencia (como exp4 con los
+métodos) para repartir el ruido del host, y los contenedores de cada
+ronda se borran antes de la siguiente. La latencia se toma en el event
+loop: incluye lo que tarda el loop en notar que el proceso terminó
+(décimas de ms), igual para todos los runtimes.
+
+Para probar el driver sin Docker: --stand-in usa fake_runtime.py, con
+y sin "daemon" (ver su docstring).
+
+Uso: python3 bench_concurrency.py [--containers 20] [--concurrency 1 5 10 20]
+                                  [--rounds 3] [--runtime NOMBRE[=COMANDO]]... [--stand-in]
+"""
+
+import argparse
+import asyncio
+import csv
+import shlex
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bench_harness import RESULTS_DIR, quiet, runtimes
+from results_archive import Archive
+
+OUTFILE = RESULTS_DIR / "exp5_concurrency.csv"
+IMAGE = "alpine"
+CONTAINERS = 20
+CONCURRENCY = (1, 5, 10, 20)
+ROUNDS = 3
+
+FAKE_RUNTIME = Path(__file__).parent / "fake_runtime.py"
+STAND_INS = {
+    "fake-daemon": [sys.executable, "-S", str(FAKE_RUNTIME), "--daemon"],
+    "fake-daemonless": [sys.executable, "-S", str(FAKE_RUNTIME)],
+}
+
+
+def parse_runtime(spec):
+    """'docker' -> ('docker', ['docker']); 'x=cmd args' -> ('x', ['cmd', 'args'])."""
+    name, _, command = spec.partition("=")
+    return name, shlex.split(command) if command else [name]
+
+
+async def launch(command, name, gate, round_start):
+    """
+    Arranca un contenedor cuando `gate` lo deja pasar.
+
+    Retorna (offset_ns, latency_ns o None si el arranque falló).
+    """
+    async with gate:
+        start = time.perf_counter_ns()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command, "run", "-d", "--name", name, IMAGE, "sleep", "3600",
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+            code = await proc.wait()
+        except OSError:
+            code = None
+        latency = time.perf_counter_ns() - start
+    return start - round_start, latency if code == 0 else None
+
+
+async def launch_round(command, names, concurrency):
+    """Lanza todos los `names` con a lo más `concurrency` a la vez."""
+    gate = asyncio.Semaphore(concurrency)
+    round_start = time.perf_counter_ns()
+    return await asyncio.gather(*(launch(command, name, gate, round_start) for name in names))
+
+
+def latency_percentiles(latencies_ms):
+    """(p50, p95, p99) con interpolación lineal, como bench_stats.percentiles."""
+    if len(latencies_ms) == 1:
+        return latencies_ms * 3
+    cuts = statistics.quantiles(latencies_ms, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def remove(command, names):
+    quiet(*command, "rm", "-f", *names)
+
+
+def run_runtime(writer, runtime, command, containers, levels, rounds):
+    """Todas las rondas de un runtime."""
+    print(f"Midiendo {runtime}...")
+    quiet(*command, "pull", "-q", IMAGE)
+    warmup = f"exp5_{runtime}_warmup"
+    remove(command, [warmup])
+    asyncio.run(launch_round(command, [warmup], 1))
+    remove(command, [warmup])
+
+    latencies = {c: [] for c in levels}
+    throughputs = {c: [] for c in levels}
+    for rnd in range(1, rounds + 1):
+        for c in levels:
+            names = [f"exp5_{runtime}_{c}_{rnd}_{i}" for i in range(1, containers + 1)]
+            remove(command, names)
+            results = asyncio.run(launch_round(command, names, c))
+            remove(command, names)
+
+            ok = [(offset, latency) for offset, latency in results if latency is not None]
+            for i, (offset, latency) in enumerate(results, 1):
+                writer.writerow([runtime, c, rnd, i, f"{offset / 1e6:.3f}",
+                                 f"{latency / 1e6:.3f}" if latency is not None else "error"])
+            if ok:
+                wall_s = max(offset + latency for offset, latency in ok) / 1e9
+                latencies[c] += [latency / 1e6 for _, latency in ok]
+                throughputs[c].append(len(ok) / wall_s)
+            if len(ok) < len(results):
+                print(f"  ⚠ {runtime} c={c} ronda {rnd}: {len(results) - len(ok)} arranques fallaron")
+
+    for c in levels:
+        if not latencies[c]:
+            continue
+        p50, p95, p99 = latency_percentiles(latencies[c])
+        print(f"  c={c:<3d} p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  p99 {p99:8.1f} ms  "
+              f"{statistics.median(throughputs[c]):6.1f} cont/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exp 5: arranque concurrente de contenedores.")
+    parser.add_argument("--containers", type=int, default=CONTAINERS,
+                        help="contenedores por ronda (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(CONCURRENCY),
+                        help="arranques simultáneos a probar (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS,
+                        help="rondas por nivel de concurrencia (default: %(default)s)")
+    parser.add_argument("--runtime", action="append", metavar="NOMBRE[=COMANDO]",
+                        help="runtime a medir (repetible); por defecto docker y podman si están")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="medir fake_runtime.py (con y sin daemon) en vez de docker/podman")
+    args = parser.parse_args()
+
+    if args.stand_in:
+        targets = list(STAND_INS.items())
+    elif args.runtime:
+        targets = [parse_runtime(spec) for spec in args.runtime]
+    else:
+        targets = [(rt, [rt]) for rt in runtimes()]
+
+    print(f"=== Exp 5: Concurrent Launch ({args.containers} contenedores, "
+          f"concurrencia {args.concurrency}, {args.rounds} rondas) ===")
+    if not targets:
+        print("docker/podman: no disponibles, saltando (--stand-in para probar el driver)")
+        return
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(OUTFILE, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["runtime", "concurrency", "round", "container", "offset_ms", "latency_ms"])
+        for runtime, command in targets:
+            run_runtime(writer, runtime, command, args.containers, args.concurrency, args.rounds)
+            f.flush()
+
+    print(f"Resultados guardados en {OUTFILE}")
+    try:
+        run_id = Archive(RESULTS_DIR / "archive.db").record([OUTFILE])
+    except Exception as e:  # el historial nunca debe tirar la corrida
+        print(f"⚠ no se pudo archivar: {e}")
+        return
+    if run_id:
+        print(f"Archivado como corrida @{run_id}")
+
+
+if __name__ == "__main__":
+    main()
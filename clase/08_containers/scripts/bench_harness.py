@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+bench_harness.py — Mide los experimentos 1, 3 y 4 desde Python.
+
+Los bench_*.sh toman cada muestra con dos `date +%s%N` y un `bc`: tres
+procesos extra, con varios ms de ruido, alrededor de comandos que en
+bare metal tardan ~1 ms. Además la línea base de startup era
+`echo ok`, un builtin de bash que no crea ningún proceso.
+
+Aquí cada muestra es un solo os.posix_spawnp() del comando medido,
+cronometrado con time.perf_counter_ns() y recogido con os.wait4(), que
+además da el rusage del hijo (CPU user/sys y RSS máximo). La línea base
+de startup lanza /bin/echo: un proceso, igual que lo que termina
+corriendo dentro del contenedor.
+
+Para docker/podman el rusage es el del cliente (el CLI de docker, o
+podman, que no tiene daemon y hace más trabajo en el propio proceso);
+el contenedor no es hijo de este proceso.
+
+Repeticiones: fijas (el número que se pasa, como en bash) o adaptativas
+con --ci-width: cada configuración suma muestras hasta que el intervalo
+bootstrap de su mediana (bench_stats, necesita numpy) mide menos que esa
+fracción de la mediana, entre --min-reps y --max-reps. Así las
+configuraciones estables terminan pronto y las ruidosas (DinD, Podman
+anidado) reciben más muestras.
+
+Escribe los mismos CSVs que los scripts de bash (results/exp1_startup.csv,
+exp3_runtime.csv, exp4_nested.csv), más results/<exp>_rusage.csv con el
+rusage de cada muestra y results/<exp>_stops.csv con cuántas muestras
+tomó cada configuración y por qué paró ("fijo", "ic", "max_reps" o
+"error"); todo queda archivado en results/archive.db.
+
+Uso: python3 bench_harness.py startup|runtime|nested [repeticiones]
+                              [--ci-width 0.05] [--min-reps 5] [--max-reps 30]
+     (bench_startup.sh, bench_runtime.sh y exp4_nested.sh lo llaman; las
+     opciones adaptativas también se leen de BENCH_CI_WIDTH,
+     BENCH_MIN_REPS y BENCH_MAX_REPS, que run_all.sh exporta)
+"""
+
+import argparse
+import csv
+import importlib.util
+import math
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+from results_archive import Archive
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Salida del comando medido a /dev/null, como el `> /dev/null 2>&1` de bash
+QUIET = [
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+]
+
+# Workloads de exp3 / exp4 (los mismos comandos que los scripts de bash)
+HASH_CMD = "dd if=/dev/urandom bs=1M count=100 2>/dev/null | sha256sum > /dev/null"
+SORT_CMD = "seq 1 1000000 | shuf | sort -n > /dev/null"
+CPU_CMD = "dd if=/dev/urandom bs=1M count=50 2>/dev/null | sha256sum > /dev/null"
+
+# Modo adaptativo (--ci-width)
+MIN_REPS = 5
+MAX_REPS = 30
+
+
+class CommandFailed(Exception):
+    """El comando medido terminó con código distinto de 0."""
+
+
+def sample(argv):
+    """
+    Lanza argv una vez y espera a que termine.
+
+    Retorna {"wall_ns", "user_s", "sys_s", "maxrss_kb"}. CommandFailed si
+    el código de salida no es 0.
+    """
+    start = time.perf_counter_ns()
+    pid = os.posix_spawnp(argv[0], argv, os.environ, file_actions=QUIET)
+    _, status, usage = os.wait4(pid, 0)
+    wall_ns = time.perf_counter_ns() - start
+
+    code = os.waitstatus_to_exitcode(status)
+    if code != 0:
+        raise CommandFailed(f"{' '.join(argv[:4])}... terminó con código {code}")
+    return {
+        "wall_ns": wall_ns,
+        "user_s": usage.ru_utime,
+        "sys_s": usage.ru_stime,
+        "maxrss_kb": usage.ru_maxrss,  # KB en Linux
+    }
+
+
+def quiet(*argv):
+    """Corre un comando de preparación/limpieza sin mostrar su salida. True si salió bien."""
+    try:
+        return subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+    except OSError:
+        return False
+
+
+def relative_ci_width(values):
+    """Ancho del IC 95% bootstrap de la mediana, como fracción de la mediana."""
+    from bench_stats import BenchStats
+
+    summary = BenchStats({0: values}).summary()[0]
+    if summary["median"] == 0:
+        return math.inf
+    return (summary["ci_high"] - summary["ci_low"]) / summary["median"]
+
+
+class RepPolicy:
+    """
+    Cuándo dejar de medir una configuración: tras `reps` muestras (fijo)
+    o, con ci_width, cuando el IC relativo de la mediana es a lo más
+    ci_width (con al menos min_reps y a lo más max_reps muestras).
+    """
+
+    def __init__(self, reps, ci_width=None, min_reps=MIN_REPS, max_reps=MAX_REPS):
+        self.reps = reps
+        self.ci_width = ci_width
+        self.min_reps = min_reps
+        self.max_reps = max(min_reps, max_reps)
+
+    def describe(self):
+        if self.ci_width:
+            return f"IC ≤ {self.ci_width:.0%} de la mediana, {self.min_reps}-{self.max_reps} reps"
+        return f"{self.reps} reps"
+
+    def stop(self, values):
+        """
+        None si hay que tomar otra muestra; si no, (motivo, ancho relativo
+        del IC o nan si no se calculó).
+        """
+        n = len(values)
+        if not self.ci_width:
+            return ("fijo", math.nan) if n >= self.reps else None
+        if n < self.min_reps:
+            return None
+        width = relative_ci_width(values)
+        if width <= self.ci_width:
+            return "ic", width
+        if n >= self.max_reps:
+            return "max_reps", width
+        return None
+
+
+class Recorder:
+    """
+    Escribe results/<name>.csv (mismo esquema que el script de bash) y
+    results/<name>_rusage.csv, fila por fila, para no perder lo medido si
+    la corrida se interrumpe.
+    """
+
+    def __init__(self, name, key_columns, value_column):
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        self.paths = [RESULTS_DIR / f"{name}{suffix}.csv" for suffix in ("", "_rusage", "_stops")]
+        self.files = [open(path, "w", newline="") for path in self.paths]
+        self.values, self.rusage, self.stops = (csv.writer(f) for f in self.files)
+        self.values.writerow(list(key_columns) + ["rep", value_column])
+        self.rusage.writerow(list(key_columns) + ["rep", "user_s", "sys_s", "maxrss_kb"])
+        self.stops.writerow(list(key_columns) + ["reps", "ci_rel_width", "reason"])
+
+    def add(self, keys, rep, value, s):
+        self.values.writerow(list(keys) + [rep, value])
+        self.rusage.writerow(list(keys) + [rep, f"{s['user_s']:.6f}", f"{s['sys_s']:.6f}", s["maxrss_kb"]])
+        for f in self.files:
+            f.flush()
+
+    def stopped(self, keys, reps, width, reason):
+        """Registra cuántas muestras tomó una configuración y por qué paró."""
+        self.stops.writerow(list(keys) + [reps, f"{width:.4f}", reason])
+        self.files[2].flush()
+        detail = f", IC {width:.1%} de la mediana" if not math.isnan(width) else ""
+        print(f"    {'/'.join(keys)}: {reps} muestras ({reason}{detail})")
+
+    def close(self):
+        """Cierra los CSVs y los guarda en el historial."""
+        for f in self.files:
+            f.close()
+        print(f"Resultados guardados en {self.paths[0]}")
+        try:
+            run_id = Archive(RESULTS_DIR / "archive.db").record(self.paths)
+        except Exception as e:  # el historial nunca debe tirar la corrida
+            print(f"⚠ no se pudo archivar: {e}")
+            return
+        if run_id:
+            print(f"Archivado como corrida @{run_id}")
+
+
+def measure(recorder, keys, argv, policy, value):
+    """
+    1 warm-up (descartado) + muestras de argv hasta que `policy` diga que
+    basta. `value` convierte la muestra al número del CSV. Si el comando
+    falla se avisa y se sigue con la siguiente configuración.
+    """
+    walls = []
+    try:
+        sample(argv)
+        stop = policy.stop(walls)
+        while not stop:
+            s = sample(argv)
+            walls.append(s["wall_ns"])
+            recorder.add(keys, len(walls), value(s), s)
+            stop = policy.stop(walls)
+    except (CommandFailed, OSError) as e:
+        print(f"  ⚠ {'/'.join(keys)}: {e}")
+        stop = ("error", math.nan)
+    recorder.stopped(keys, len(walls), stop[1], stop[0])
+
+
+def ms(s):
+    return f"{s['wall_ns'] / 1e6:.3f}"
+
+
+def seconds(s):
+    return f"{s['wall_ns'] / 1e9:.4f}"
+
+
+def runtimes():
+    """Runtimes de contenedores instalados, en el orden de los CSVs."""
+    return [rt for rt in ("docker", "podman") if shutil.which(rt)]
+
+
+# ----------------------------------------------------------------------
+# Exp 1: Startup latency
+# ----------------------------------------------------------------------
+
+def run_startup(policy):
+    print(f"=== Exp 1: Startup Latency ({policy.describe()} + 1 warm-up) ===")
+    recorder = Recorder("exp1_startup", ["runtime", "image"], "startup_ms")
+    try:
+        print("Midiendo bare metal...")
+        measure(recorder, ["bare", "none"], ["echo", "ok"], policy, ms)
+        print("  bare metal: listo")
+
+        for rt in ("docker", "podman"):
+            if rt not in runtimes():
+                print(f"  {rt}: no disponible, saltando")
+                continue
+            for image in ("ubuntu", "alpine"):
+                print(f"Midiendo {rt.title()} + {image}...")
+                if not quiet(rt, "pull", "-q", image) and rt == "podman":
+                    quiet(rt, "pull", "-q", f"docker.io/library/{image}")
+                measure(recorder, [rt, image], [rt, "run", "--rm", image, "echo", "ok"], policy, ms)
+                print(f"  {rt}/{image}: listo")
+    finally:
+        recorder.close()
+
+
+# ----------------------------------------------------------------------
+# Exp 3: Runtime overhead (exec en contenedores ya corriendo)
+# ----------------------------------------------------------------------
+
+def run_runtime(policy):
+    print(f"=== Exp 3: Runtime Overhead ({policy.describe()} + 1 warm-up) ===")
+    containers = {}
+    for rt in runtimes():
+        name = f"exp3_{rt}"
+        print(f"Pre-iniciando contenedor {rt.title()}...")
+        quiet(rt, "rm", "-f", name)
+        if quiet(rt, "run", "-d", "--name", name, "ubuntu", "sleep", "3600"):
+            containers[rt] = name
+    if containers:
+        time.sleep(1)
+
+    recorder = Recorder("exp3_runtime", ["runtime", "workload"], "time_s")
+    try:
+        for workload, cmd in (("hash", HASH_CMD), ("sort", SORT_CMD)):
+            print(f"\n--- Workload: {workload} ---")
+            print("  bare metal...")
+            measure(recorder, ["bare", workload], ["bash", "-c", cmd], policy, seconds)
+            for rt, name in containers.items():
+                print(f"  {rt} exec...")
+                measure(recorder, [rt, workload], [rt, "exec", name, "bash", "-c", cmd], policy, seconds)
+    finally:
+        recorder.close()
+        print("Limpiando contenedores...")
+        for rt, name in containers.items():
+            quiet(rt, "rm", "-f", name)
+
+
+# ----------------------------------------------------------------------
+# Exp 4: Nested containers
+# ----------------------------------------------------------------------
+
+def setup_nested():
+    """
+    Pre-inicia los contenedores de exp4 que se puedan (ver exp4_nested.sh).
+    Retorna {método: (argv de startup, argv de cpu)} para los niveles
+    disponibles, en el orden del CSV.
+    """
+    available = runtimes()
+    methods = {"bare": (["echo", "ok"], ["bash", "-c", CPU_CMD])}
+
+    if "docker" in available:
+        print("Verificando imágenes (docker)...")
+        quiet("docker", "pull", "alpine")
+        quiet("docker", "rm", "-f", "exp4-docker-l1")
+        quiet("docker", "run", "-d", "--name", "exp4-docker-l1", "alpine", "sleep", "3600")
+        methods["docker"] = (["docker", "run", "--rm", "alpine", "echo", "ok"],
+                             ["docker", "exec", "exp4-docker-l1", "sh", "-c", CPU_CMD])
+
+        print("Starting Docker-in-Docker (DinD)...")
+        quiet("docker", "rm", "-f", "exp4-dind")
+        quiet("docker", "run", "-d", "--privileged", "--name", "exp4-dind", "docker:dind")
+        for _ in range(20):
+            if quiet("docker", "exec", "exp4-dind", "docker", "info"):
+                break
+            time.sleep(1)
+        quiet("docker", "exec", "exp4-dind", "docker", "pull", "alpine")
+        quiet("docker", "exec", "exp4-dind", "docker", "rm", "-f", "inner")
+        if quiet("docker", "exec", "exp4-dind", "docker", "run", "-d", "--name", "inner", "alpine", "sleep", "3600"):
+            methods["dind"] = (["docker", "exec", "exp4-dind", "docker", "run", "--rm", "alpine", "echo", "ok"],
+                               ["docker", "exec", "exp4-dind", "docker", "exec", "inner", "sh", "-c", CPU_CMD])
+            print("  DinD ready.")
+
+    if "podman" in available:
+        print("Verificando imágenes (podman)...")
+        quiet("podman", "pull", "alpine")
+        quiet("podman", "rm", "-f", "exp4-podman-l1")
+        quiet("podman", "run", "-d", "--name", "exp4-podman-l1", "alpine", "sleep", "3600")
+        methods["podman"] = (["podman", "run", "--rm", "alpine", "echo", "ok"],
+                             ["podman", "exec", "exp4-podman-l1", "sh", "-c", CPU_CMD])
+
+        print("Starting Podman-in-Podman...")
+        quiet("podman", "rm", "-f", "exp4-podman-nest")
+        quiet("podman", "run", "-d", "--privileged", "--name", "exp4-podman-nest",
+              "quay.io/podman/stable", "sleep", "3600")
+        time.sleep(3)
+        quiet("podman", "exec", "exp4-podman-nest", "podman", "pull", "alpine")
+        quiet("podman", "exec", "exp4-podman-nest", "podman", "rm", "-f", "inner")
+        if quiet("podman", "exec", "exp4-podman-nest", "podman", "run", "-d", "--name", "inner",
+                 "alpine", "sleep", "3600"):
+            methods["podman-nested"] = (
+                ["podman", "exec", "exp4-podman-nest", "podman", "run", "--rm", "alpine", "echo", "ok"],
+                ["podman", "exec", "exp4-podman-nest", "podman", "exec", "inner", "sh", "-c", CPU_CMD])
+            print("  Podman nested ready.")
+
+    # Orden del CSV: bare, docker, dind, podman, podman-nested
+    order = ["bare", "docker", "dind", "podman", "podman-nested"]
+    return {m: methods[m] for m in order if m in methods}
+
+
+def cleanup_nested():
+    quiet("docker", "rm", "-f", "exp4-docker-l1", "exp4-dind")
+    quiet("podman", "rm", "-f", "exp4-podman-l1", "exp4-podman-nest")
+
+
+def run_nested(policy):
+    print("============================================")
+    print(f"  Exp 4: Nested Container Performance ({policy.describe()})")
+    print("============================================")
+    print("\n--- Setup ---")
+    methods = setup_nested()
+    recorder = Recorder("exp4_nested", ["method", "metric"], "value")
+    try:
+        # Como en exp4_nested.sh, los métodos se intercalan en cada
+        # ronda (ronda 0 = warm-up) para repartir el ruido del host; en
+        # modo adaptativo cada ronda solo incluye los que aún no paran
+        for metric, index, value in (("startup_ms", 0, ms), ("cpu_s", 1, seconds)):
+            print(f"\n--- {metric} ---")
+            walls = {method: [] for method in methods}
+            pending = dict(methods)
+            warmup = True
+            while pending:
+                for method, argvs in list(pending.items()):
+                    keys = [method, metric]
+                    try:
+                        s = sample(argvs[index])
+                    except (CommandFailed, OSError) as e:
+                        print(f"  ⚠ {method}/{metric}: {e}")
+                        recorder.stopped(keys, len(walls[method]), math.nan, "error")
+                        del pending[method]
+                        continue
+                    if not warmup:
+                        walls[method].append(s["wall_ns"])
+                        recorder.add(keys, len(walls[method]), value(s), s)
+                    stop = policy.stop(walls[method]) if not warmup else None
+                    if stop:
+                        recorder.stopped(keys, len(walls[method]), stop[1], stop[0])
+                        del pending[method]
+                warmup = False
+    finally:
+        recorder.close()
+        print("\n--- Cleanup ---")
+        cleanup_nested()
+
+
+EXPERIMENTS = {
+    "startup": (run_startup, 10),
+    "runtime": (run_runtime, 5),
+    "nested": (run_nested, 5),
+}
+
+
+def env_number(name, kind):
+    """Valor numérico de una variable de entorno, o None si no está."""
+    value = os.environ.get(name)
+    return kind(value) if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide un experimento de benchmarks.")
+    parser.add_argument("experiment", choices=EXPERIMENTS)
+    parser.add_argument("reps", type=int, nargs="?",
+                        help="repeticiones fijas (se ignora con --ci-width)")
+    parser.add_argument("--ci-width", type=float, default=env_number("BENCH_CI_WIDTH", float),
+                        help="parar cuando el IC 95%% de la mediana mida a lo más esta "
+                             "fracción de la mediana (p. ej. 0.05)")
+    parser.add_argument("--min-reps", type=int, default=env_number("BENCH_MIN_REPS", int) or MIN_REPS)
+    parser.add_argument("--max-reps", type=int, default=env_number("BENCH_MAX_REPS", int) or MAX_REPS)
+    args = parser.parse_args()
+
+    if args.ci_width and importlib.util.find_spec("numpy") is None:
+        # el modo adaptativo calcula el IC con bench_stats, que usa numpy
+        print("⚠ --ci-width necesita numpy (pip install -r requirements.txt); "
+              "usando repeticiones fijas")
+        args.ci_width = None
+
+    run, default_reps = EXPERIMENTS[args.experiment]
+    run(RepPolicy(args.reps or default_reps, args.ci_width, args.min_reps, args.max_reps))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,14 @@ REPS=${1:-5}
 OUTFILE="results/exp3_runtime.csv"
 mkdir -p results
 
+# Con Python, cada muestra la toma bench_harness.py (un posix_spawn por
+# muestra, perf_counter_ns y rusage; sin los forks de date/bc de abajo,
+# que agregan ms de ruido) y el CSV queda archivado en results/archive.db.
+# El resto del script mide en bash: se usa sin Python o con BENCH_SHELL=1.
+if [ -z "$BENCH_SHELL" ] && command -v python3 &>/dev/null; then
+    exec python3 "$(dirname "$0")/bench_harness.py" runtime "$REPS"
+fi
+
 echo "runtime,workload,rep,time_s" > "$OUTFILE"
 
 # --- Workload commands ---
@@ -112,3 +120,9 @@ if [ "$podman_available" = true ]; then
 fi
 
 echo "Resultados guardados en $OUTFILE"
+
+# Guardar esta corrida en el historial (results/archive.db); con Python
+# y sin BENCH_SHELL, bench_harness.py ya lo hizo y no se llega aquí
+if command -v python3 &>/dev/null; then
+    python3 "$(dirname "$0")/results_archive.py" record "$OUTFILE" || echo "⚠ no se pudo archivar $OUTFILE"
+fi
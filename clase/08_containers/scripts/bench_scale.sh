@@ -125,3 +125,8 @@ for runtime in docker podman; do
 done
 
 echo "Resultados guardados en $OUTFILE"
+
+# Guardar esta corrida en el historial (results/archive.db)
+if command -v python3 &>/dev/null; then
+    python3 "$(dirname "$0")/results_archive.py" record "$OUTFILE" || echo "⚠ no se pudo archivar $OUTFILE"
+fi
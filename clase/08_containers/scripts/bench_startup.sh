@@ -9,6 +9,14 @@ REPS=${1:-10}
 OUTFILE="results/exp1_startup.csv"
 mkdir -p results
 
+# Con Python, cada muestra la toma bench_harness.py (un posix_spawn por
+# muestra, perf_counter_ns y rusage; sin los forks de date/bc de abajo,
+# que agregan ms de ruido) y el CSV queda archivado en results/archive.db.
+# El resto del script mide en bash: se usa sin Python o con BENCH_SHELL=1.
+if [ -z "$BENCH_SHELL" ] && command -v python3 &>/dev/null; then
+    exec python3 "$(dirname "$0")/bench_harness.py" startup "$REPS"
+fi
+
 echo "runtime,image,rep,startup_ms" > "$OUTFILE"
 
 echo "=== Exp 1: Startup Latency ($REPS reps + 1 warm-up) ==="
@@ -68,3 +76,9 @@ else
 fi
 
 echo "Resultados guardados en $OUTFILE"
+
+# Guardar esta corrida en el historial (results/archive.db); con Python
+# y sin BENCH_SHELL, bench_harness.py ya lo hizo y no se llega aquí
+if command -v python3 &>/dev/null; then
+    python3 "$(dirname "$0")/results_archive.py" record "$OUTFILE" || echo "⚠ no se pudo archivar $OUTFILE"
+fi
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+bench_stats.py — Estadística robusta para los resultados de benchmarks.
+
+Calcula, para todos los grupos a la vez (una matriz NumPy con una fila
+por grupo, rellenada con NaN):
+
+- mediana, cuartiles (np.quantile, interpolación lineal) y MAD
+- outliers por z modificado: 0.6745 * |x - mediana| / MAD > OUTLIER_Z
+- intervalos de confianza bootstrap (percentil) para la mediana
+- overhead % contra una línea base (bare metal) con su intervalo: se
+  remuestrean ambos grupos y se toma el cociente de las medianas
+
+Un overhead cuyo intervalo contiene 0 no se distingue del ruido.
+
+Para latencias de cola (exp5): percentiles(groups) da p50/p95/p99 de
+cada grupo, también en una sola pasada sobre la matriz.
+
+Para comparar dos corridas del mismo grupo (compare_results.py):
+mann_whitney(base, new) da el p-valor de Mann–Whitney U (exacto para
+muestras chicas sin empates, aproximación normal con corrección por
+empates en otro caso) y el tamaño de efecto de Cliff.
+
+Uso:
+    stats = BenchStats(table.groups("time_s", "runtime", "workload"))
+    stats.summary()[("docker", "hash")]       # {"median": ..., "ci_low": ...}
+    stats.overhead(("bare", "hash"))          # {("docker", "hash"): {"pct": ...}}
+
+La semilla es fija: los mismos datos dan siempre los mismos intervalos
+(y las mismas gráficas).
+"""
+
+import math
+
+import numpy as np
+
+CONFIDENCE = 0.95
+N_RESAMPLES = 2000
+OUTLIER_Z = 3.5                 # Iglewicz & Hoaglin
+MAX_BOOTSTRAP_CELLS = 4_000_000  # floats por bloque de remuestreo (~32 MB)
+MAX_EXACT_U = 2500              # n1 * n2 hasta el que se usa la distribución exacta
+
+
+def padded(groups):
+    """Lista de secuencias -> (matriz grupos x max_n rellena con NaN, tamaños)."""
+    counts = np.array([len(g) for g in groups], dtype=np.intp)
+    values = np.full((len(groups), counts.max(initial=0)), np.nan)
+    for i, group in enumerate(groups):
+        values[i, :counts[i]] = np.asarray(group, dtype=float)
+    return values, counts
+
+
+class BenchStats:
+    """
+    Estadísticas de un dict clave -> valores (p. ej. Table.groups()).
+    Los grupos vacíos se ignoran. Todo se calcula una vez y se memoriza.
+    """
+
+    def __init__(self, groups, confidence=CONFIDENCE, n_resamples=N_RESAMPLES, seed=0):
+        self.keys = [key for key, values in groups.items() if len(values)]
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.values, self.counts = padded([groups[key] for key in self.keys])
+        self.confidence = confidence
+        self.n_resamples = n_resamples
+        self.seed = seed
+        self._summary = None
+        self._boot = None
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def interval(self, samples):
+        """Percentiles del intervalo de confianza sobre el último eje."""
+        alpha = (1 - self.confidence) / 2
+        low, high = np.quantile(samples, [alpha, 1 - alpha], axis=-1)
+        return low, high
+
+    def deviations(self):
+        """(medianas, |x - mediana| por elemento, MAD) de cada grupo."""
+        medians = np.nanmedian(self.values, axis=1)
+        deviations = np.abs(self.values - medians[:, None])
+        return medians, deviations, np.nanmedian(deviations, axis=1)
+
+    def outlier_mask(self):
+        """Matriz booleana (como self.values): True en los outliers."""
+        _, deviations, mad = self.deviations()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = 0.6745 * deviations / mad[:, None]
+        # Con MAD = 0 (más de la mitad de valores iguales) no se marca nada
+        return np.where(mad[:, None] > 0, z > OUTLIER_Z, False)
+
+    def bootstrap_medians(self):
+        """Matriz grupos x n_resamples con la mediana de cada remuestreo."""
+        if self._boot is None:
+            rng = np.random.default_rng(self.seed)
+            n_groups, width = self.values.shape
+            rows = np.arange(n_groups)[:, None, None]
+            beyond = np.arange(width) >= self.counts[:, None, None]
+            # Si todos los grupos tienen el mismo tamaño no hay relleno y
+            # np.median (sin NaN) es varias veces más rápido
+            median = np.nanmedian if beyond.any() else np.median
+            block = max(1, MAX_BOOTSTRAP_CELLS // max(1, n_groups * width))
+
+            boot = np.empty((n_groups, self.n_resamples))
+            for start in range(0, self.n_resamples, block):
+                size = min(block, self.n_resamples - start)
+                # Índices uniformes en [0, n_i) para cada grupo
+                picks = (rng.random((n_groups, size, width)) * self.counts[:, None, None]).astype(np.intp)
+                sample = self.values[rows, picks]
+                sample[np.broadcast_to(beyond, sample.shape)] = np.nan
+                boot[:, start:start + size] = median(sample, axis=2)
+            self._boot = boot
+        return self._boot
+
+    def summary(self):
+        """
+        Clave -> {"n", "median", "q1", "q3", "mad", "outliers", "ci_low",
+        "ci_high"}; ci_* es el intervalo bootstrap de la mediana.
+        """
+        if self._summary is None:
+            medians, _, mad = self.deviations()
+            q1, q3 = np.nanquantile(self.values, [0.25, 0.75], axis=1)
+            outliers = self.outlier_mask().sum(axis=1)
+            ci_low, ci_high = self.interval(self.bootstrap_medians())
+            self._summary = {
+                key: {
+                    "n": int(self.counts[i]),
+                    "median": float(medians[i]),
+                    "q1": float(q1[i]),
+                    "q3": float(q3[i]),
+                    "mad": float(mad[i]),
+                    "outliers": int(outliers[i]),
+                    "ci_low": float(ci_low[i]),
+                    "ci_high": float(ci_high[i]),
+                }
+                for i, key in enumerate(self.keys)
+            }
+        return self._summary
+
+    def overhead(self, baseline, keys=None):
+        """
+        Overhead % de la mediana de cada grupo respecto a `baseline`, con
+        intervalo bootstrap del cociente de medianas.
+
+        Retorna clave -> {"pct", "ci_low", "ci_high", "significant"}, sin
+        la línea base; {} si la línea base no está o su mediana es 0.
+        "significant" es False cuando el intervalo contiene 0.
+        """
+        if baseline not in self.index:
+            return {}
+        boot = self.bootstrap_medians()
+        base = self.index[baseline]
+        medians = np.nanmedian(self.values, axis=1)
+        if medians[base] == 0:
+            return {}
+
+        keys = [k for k in (keys or self.keys) if k in self.index and k != baseline]
+        rows = [self.index[k] for k in keys]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            samples = (boot[rows] / boot[base] - 1) * 100
+        ci_low, ci_high = self.interval(samples)
+        pct = (medians[rows] / medians[base] - 1) * 100
+        return {
+            key: {
+                "pct": float(pct[j]),
+                "ci_low": float(ci_low[j]),
+                "ci_high": float(ci_high[j]),
+                "significant": bool(ci_low[j] > 0 or ci_high[j] < 0),
+            }
+            for j, key in enumerate(keys)
+        }
+
+
+def percentiles(groups, qs=(50, 95, 99)):
+    """
+    Clave -> {"p50": ..., "p95": ..., "p99": ...} (interpolación lineal,
+    como np.percentile). Los grupos vacíos se ignoran.
+    """
+    keys = [key for key, values in groups.items() if len(values)]
+    if not keys:
+        return {}
+    values, _ = padded([groups[key] for key in keys])
+    result = np.nanpercentile(values, qs, axis=1)
+    return {key: {f"p{q:g}": float(result[j, i]) for j, q in enumerate(qs)}
+            for i, key in enumerate(keys)}
+
+
+def average_ranks(values):
+    """Rangos 1..n de un array, con el promedio para los empates."""
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    return (ends - (counts - 1) / 2)[inverse], counts
+
+
+def exact_u_distribution(n1, n2):
+    """
+    Probabilidad de cada U = 0..n1*n2 bajo H0 (sin empates). Recurrencia
+    clásica: c(u; m, n) = c(u - n; m - 1, n) + c(u; m, n - 1).
+    """
+    # counts[m][u] = c(u; m, n) para el n actual; con n = 0 solo U = 0
+    counts = [np.zeros(n1 * n2 + 1) for _ in range(n1 + 1)]
+    for m in range(n1 + 1):
+        counts[m][0] = 1
+    for n in range(1, n2 + 1):
+        for m in range(1, n1 + 1):
+            counts[m][n:] += counts[m - 1][:-n]
+    return counts[n1] / counts[n1].sum()
+
+
+def mann_whitney(base, new):
+    """
+    Prueba de Mann–Whitney U de dos colas entre dos muestras.
+
+    Retorna {"u", "p", "effect", "exact"}: u es el estadístico de `new`,
+    effect es el delta de Cliff P(new > base) - P(new < base), en [-1, 1]
+    (positivo = new tiende a ser mayor).
+    """
+    base = np.asarray(base, dtype=float)
+    new = np.asarray(new, dtype=float)
+    n1, n2 = len(new), len(base)
+    ranks, ties = average_ranks(np.concatenate([new, base]))
+    u = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2)
+    effect = 2 * u / (n1 * n2) - 1
+
+    exact = bool((ties == 1).all()) and n1 * n2 <= MAX_EXACT_U
+    if exact:
+        dist = exact_u_distribution(n1, n2)
+        k = int(round(u))
+        p = 2 * min(dist[:k + 1].sum(), dist[k:].sum())
+    else:
+        n = n1 + n2
+        tie_term = float((ties ** 3 - ties).sum()) / (n * (n - 1))
+        sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+        if sigma == 0:
+            p = 1.0
+        else:
+            z = (abs(u - n1 * n2 / 2) - 0.5) / sigma  # con corrección de continuidad
+            p = math.erfc(max(z, 0) / math.sqrt(2))
+    return {"u": u, "p": float(min(p, 1.0)), "effect": float(effect), "exact": exact}
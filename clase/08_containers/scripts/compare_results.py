@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+compare_results.py — Detecta regresiones entre corridas de benchmarks.
+
+Compara una corrida base contra una o más corridas nuevas (cada una es
+un directorio con los CSVs de results/ o una corrida archivada en
+results/archive.db, ver results_archive.py), configuración por
+configuración: para cada grupo (p. ej. docker/alpine en exp1) aplica
+Mann–Whitney U a las repeticiones de ambas corridas (bench_stats).
+
+Un grupo es una regresión si su mediana empeora más que `threshold` %
+y el cambio es significativo (p < alpha); una mejora, en el caso
+simétrico. Todas las métricas comparadas son tiempos: más alto es peor.
+
+Uso (desde analyze.py):
+    python3 analyze.py --compare results_kernel_6.1/ results/ --threshold 5
+    python3 analyze.py --compare @3 @7       # corridas archivadas
+    # código de salida 1 si hay alguna regresión
+"""
+
+import math
+
+import numpy as np
+
+from bench_stats import mann_whitney
+
+THRESHOLD_PCT = 5.0
+ALPHA = 0.05
+
+# CSV -> (columna medida, columnas que definen la configuración, unidad)
+# exp2 no se compara: tiene una sola medición por configuración.
+COMPARISONS = {
+    "exp1_startup": ("startup_ms", ("runtime", "image"), "ms"),
+    "exp3_runtime": ("time_s", ("runtime", "workload"), "s"),
+    "exp4_nested": ("value", ("method", "metric"), ""),
+    "exp5_concurrency": ("latency_ms", ("runtime", "concurrency"), "ms"),
+}
+
+
+def min_p_value(n1, n2):
+    """El p-valor más chico (dos colas) que Mann–Whitney puede dar con n1 y n2."""
+    return 2 / math.comb(n1 + n2, n1)
+
+
+def verdict(change_pct, p, threshold, alpha, n1, n2):
+    """
+    'regresion', 'mejora', 'sin cambio' o 'n insuficiente' (con tan pocas
+    repeticiones ningún cambio podría ser significativo).
+    """
+    if min_p_value(n1, n2) >= alpha:
+        return "n insuficiente"
+    if p >= alpha or abs(change_pct) <= threshold:
+        return "sin cambio"
+    return "regresion" if change_pct > 0 else "mejora"
+
+
+def compare_stores(base, new, threshold=THRESHOLD_PCT, alpha=ALPHA):
+    """
+    Compara dos ResultStore.
+
+    Retorna una lista de dicts, una por configuración presente en ambas
+    corridas: {"experiment", "config", "unit", "n_base", "n_new",
+    "base_median", "new_median", "change_pct", "p", "effect", "verdict"}.
+    """
+    rows = []
+    for name, (value, keys, unit) in COMPARISONS.items():
+        base_table, new_table = base.table(name), new.table(name)
+        if not base_table or not new_table:
+            continue
+        base_groups = base_table.groups(value, *keys)
+        new_groups = new_table.groups(value, *keys)
+        for config, base_values in base_groups.items():
+            new_values = new_groups.get(config)
+            if not new_values or not base_values:
+                continue
+            base_median = float(np.median(base_values))
+            new_median = float(np.median(new_values))
+            change_pct = (new_median / base_median - 1) * 100 if base_median else 0.0
+            test = mann_whitney(base_values, new_values)
+            rows.append({
+                "experiment": name,
+                "config": "/".join(map(str, config)),
+                "unit": unit,
+                "n_base": len(base_values),
+                "n_new": len(new_values),
+                "base_median": base_median,
+                "new_median": new_median,
+                "change_pct": change_pct,
+                "p": test["p"],
+                "effect": test["effect"],
+                "verdict": verdict(change_pct, test["p"], threshold, alpha,
+                                   len(base_values), len(new_values)),
+            })
+    return rows
+
+
+def print_comparison(base_label, new_label, rows):
+    """Imprime la comparación de una corrida nueva contra la base."""
+    print(f"\n{base_label}  ->  {new_label}")
+    if not rows:
+        print("  (sin configuraciones en común)")
+        return
+    experiment = None
+    for row in rows:
+        if row["experiment"] != experiment:
+            experiment = row["experiment"]
+            print(f"  {experiment}:")
+        marker = {"regresion": "  REGRESIÓN", "mejora": "  mejora",
+                  "n insuficiente": "  (n insuficiente)"}.get(row["verdict"], "")
+        unit = f" {row['unit']}" if row["unit"] else ""
+        print(f"    {row['config']:24s} {row['base_median']:10.4g} -> {row['new_median']:<10.4g}{unit:3s} "
+              f"{row['change_pct']:+7.1f}%  p={row['p']:.3f}  δ={row['effect']:+.2f}"
+              f"  (n={row['n_base']}/{row['n_new']}){marker}")
+
+
+def compare_sources(sources, threshold=THRESHOLD_PCT, alpha=ALPHA):
+    """
+    Compara sources[1:] contra sources[0] (pares (etiqueta, store) con
+    store.table(nombre), p. ej. ResultStore o ArchiveStore), imprime el
+    reporte y retorna el número de regresiones encontradas.
+    """
+    base_label, base = sources[0]
+    regressions = undecided = 0
+    for new_label, new in sources[1:]:
+        rows = compare_stores(base, new, threshold, alpha)
+        print_comparison(base_label, new_label, rows)
+        regressions += sum(row["verdict"] == "regresion" for row in rows)
+        undecided += sum(row["verdict"] == "n insuficiente" for row in rows)
+
+    print(f"\nUmbral: {threshold:g}%  alpha: {alpha:g}  (δ = delta de Cliff; + = más lento)")
+    print(f"Regresiones: {regressions}")
+    if undecided:
+        print(f"Sin veredicto por pocas repeticiones: {undecided} (usa más REPS)")
+    return regressions
@@ -16,6 +16,14 @@ CSV="$SCRIPT_DIR/results/exp4_nested.csv"
 REPS=5
 WARMUP=1
 
+# Con Python, cada muestra la toma bench_harness.py (un posix_spawn por
+# muestra, perf_counter_ns y rusage; sin los forks de date/bc de abajo,
+# que agregan ms de ruido) y el CSV queda archivado en results/archive.db.
+# El resto del script mide en bash: se usa sin Python o con BENCH_SHELL=1.
+if [ -z "$BENCH_SHELL" ] && command -v python3 &>/dev/null; then
+    exec python3 "$SCRIPT_DIR/bench_harness.py" nested "$REPS"
+fi
+
 mkdir -p "$SCRIPT_DIR/results"
 echo "method,metric,rep,value" > "$CSV"
 
@@ -157,3 +165,9 @@ echo "--- Cleanup ---"
 docker rm -f exp4-docker-l1 exp4-dind > /dev/null 2>&1 || true
 podman rm -f exp4-podman-l1 exp4-podman-nest > /dev/null 2>&1 || true
 echo "Done. Results: $CSV"
+
+# Guardar esta corrida en el historial (results/archive.db); con Python
+# y sin BENCH_SHELL, bench_harness.py ya lo hizo y no se llega aquí
+if command -v python3 &>/dev/null; then
+    python3 "$(dirname "$0")/results_archive.py" record "$CSV" || echo "⚠ no se pudo archivar $CSV"
+fi
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+fake_runtime.py — Runtime de contenedores de mentira para probar
+bench_concurrency.py sin Docker ni Podman.
+
+Entiende el subconjunto de la CLI que usa el driver:
+
+    fake_runtime.py [--daemon] run -d --name NOMBRE IMAGEN CMD...
+    fake_runtime.py rm -f NOMBRE...
+    fake_runtime.py pull [-q] IMAGEN
+    fake_runtime.py --version
+
+`run` no crea ningún contenedor: duerme FAKE_RUNTIME_MS ms (±20%, lo
+que tardaría armar namespaces, overlay y cgroups) y deja un archivo con
+el nombre en el directorio de estado, así que un nombre repetido falla
+con código 125, igual que en docker. Con --daemon, además, cada
+arranque pasa FAKE_DAEMON_MS ms con un lock global tomado: como los
+arranques que dockerd serializa, la latencia crece con la concurrencia.
+Sin --daemon (modelo fork-exec de Podman) los arranques no se esperan
+entre sí.
+
+Variables: FAKE_RUNTIME_MS (default 30), FAKE_DAEMON_MS (default 10),
+FAKE_RUNTIME_STATE (default /tmp/fake_runtime_<uid>).
+"""
+
+import fcntl
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+STATE_DIR = Path(os.environ.get("FAKE_RUNTIME_STATE")
+                 or Path(tempfile.gettempdir()) / f"fake_runtime_{os.getuid()}")
+SETUP_MS = float(os.environ.get("FAKE_RUNTIME_MS", 30))
+DAEMON_MS = float(os.environ.get("FAKE_DAEMON_MS", 10))
+
+
+def run(args, daemon):
+    """run -d --name NOMBRE IMAGEN CMD... -> código de salida."""
+    if "--name" not in args or args.index("--name") + 1 >= len(args):
+        print("fake_runtime: run necesita --name", file=sys.stderr)
+        return 125
+    name = args[args.index("--name") + 1]
+
+    if daemon:
+        with open(STATE_DIR / ".daemon.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            time.sleep(DAEMON_MS / 1000)
+    try:
+        (STATE_DIR / name).touch(exist_ok=False)
+    except FileExistsError:
+        print(f'fake_runtime: the container name "{name}" is already in use', file=sys.stderr)
+        return 125
+    time.sleep(SETUP_MS * random.uniform(0.8, 1.2) / 1000)
+    print(name)
+    return 0
+
+
+def rm(args):
+    """rm -f NOMBRE... -> 0 (los nombres que no existen se ignoran)."""
+    for name in args:
+        if not name.startswith("-"):
+            (STATE_DIR / name).unlink(missing_ok=True)
+    return 0
+
+
+def main():
+    args = sys.argv[1:]
+    daemon = "--daemon" in args
+    if daemon:
+        args.remove("--daemon")
+    if not args:
+        print(__doc__.strip().splitlines()[0], file=sys.stderr)
+        return 2
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+
+    command, rest = args[0], args[1:]
+    if command == "--version":
+        print("fake_runtime version 1.0 (daemon)" if daemon else "fake_runtime version 1.0")
+        return 0
+    if command == "run":
+        return run(rest, daemon)
+    if command == "rm":
+        return rm(rest)
+    if command == "pull":
+        return 0
+    print(f"fake_runtime: comando no soportado: {command}", file=sys.stderr)
+    return 125
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+results_archive.py — Historial de corridas de benchmarks en SQLite.
+
+Cada benchmark sobrescribe su CSV en results/; este módulo guarda una
+copia de cada CSV en results/archive.db antes de que eso pase, junto con
+la huella del entorno que lo produjo (host, kernel, CPU, versión de
+cgroups, docker --version, podman --version).
+
+Tablas:
+    runs            id, recorded_at, fingerprint, environment (JSON)
+    run_files       run_id, experiment, measured_at, sha256, rows
+    samples_<exp>   run_id + las columnas del CSV, tipadas como en
+                    results_store.SCHEMAS (p. ej. samples_exp1_startup)
+
+El archivo es de solo agregado: runs y run_files rechazan UPDATE y
+DELETE. Un CSV ya archivado (mismo experimento, mismo SHA-256) no se
+vuelve a guardar.
+
+Uso:
+    python3 results_archive.py record results/exp1_startup.csv   # lo hacen los bench_*.sh
+    python3 results_archive.py record                            # todos los results/exp*.csv
+    python3 results_archive.py runs
+
+    archive = Archive(RESULTS_DIR / "archive.db")
+    archive.runs()                        # [{"id": 3, "experiments": [...], ...}]
+    archive.store(3).table("exp1_startup")   # misma Table que ResultStore
+    archive.medians("exp3_runtime", "time_s", ("runtime", "workload"))
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+
+from results_store import SCHEMAS, Table, read_table
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_ARCHIVE = RESULTS_DIR / "archive.db"
+
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+SQL_TYPES = {"d": "REAL", "q": "INTEGER"}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_files (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    experiment TEXT NOT NULL,
+    measured_at TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (run_id, experiment),
+    UNIQUE (experiment, sha256)
+);
+CREATE TRIGGER IF NOT EXISTS runs_append_only_update BEFORE UPDATE ON runs
+    BEGIN SELECT RAISE(ABORT, 'archive.db es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS runs_append_only_delete BEFORE DELETE ON runs
+    BEGIN SELECT RAISE(ABORT, 'archive.db es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS run_files_append_only_update BEFORE UPDATE ON run_files
+    BEGIN SELECT RAISE(ABORT, 'archive.db es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS run_files_append_only_delete BEFORE DELETE ON run_files
+    BEGIN SELECT RAISE(ABORT, 'archive.db es de solo agregado'); END;
+"""
+
+
+# ----------------------------------------------------------------------
+# Huella del entorno
+# ----------------------------------------------------------------------
+
+def command_version(*cmd):
+    """Primera línea de `cmd`, o None si no está instalado o falla."""
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.strip().splitlines()[0] if out.strip() else None
+
+
+def cpu_model():
+    """Modelo de CPU según /proc/cpuinfo (o platform.processor())."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or None
+
+
+def cgroup_version():
+    """'v2' si /sys/fs/cgroup es cgroup2 (unificado), 'v1' si no, None fuera de Linux."""
+    if not Path("/sys/fs/cgroup").exists():
+        return None
+    return "v2" if Path("/sys/fs/cgroup/cgroup.controllers").exists() else "v1"
+
+
+def environment():
+    """Descripción del entorno que produce los números."""
+    uname = platform.uname()
+    return {
+        "hostname": uname.node,
+        "system": uname.system,
+        "kernel": uname.release,
+        "machine": uname.machine,
+        "cpu_model": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "cgroup": cgroup_version(),
+        "docker": command_version("docker", "--version"),
+        "podman": command_version("podman", "--version"),
+    }
+
+
+def fingerprint(env):
+    """SHA-256 corto del entorno: mismo valor = misma máquina y versiones."""
+    return hashlib.sha256(json.dumps(env, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# ----------------------------------------------------------------------
+# Archivo
+# ----------------------------------------------------------------------
+
+class ArchiveStore:
+    """Los CSVs de una corrida archivada, con la misma interfaz que ResultStore."""
+
+    def __init__(self, archive, run_id):
+        self.archive = archive
+        self.run_id = run_id
+        self._tables = {}
+
+    def table(self, name):
+        """Table del experimento `name` en esta corrida, o None (se avisa una vez)."""
+        if name not in self._tables:
+            table = self.archive.table(self.run_id, name)
+            if table is None:
+                print(f"  Sin datos de {name} en la corrida @{self.run_id}")
+            self._tables[name] = table
+        return self._tables[name]
+
+
+class Archive:
+    """Archivo SQLite de corridas (ver el docstring del módulo)."""
+
+    def __init__(self, path=DEFAULT_ARCHIVE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA_SQL)
+
+    def close(self):
+        self.conn.close()
+
+    def sample_columns(self, experiment):
+        """Columnas de samples_<experiment> (sin run_id), [] si no existe."""
+        rows = self.conn.execute(f'PRAGMA table_info("samples_{experiment}")').fetchall()
+        return [row[1] for row in rows if row[1] != "run_id"]
+
+    def ensure_samples_table(self, experiment, header, schema):
+        """Crea samples_<experiment> o le agrega las columnas nuevas del CSV."""
+        existing = self.sample_columns(experiment)
+        if not existing:
+            columns = ", ".join(f'"{c}" {SQL_TYPES.get(schema.get(c), "TEXT")}' for c in header)
+            self.conn.execute(f'CREATE TABLE "samples_{experiment}" (run_id INTEGER NOT NULL, {columns})')
+            self.conn.execute(f'CREATE INDEX "samples_{experiment}_run" ON "samples_{experiment}" (run_id)')
+            return
+        for column in header:
+            if column not in existing:
+                sql_type = SQL_TYPES.get(schema.get(column), "TEXT")
+                self.conn.execute(f'ALTER TABLE "samples_{experiment}" ADD COLUMN "{column}" {sql_type}')
+
+    def record(self, csv_paths, env=None):
+        """
+        Archiva CSVs de results/ como una corrida.
+
+        Los CSVs ya archivados (mismo contenido) se saltan. Retorna el id
+        de la corrida nueva, o None si no había nada nuevo que guardar.
+        """
+        env = env or environment()
+        files = []
+        for csv_path in map(Path, csv_paths):
+            experiment = csv_path.stem
+            try:
+                digest = hashlib.sha256(csv_path.read_bytes()).hexdigest()
+            except OSError:
+                print(f"  Archivo no encontrado: {csv_path}")
+                continue
+            known = self.conn.execute(
+                "SELECT run_id FROM run_files WHERE experiment = ? AND sha256 = ?",
+                (experiment, digest)).fetchone()
+            if known:
+                print(f"  {csv_path.name} ya está archivado (corrida @{known[0]})")
+                continue
+            table = read_table(csv_path, SCHEMAS.get(experiment))
+            if table is None:
+                continue
+            if not IDENTIFIER_RE.match(experiment) or not all(map(IDENTIFIER_RE.match, table.columns)):
+                print(f"  {csv_path.name}: nombres de columna no válidos, no se archiva")
+                continue
+            measured_at = datetime.fromtimestamp(csv_path.stat().st_mtime, timezone.utc)
+            files.append((experiment, digest, measured_at.isoformat(timespec="seconds"), table))
+
+        if not files:
+            return None
+
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (recorded_at, fingerprint, environment) VALUES (?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                 fingerprint(env), json.dumps(env, sort_keys=True))).lastrowid
+            for experiment, digest, measured_at, table in files:
+                header = list(table.columns)
+                self.ensure_samples_table(experiment, header, SCHEMAS.get(experiment, {}))
+                columns = ", ".join(f'"{c}"' for c in header)
+                placeholders = ", ".join("?" * (len(header) + 1))
+                self.conn.executemany(
+                    f'INSERT INTO "samples_{experiment}" (run_id, {columns}) VALUES ({placeholders})',
+                    ((run_id,) + row for row in zip(*table.columns.values())))
+                self.conn.execute(
+                    "INSERT INTO run_files (run_id, experiment, measured_at, sha256, rows) VALUES (?, ?, ?, ?, ?)",
+                    (run_id, experiment, measured_at, digest, len(table)))
+        return run_id
+
+    def runs(self, experiment=None):
+        """
+        Corridas, de la más vieja a la más nueva (opcionalmente solo las
+        que incluyen `experiment`): dicts con id, recorded_at,
+        fingerprint, environment y experiments.
+        """
+        query = "SELECT id, recorded_at, fingerprint, environment FROM runs"
+        params = ()
+        if experiment:
+            query += " WHERE id IN (SELECT run_id FROM run_files WHERE experiment = ?)"
+            params = (experiment,)
+        experiments = {}
+        for run_id, name in self.conn.execute("SELECT run_id, experiment FROM run_files ORDER BY experiment"):
+            experiments.setdefault(run_id, []).append(name)
+        return [
+            {"id": run_id, "recorded_at": recorded_at, "fingerprint": fp,
+             "environment": json.loads(env), "experiments": experiments.get(run_id, [])}
+            for run_id, recorded_at, fp, env in self.conn.execute(query + " ORDER BY id", params)
+        ]
+
+    def table(self, run_id, experiment):
+        """Table con las muestras de `experiment` en la corrida, o None."""
+        columns = self.sample_columns(experiment) if IDENTIFIER_RE.match(experiment) else []
+        if not columns:
+            return None
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        rows = self.conn.execute(
+            f'SELECT {quoted} FROM "samples_{experiment}" WHERE run_id = ? ORDER BY rowid',
+            (run_id,)).fetchall()
+        if not rows:
+            return None
+        schema = SCHEMAS.get(experiment, {})
+        data = {}
+        for name, values in zip(columns, zip(*rows)):
+            if name in schema:
+                data[name] = array(schema[name], values)
+            else:
+                data[name] = [sys.intern(v) if isinstance(v, str) else v for v in values]
+        return Table(experiment, data)
+
+    def store(self, run_id):
+        """ResultStore equivalente para una corrida archivada."""
+        return ArchiveStore(self, run_id)
+
+    def medians(self, experiment, value, keys):
+        """
+        Tendencia: configuración -> [(run_id, recorded_at, mediana)] en
+        orden de corrida, para cada corrida que incluye `experiment`.
+        """
+        trend = {}
+        for run in self.runs(experiment):
+            table = self.table(run["id"], experiment)
+            if not table or value not in table:
+                continue
+            for config, values in table.groups(value, *keys).items():
+                trend.setdefault(config, []).append(
+                    (run["id"], run["recorded_at"], statistics.median(values)))
+        return trend
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("record", "runs"):
+        print("Uso: python3 results_archive.py record [CSV ...] | runs")
+        sys.exit(2)
+
+    archive = Archive()
+    if args[0] == "record":
+        paths = args[1:] or sorted(RESULTS_DIR.glob("exp*.csv"))
+        run_id = archive.record(paths)
+        if run_id:
+            print(f"Archivado como corrida @{run_id} en {archive.path}")
+    else:
+        for run in archive.runs():
+            env = run["environment"]
+            print(f"@{run['id']:<4d} {run['recorded_at']}  {env.get('hostname')}  "
+                  f"kernel {env.get('kernel')}  {', '.join(run['experiments'])}")
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+results_store.py — Tablas columnares tipadas para los CSVs de results/.
+
+Cada CSV se lee una sola vez (sin un dict por fila) y se guarda por
+columnas: los números en array('d') / array('q') y los textos
+(runtime, image, workload...) como listas de strings internados. Las
+gráficas y el resumen de analyze.py comparten la misma tabla.
+
+Uso:
+    store = ResultStore(RESULTS_DIR)
+    startup = store.table("exp1_startup")
+    startup.groups("startup_ms", "runtime", "image")[("docker", "alpine")]
+    # -> array('d', [...]) con todas las repeticiones de docker/alpine
+
+Los arrays exponen el protocolo de buffer: numpy.frombuffer(col) da una
+vista sin copiar.
+"""
+
+import csv
+import sys
+from array import array
+from pathlib import Path
+
+# Tipos por columna: "d" = float, "q" = int, el resto se queda como texto.
+# Las filas con un valor numérico inválido (p. ej. "error") se descartan,
+# igual que hacían los try/except de analyze.py.
+SCHEMAS = {
+    "exp1_startup": {"rep": "q", "startup_ms": "d"},
+    "exp2_scale": {"count": "q", "launch_time_s": "d", "per_container_kb": "d",
+                   "total_container_kb": "d", "daemon_rss_kb": "d"},
+    "exp3_runtime": {"rep": "q", "time_s": "d"},
+    "exp4_nested": {"rep": "q", "value": "d"},
+    "exp5_concurrency": {"concurrency": "q", "round": "q", "container": "q",
+                         "offset_ms": "d", "latency_ms": "d"},
+}
+
+# rusage por muestra que escribe bench_harness.py junto a exp1/exp3/exp4,
+RUSAGE_SCHEMA = {"rep": "q", "user_s": "d", "sys_s": "d", "maxrss_kb": "q"}
+# y cuántas muestras tomó cada configuración (ver RepPolicy)
+STOPS_SCHEMA = {"reps": "q", "ci_rel_width": "d"}
+for _name in ("exp1_startup", "exp3_runtime", "exp4_nested"):
+    SCHEMAS[f"{_name}_rusage"] = RUSAGE_SCHEMA
+    SCHEMAS[f"{_name}_stops"] = STOPS_SCHEMA
+
+
+class Table:
+    """Tabla columnar: nombre de columna -> array (números) o list (texto)."""
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns
+        self.length = len(next(iter(columns.values()))) if columns else 0
+        self._groups = {}
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def groups(self, value, *keys):
+        """
+        Divide la columna `value` por las columnas `keys`, conservando el
+        orden de las filas. Con una sola clave el dict usa el valor
+        directo; con varias, una tupla. El resultado se memoriza.
+        """
+        cache_key = (value, keys)
+        if cache_key not in self._groups:
+            column = self.columns[value]
+            key_columns = [self.columns[k] for k in keys]
+            key_iter = key_columns[0] if len(keys) == 1 else zip(*key_columns)
+            typecode = column.typecode if isinstance(column, array) else None
+
+            groups = {}
+            for key, item in zip(key_iter, column):
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = array(typecode) if typecode else []
+                group.append(item)
+            self._groups[cache_key] = groups
+        return self._groups[cache_key]
+
+
+CONVERTERS = {"d": float, "q": int}
+
+
+def split_columns(text):
+    """
+    Texto CSV -> (encabezado, lista de columnas de texto). Las filas con
+    un número de campos distinto al del encabezado se ignoran.
+
+    Los CSVs de los benchmarks no usan comillas: en ese caso se separa
+    todo el archivo de una vez y cada columna sale de un slice, sin
+    crear una lista por fila. Con comillas o filas irregulares se usa
+    el módulo csv.
+    """
+    lines = [line for line in text.splitlines() if line]
+    if not lines:
+        return None, []
+    header = lines[0].split(",")
+    body = lines[1:]
+    width = len(header)
+
+    if '"' not in text and all(line.count(",") == width - 1 for line in body):
+        cells = ",".join(body).split(",") if body else []
+        return header, [cells[i::width] for i in range(width)]
+
+    rows = list(csv.reader(lines))
+    header, body = rows[0], [row for row in rows[1:] if len(row) == len(rows[0])]
+    return header, [list(column) for column in zip(*body)] if body else [[] for _ in header]
+
+
+def convert_columns(header, raw, schema):
+    """Columnas de texto -> columnas tipadas. ValueError si un número no es válido."""
+    return {
+        name: array(schema[name], map(CONVERTERS[schema[name]], values)) if name in schema
+        else [sys.intern(v) for v in values]
+        for name, values in zip(header, raw)
+    }
+
+
+def valid_row(row, typed):
+    """True si todas las columnas numéricas (índice, typecode) se pueden convertir."""
+    try:
+        for i, typecode in typed:
+            CONVERTERS[typecode](row[i])
+    except ValueError:
+        return False
+    return True
+
+
+def read_table(path, schema=None):
+    """
+    Lee un CSV a una Table. Retorna None si el archivo no existe o no
+    tiene encabezado.
+    """
+    schema = schema or {}
+    try:
+        with open(path, newline="") as f:
+            header, raw = split_columns(f.read())
+    except OSError:
+        return None
+    if not header:
+        return None
+
+    try:
+        columns = convert_columns(header, raw, schema)
+    except ValueError:
+        # Hay valores inválidos: descartar esas filas y volver a convertir
+        typed = [(i, schema[name]) for i, name in enumerate(header) if name in schema]
+        rows = [row for row in zip(*raw) if valid_row(row, typed)]
+        raw = [list(column) for column in zip(*rows)] if rows else [[] for _ in header]
+        columns = convert_columns(header, raw, schema)
+
+    return Table(Path(path).stem, columns)
+
+
+class ResultStore:
+    """Carga perezosa y memorizada de results/<nombre>.csv."""
+
+    def __init__(self, results_dir):
+        self.results_dir = Path(results_dir)
+        self._tables = {}
+
+    def table(self, name):
+        """Table de results/<name>.csv, o None si no existe (se avisa una vez)."""
+        if name not in self._tables:
+            path = self.results_dir / f"{name}.csv"
+            table = read_table(path, SCHEMAS.get(name))
+            if table is None:
+                print(f"  Archivo no encontrado: {path}")
+            self._tables[name] = table
+        return self._tables[name]
@@ -1,5 +1,5 @@
 #!/bin/bash
-# run_all.sh — Ejecuta los 3 experimentos de benchmark y genera gráficas
+# run_all.sh — Ejecuta los 5 experimentos de benchmark y genera gráficas
 # Uso: bash run_all.sh
 # Requiere: docker y/o podman instalados, Python 3 con matplotlib para gráficas
 set -e
@@ -9,9 +9,14 @@ cd "$SCRIPT_DIR"
 
 mkdir -p results
 
+# Repeticiones adaptativas (bench_harness.py): cada configuración se mide
+# hasta que el IC 95% de su mediana sea a lo más 5% de la mediana, con
+# entre 5 y 30 muestras. BENCH_CI_WIDTH= (vacío) usa repeticiones fijas.
+export BENCH_CI_WIDTH=${BENCH_CI_WIDTH-0.05}
+
 echo "============================================"
 echo "  Benchmarks de Contenedores"
-echo "  4 Experimentos: LAUNCH + CAPACITY + RUNNING + NESTED"
+echo "  5 Experimentos: LAUNCH + CAPACITY + RUNNING + NESTED + CONCURRENCIA"
 echo "============================================"
 echo ""
 
@@ -35,6 +40,7 @@ BENCHMARKS=(
     "bench_scale.sh:Exp 2 — Resource Footprint at Scale (LAUNCH + CAPACITY)"
     "bench_runtime.sh:Exp 3 — Runtime Overhead (RUNNING cost)"
     "exp4_nested.sh:Exp 4 — Nested Container Performance"
+    "bench_concurrency.py:Exp 5 — Concurrent Launch (LAUNCH bajo concurrencia)"
 )
 
 for entry in "${BENCHMARKS[@]}"; do
@@ -46,8 +52,14 @@ for entry in "${BENCHMARKS[@]}"; do
     echo "  ($script)"
     echo "--------------------------------------------"
 
-    if [ -f "$script" ]; then
-        bash "$script" || echo "⚠ $script terminó con errores (continuando...)"
+    if [ "${script##*.}" = "py" ] && ! command -v python3 &>/dev/null; then
+        echo "⚠ $script necesita Python 3, saltando"
+    elif [ -f "$script" ]; then
+        if [ "${script##*.}" = "py" ]; then
+            python3 "$script" || echo "⚠ $script terminó con errores (continuando...)"
+        else
+            bash "$script" || echo "⚠ $script terminó con errores (continuando...)"
+        fi
     else
         echo "⚠ $script no encontrado, saltando"
     fi
@@ -66,6 +66,10 @@ module.exports = function(eleventyConfig) {
   // Copy CSS (paths relative to input directory)
   eleventyConfig.addPassthroughCopy({ "../uu_framework/eleventy/src/css": "css" });
 
+  // Copy client scripts and the search index built by preprocessing
+  eleventyConfig.addPassthroughCopy({ "../uu_framework/eleventy/src/js": "js" });
+  eleventyConfig.addPassthroughCopy({ "../uu_framework/eleventy/src/search": "search" });
+
   // Copy fonts
   eleventyConfig.addPassthroughCopy({ "../uu_framework/eleventy/src/fonts": "fonts" });
 
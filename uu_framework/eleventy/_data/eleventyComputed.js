@@ -1,6 +1,8 @@
 /**
  * Computed data for all pages
- * Provides prev/next navigation based on content collection
+ * Provides prev/next navigation and breadcrumbs from the navigation index
+ * (navigation.json, precomputed by preprocessing), falling back to the
+ * content collection for pages not in the index
  */
 
 // Extract hierarchy number from file path (e.g., "a_stack/02_llms/01_conceptos" -> "A.2.1")
@@ -101,9 +103,45 @@ function getNavTitle(item, metadata) {
   return title;
 }
 
+// Look up the current page in the navigation index (constant time)
+function getNavEntry(data) {
+  const navigation = data.navigation;
+  if (!navigation || !data.page || !data.page.inputPath) return null;
+
+  const relativePath = data.page.inputPath.replace(/^\.?\/?clase\//, '');
+  return navigation[relativePath] || null;
+}
+
+// Format a navigation index entry as a prev/next link
+function getNavLink(entry) {
+  if (!entry) return null;
+
+  const title = cleanTitle(entry.title);
+  return {
+    url: entry.url,
+    title: entry.number ? `${entry.number} ${title}` : title
+  };
+}
+
 module.exports = {
+  // Compute breadcrumbs (ancestor directories, then the current page)
+  breadcrumbs: function(data) {
+    const entry = getNavEntry(data);
+    if (!entry) return [];
+
+    const crumbs = entry.ancestors.map(ancestor => ({
+      url: ancestor.url,
+      title: cleanTitle(ancestor.title)
+    }));
+    crumbs.push({ title: cleanTitle(entry.title) });
+    return crumbs;
+  },
+
   // Compute previous page
   prevPage: function(data) {
+    const entry = getNavEntry(data);
+    if (entry) return getNavLink(entry.prev && data.navigation[entry.prev]);
+
     const collections = data.collections;
     if (!collections || !collections.content || !data.page) return null;
 
@@ -126,6 +164,9 @@ module.exports = {
 
   // Compute next page
   nextPage: function(data) {
+    const entry = getNavEntry(data);
+    if (entry) return getNavLink(entry.next && data.navigation[entry.next]);
+
     const collections = data.collections;
     if (!collections || !collections.content || !data.page) return null;
 
@@ -0,0 +1,196 @@
+/**
+ * Site search client
+ *
+ * Queries the static index built by uu_framework/scripts/search_index.py.
+ * Only the manifest is fetched up front; term shards and page chunks are
+ * downloaded on demand for each query and kept for the rest of the visit.
+ *
+ * Query terms match exactly or by prefix (exact matches rank higher).
+ * Pages must match every term.
+ */
+(function () {
+  'use strict';
+
+  const MAX_RESULTS = 10;
+  const MAX_EXPANSIONS = 50;      // Prefix matches considered per query term
+  const MIN_PREFIX_EXPANSION = 3; // Shorter terms only search shards they fall in
+  const DEBOUNCE_MS = 150;
+
+  const script = document.currentScript;
+  const manifestUrl = script.dataset.manifest;
+  const baseUrl = manifestUrl.slice(0, manifestUrl.lastIndexOf('/') + 1);
+
+  let manifestPromise = null;
+  let stopwords = null;
+  const shardCache = new Map();
+  const chunkCache = new Map();
+
+  function fetchJSON(name, options) {
+    return fetch(baseUrl + name, options).then(response => {
+      if (!response.ok) throw new Error(`${name}: ${response.status}`);
+      return response.json();
+    });
+  }
+
+  function loadManifest() {
+    if (!manifestPromise) {
+      // Shard names are content-hashed; only the manifest must be revalidated
+      manifestPromise = fetchJSON('manifest.json', { cache: 'no-cache' }).then(manifest => {
+        stopwords = new Set(manifest.stopwords);
+        return manifest;
+      });
+    }
+    return manifestPromise;
+  }
+
+  function cached(cache, name) {
+    if (!cache.has(name)) cache.set(name, fetchJSON(name));
+    return cache.get(name);
+  }
+
+  // Same rules as search_index.tokenize(): lowercase, strip accents, drop stopwords
+  function tokenize(text, manifest) {
+    const folded = text.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+    const tokens = folded.match(/[\p{L}\p{N}]+/gu) || [];
+    return [...new Set(tokens)].filter(t => t.length >= manifest.min_length && !stopwords.has(t));
+  }
+
+  // Shards that can hold `token` or terms starting with it
+  function shardsFor(token, manifest) {
+    return Object.keys(manifest.shards)
+      .filter(key => token.startsWith(key) ||
+        (token.length >= MIN_PREFIX_EXPANSION && key.startsWith(token)))
+      .map(key => manifest.shards[key]);
+  }
+
+  // First index in a sorted array whose value is >= target
+  function lowerBound(sorted, target) {
+    let lo = 0;
+    let hi = sorted.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (sorted[mid] < target) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+
+  // doc id -> score for one query token
+  async function scoreToken(token, manifest) {
+    const shards = await Promise.all(shardsFor(token, manifest).map(name => cached(shardCache, name)));
+    const scores = new Map();
+    let expansions = 0;
+
+    for (const shard of shards) {
+      for (let i = lowerBound(shard.t, token); i < shard.t.length; i++) {
+        const term = shard.t[i];
+        if (!term.startsWith(token) || expansions >= MAX_EXPANSIONS) break;
+        expansions++;
+
+        const postings = shard.p[i];
+        const idf = Math.log(1 + manifest.docs / (postings.length / 2));
+        const weight = term === token ? 1 : 0.5;
+        let doc = 0;
+        for (let j = 0; j < postings.length; j += 2) {
+          doc += postings[j];
+          scores.set(doc, (scores.get(doc) || 0) + postings[j + 1] * idf * weight);
+        }
+      }
+    }
+    return scores;
+  }
+
+  async function search(query) {
+    const manifest = await loadManifest();
+    const tokens = tokenize(query, manifest);
+    if (tokens.length === 0) return [];
+
+    const perToken = await Promise.all(tokens.map(token => scoreToken(token, manifest)));
+    perToken.sort((a, b) => a.size - b.size);
+
+    const totals = new Map(perToken[0]);
+    for (const scores of perToken.slice(1)) {
+      for (const [doc, score] of totals) {
+        if (scores.has(doc)) totals.set(doc, score + scores.get(doc));
+        else totals.delete(doc);
+      }
+    }
+
+    const top = [...totals].sort((a, b) => b[1] - a[1]).slice(0, MAX_RESULTS);
+    return Promise.all(top.map(async ([doc, score]) => {
+      const chunk = await cached(chunkCache, manifest.doc_files[Math.floor(doc / manifest.chunk)]);
+      const [url, title] = chunk[doc % manifest.chunk];
+      return { url, title, score };
+    }));
+  }
+
+  // ============================================
+  // Search box in the top bar
+  // ============================================
+
+  function init() {
+    const input = document.getElementById('search-input');
+    const results = document.getElementById('search-results');
+    if (!input || !results) return;
+
+    const pathPrefix = script.dataset.pathPrefix || '/';
+    let timer = null;
+    let latest = 0;
+
+    function render(items, query) {
+      results.innerHTML = '';
+      if (!query) {
+        results.classList.add('hidden');
+        return;
+      }
+      if (items.length === 0) {
+        results.innerHTML = '<div class="px-3 py-2 text-sm text-text-muted">Sin resultados</div>';
+      }
+      for (const item of items) {
+        const link = document.createElement('a');
+        link.href = pathPrefix.replace(/\/$/, '') + item.url;
+        link.className = 'block px-3 py-2 text-sm text-text hover:bg-bg-tertiary hover:text-accent truncate';
+        link.textContent = item.title;
+        results.appendChild(link);
+      }
+      results.classList.remove('hidden');
+    }
+
+    input.addEventListener('focus', loadManifest, { once: true });
+    input.addEventListener('input', () => {
+      clearTimeout(timer);
+      timer = setTimeout(async () => {
+        const query = input.value.trim();
+        const id = ++latest;
+        try {
+          const items = query ? await search(query) : [];
+          if (id === latest) render(items, query);
+        } catch (error) {
+          console.warn('Search unavailable:', error);
+        }
+      }, DEBOUNCE_MS);
+    });
+    input.addEventListener('keydown', event => {
+      if (event.key === 'Escape') {
+        input.value = '';
+        render([], '');
+      } else if (event.key === 'Enter') {
+        const first = results.querySelector('a');
+        if (first) window.location.href = first.href;
+      }
+    });
+    document.addEventListener('click', event => {
+      if (!results.contains(event.target) && event.target !== input) {
+        results.classList.add('hidden');
+      }
+    });
+  }
+
+  window.uuSearch = { search };
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+})();
@@ -132,6 +132,32 @@ def aggregate_all_tasks(
     return tasks
 
 
+def update_tasks(
+    tasks: Dict[str, List[Dict[str, Any]]],
+    content_dir: Path,
+    metadata: Dict[str, Any],
+    changed_files: List[str],
+    verbose: bool = False
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Replace the tasks of specific files in place (used by watch mode).
+    Produces the same ordering as a full aggregate_all_tasks run.
+    """
+    changed = set(changed_files)
+    fresh = aggregate_all_tasks(
+        content_dir,
+        {f: metadata[f] for f in changed_files if f in metadata},
+        verbose
+    )
+
+    for key, task_list in tasks.items():
+        task_list[:] = [t for t in task_list if t.get('file') not in changed]
+        task_list.extend(fresh.get(key, []))
+        task_list.sort(key=lambda task: task.get('file', ''))
+
+    return tasks
+
+
 def aggregate_by_chapter(
     tasks: Dict[str, List[Dict[str, Any]]]
 ) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Benchmark Script
+
+Generates synthetic course trees and times every stage of preprocess.py
+on them, so scaling can be measured well beyond the chapters in clase/.
+
+For each corpus size the pipeline is run cold (--no-cache) and warm
+(second run against the build manifest), with the stage timings taken
+from `preprocess.py --profile-json`. Results are saved per commit under
+uu_framework/.cache/bench/ and can be compared between runs.
+
+Usage:
+    python3 bench_preprocess.py [--sizes 100,1000,10000,50000] [--repeat N]
+    python3 bench_preprocess.py --generate DIR --sizes 1000
+    python3 bench_preprocess.py --compare BASE.json [NEW.json]
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+DEFAULT_RESULTS_DIR = Path('uu_framework/.cache/bench')
+
+WORDS = (
+    'datos contenedor proceso archivo sistema terminal comando red imagen '
+    'volumen kernel memoria usuario permiso script variable flujo tabla '
+    'consulta servidor cliente puerto registro capa paquete versión rama'
+).split()
+
+CHAPTER_NAMES = (
+    'introduccion pipeline_de_datos sistemas_operativos terminal bash git '
+    'regex contenedores python sql apis scraping nube orquestacion pruebas'
+).split()
+
+
+def generated_text(rng: random.Random, words: int) -> str:
+    """Random Spanish-looking sentence of roughly `words` words."""
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def plan_directories(md_files: int, chapters: int, depth: int, fanout: int,
+                     files_per_dir: int) -> List[str]:
+    """
+    Lay out chapter directories and nested subtopics, breadth-first, until
+    there are enough directories for `files_per_dir` markdown files each.
+
+    Returns:
+        List of relative directory paths (chapters first)
+    """
+    needed = max(1, math.ceil(md_files / files_per_dir))
+    chapters = max(1, min(chapters, needed))
+
+    dirs = []
+    levels = []
+    for i in range(chapters):
+        name = CHAPTER_NAMES[i % len(CHAPTER_NAMES)]
+        dirs.append(f"{i + 1:02d}_{name}")
+        levels.append(1)
+
+    i = 0
+    while len(dirs) < needed and i < len(dirs):
+        if levels[i] < depth:
+            for j in range(fanout):
+                if len(dirs) >= needed:
+                    break
+                dirs.append(f"{dirs[i]}/{chr(ord('a') + j)}_subtema_{j + 1}")
+                levels.append(levels[i] + 1)
+        i += 1
+    return dirs
+
+
+def lesson_markdown(rng: random.Random, title: str, args, task_id: str) -> str:
+    """Markdown for one synthetic lesson."""
+    lines = ['---', f'title: "{title}"', f'description: "{generated_text(rng, 8)}"']
+    for k in range(args.frontmatter_keys):
+        lines.append(f'extra_{k}: "{generated_text(rng, 4)}"')
+    lines += ['tags:'] + [f'  - {rng.choice(WORDS)}' for _ in range(3)]
+    lines += ['---', '', f'# {title}', '']
+
+    if rng.random() < args.homework_rate:
+        lines += [
+            f':::homework{{id="{task_id}" title="Tarea {task_id}" '
+            f'due="2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" points="10"}}',
+            generated_text(rng, 20),
+            ':::', '',
+        ]
+
+    for p in range(args.paragraphs):
+        lines += [f'## Sección {p + 1}', '', generated_text(rng, 60), '']
+        if p % 3 == 2:
+            lines += ['```bash', f'echo "{rng.choice(WORDS)}"', '```', '']
+    return '\n'.join(lines)
+
+
+def generate_corpus(root: Path, files: int, args, seed: int = 0) -> Dict[str, int]:
+    """
+    Generate a synthetic course tree with `files` files in total under
+    root/clase (markdown lessons plus PDFs and images in excluded
+    directories), along with a README.md for the landing page.
+
+    Returns:
+        Counts of generated files by kind
+    """
+    rng = random.Random(seed)
+    content = root / 'clase'
+    if content.exists():
+        shutil.rmtree(content)
+    content.mkdir(parents=True)
+
+    assets = int(files * args.asset_ratio)
+    md_files = max(1, files - assets)
+    dirs = plan_directories(md_files, args.chapters, args.depth, args.fanout, args.files_per_dir)
+
+    counts = {'dirs': len(dirs), 'markdown': 0, 'homework': 0, 'exams': 0, 'pdf': 0, 'images': 0}
+    per_dir = math.ceil(md_files / len(dirs))
+    remaining = md_files
+
+    for d, rel in enumerate(dirs):
+        path = content / rel
+        path.mkdir(parents=True, exist_ok=True)
+        n = min(per_dir, remaining)
+        if n <= 0:
+            continue
+        remaining -= n
+
+        # Directory index, optionally carrying an exam
+        title = rel.rsplit('/', 1)[-1].split('_', 1)[1].replace('_', ' ').title()
+        index = ['---', f'title: "{title}"', '---', '']
+        if rng.random() < args.exam_rate:
+            index += [f':::exam{{id="{d}.E" title="Examen {title}" date="2026-05-{rng.randint(1, 28):02d}" '
+                      f'duration="1 hora"}}', generated_text(rng, 10), ':::', '']
+            counts['exams'] += 1
+        index += [f'# {title}', '', generated_text(rng, 30), '']
+        (path / '00_index.md').write_text('\n'.join(index), encoding='utf-8')
+
+        for i in range(1, n):
+            task_id = f"{d}.{i:02d}"
+            text = lesson_markdown(rng, f"Lección {task_id}", args, task_id)
+            counts['homework'] += text.count(':::homework')
+            (path / f"{i:02d}_leccion_{i}.md").write_text(text, encoding='utf-8')
+        counts['markdown'] += n
+
+    # Assets live in excluded directories (b_libros/, images/)
+    chapters = [rel for rel in dirs if '/' not in rel]
+    for i in range(assets):
+        chapter = content / chapters[i % len(chapters)]
+        if i % 2 == 0:
+            target = chapter / 'b_libros' / f"libro_{i}.pdf"
+            data = b'%PDF-1.4\n' + rng.randbytes(args.asset_kb * 1024)
+            counts['pdf'] += 1
+        else:
+            target = chapter / 'images' / f"figura_{i}.png"
+            data = b'\x89PNG\r\n\x1a\n' + rng.randbytes(args.asset_kb * 1024)
+            counts['images'] += 1
+        target.parent.mkdir(exist_ok=True)
+        target.write_bytes(data)
+
+    rows = ['Clase,Fecha,Tema']
+    for i, rel in enumerate(chapters):
+        rows.append(f"{i + 1},{(i % 28) + 1:02d}/02/2026,{rel.split('_', 1)[1].replace('_', ' ').title()}")
+    (content / 'calendario_temas.csv').write_text('\n'.join(rows) + '\n', encoding='utf-8')
+
+    (root / 'README.md').write_text(f"# Curso sintético\n\n{generated_text(rng, 40)}\n", encoding='utf-8')
+    return counts
+
+
+def run_preprocess(root: Path, args, cold: bool) -> Dict[str, Any]:
+    """
+    Run preprocess.py on a generated corpus and collect its stage profile.
+
+    Returns:
+        Dict with total wall time and per-stage wall times (nested stages
+        keyed as "parent/child")
+    """
+    profile_path = root / 'profile.json'
+    cmd = [
+        sys.executable, str(SCRIPT_DIR / 'preprocess.py'),
+        '--config', str(args.config.resolve()),
+        '--content', str(root / 'clase'),
+        '--docs', str(args.docs.resolve()),
+        '--output', str(root / '_data'),
+        '--cache', str(root / '.cache' / 'build_manifest.json'),
+        '--jobs', str(args.jobs),
+        '--profile-json', str(profile_path),
+    ]
+    if cold:
+        cmd.append('--no-cache')
+
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=root, capture_output=True, text=True)
+    total_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        raise RuntimeError(f"preprocess.py failed with exit code {result.returncode}")
+
+    with open(profile_path, 'r', encoding='utf-8') as f:
+        profile = json.load(f)
+
+    stages = {}
+    max_rss_kb = 0
+    path = []
+    for record in profile['stages']:
+        path = path[:record['depth']] + [record['name']]
+        stages['/'.join(path)] = record['wall_ms']
+        max_rss_kb = max(max_rss_kb, record.get('max_rss_kb', 0))
+    return {'total_ms': total_ms, 'max_rss_kb': max_rss_kb, 'stages': stages}
+
+
+def median_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of each timing over repeated runs."""
+    names = []
+    for run in runs:
+        names += [n for n in run['stages'] if n not in names]
+    return {
+        'total_ms': statistics.median(r['total_ms'] for r in runs),
+        'max_rss_kb': max(r['max_rss_kb'] for r in runs),
+        'stages': {n: statistics.median(r['stages'].get(n, 0.0) for r in runs) for n in names},
+        'repeat': len(runs),
+    }
+
+
+def git_describe() -> Dict[str, Any]:
+    """Current commit and whether the working tree has local changes."""
+    def git(*cmd):
+        try:
+            return subprocess.run(['git', *cmd], cwd=REPO_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ''
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD') or 'unknown',
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Print one benchmark result file as a table per size."""
+    for size, modes in results['results'].items():
+        corpus = modes.get('corpus', {})
+        print(f"\n{size} files ({corpus.get('markdown', '?')} markdown, {corpus.get('dirs', '?')} dirs)")
+        print(f"  {'Stage':30s} {'Cold ms':>10s} {'Warm ms':>10s}")
+        cold, warm = modes['cold'], modes['warm']
+        for name in cold['stages']:
+            print(f"  {name:30s} {cold['stages'][name]:10.1f} {warm['stages'].get(name, 0.0):10.1f}")
+        print(f"  {'Total (process)':30s} {cold['total_ms']:10.1f} {warm['total_ms']:10.1f}")
+        print(f"  {'Max RSS KB':30s} {cold['max_rss_kb']:10d} {warm['max_rss_kb']:10d}")
+
+
+def compare_results(base: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Print stage timings of two benchmark runs side by side."""
+    print(f"Base: {base['git']['commit']}{' (dirty)' if base['git']['dirty'] else ''}  "
+          f"New: {new['git']['commit']}{' (dirty)' if new['git']['dirty'] else ''}")
+    for size, modes in new['results'].items():
+        if size not in base['results']:
+            continue
+        for mode in ('cold', 'warm'):
+            b, n = base['results'][size][mode], modes[mode]
+            print(f"\n{size} files, {mode}")
+            print(f"  {'Stage':30s} {'Base ms':>10s} {'New ms':>10s} {'Change':>8s}")
+            rows = [(name, b['stages'].get(name), ms) for name, ms in n['stages'].items()]
+            rows.append(('Total (process)', b['total_ms'], n['total_ms']))
+            for name, old, ms in rows:
+                if old is None:
+                    print(f"  {name:30s} {'':>10s} {ms:10.1f}")
+                    continue
+                change = f"{(ms / old - 1) * 100:+.0f}%" if old > 0 else ''
+                print(f"  {name:30s} {old:10.1f} {ms:10.1f} {change:>8s}")
+
+
+def latest_result(results_dir: Path) -> Optional[Path]:
+    """Most recently written result file, if any."""
+    files = sorted(results_dir.glob('*.json'), key=lambda p: p.stat().st_mtime)
+    return files[-1] if files else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark preprocess.py on synthetic course trees')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated total file counts (default: 100,1000,10000,50000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per size and mode; the median is reported')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Passed to preprocess.py --jobs')
+    parser.add_argument('--chapters', type=int, default=12,
+                        help='Top-level chapters')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='Maximum directory nesting depth (1 = lessons directly in chapters)')
+    parser.add_argument('--fanout', type=int, default=6,
+                        help='Subtopics per directory')
+    parser.add_argument('--files-per-dir', type=int, default=25,
+                        help='Markdown files per directory')
+    parser.add_argument('--frontmatter-keys', type=int, default=4,
+                        help='Extra frontmatter keys per lesson')
+    parser.add_argument('--paragraphs', type=int, default=6,
+                        help='Body sections per lesson')
+    parser.add_argument('--homework-rate', type=float, default=0.15,
+                        help='Fraction of lessons with a :::homework block')
+    parser.add_argument('--exam-rate', type=float, default=0.3,
+                        help='Fraction of directory indexes with an :::exam block')
+    parser.add_argument('--asset-ratio', type=float, default=0.1,
+                        help='Fraction of files that are PDFs/images (in excluded directories)')
+    parser.add_argument('--asset-kb', type=int, default=4,
+                        help='Size of each generated PDF/image')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for corpus generation')
+    parser.add_argument('--config', type=Path, default=Path('uu_framework/config/site.yaml'),
+                        help='Site config passed to preprocess.py')
+    parser.add_argument('--docs', type=Path, default=Path('uu_framework/docs'),
+                        help='Docs directory passed to preprocess.py')
+    parser.add_argument('--workdir', type=Path,
+                        help='Where to generate corpora (default: a temporary directory)')
+    parser.add_argument('--results', type=Path, default=DEFAULT_RESULTS_DIR,
+                        help='Directory for result files')
+    parser.add_argument('--generate', type=Path, metavar='DIR',
+                        help='Only generate a corpus of the first size into DIR')
+    parser.add_argument('--compare', type=Path, nargs='+', metavar='RESULT',
+                        help='Compare BASE [NEW] result files (NEW defaults to the latest)')
+
+    args = parser.parse_args()
+
+    if args.compare:
+        base_path = args.compare[0]
+        new_path = args.compare[1] if len(args.compare) > 1 else latest_result(args.results)
+        if new_path is None:
+            print(f"Error: no results found in {args.results}")
+            return 1
+        with open(base_path, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(new_path, 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        compare_results(base, new)
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    if args.generate:
+        counts = generate_corpus(args.generate, sizes[0], args, args.seed)
+        print(f"Generated {counts} under {args.generate / 'clase'}")
+        return 0
+
+    git = git_describe()
+    print("=" * 60)
+    print(f"Preprocessing benchmark ({git['commit']}{', dirty' if git['dirty'] else ''})")
+    print("=" * 60)
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix='uu_bench_'))
+    results = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git': git,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'params': {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()
+                   if k not in ('compare', 'generate', 'workdir', 'results')},
+        'results': {},
+    }
+
+    try:
+        for size in sizes:
+            root = workdir / f"corpus_{size}"
+            print(f"\n[{size} files] Generating corpus...")
+            start = time.perf_counter()
+            counts = generate_corpus(root, size, args, args.seed)
+            print(f"      {counts['markdown']} markdown, {counts['pdf'] + counts['images']} assets, "
+                  f"{counts['dirs']} dirs in {time.perf_counter() - start:.1f}s")
+
+            cold, warm = [], []
+            # Untimed run that writes the build manifest for the warm runs
+            run_preprocess(root, args, cold=False)
+            for rep in range(args.repeat):
+                cold.append(run_preprocess(root, args, cold=True))
+                warm.append(run_preprocess(root, args, cold=False))
+                print(f"      Run {rep + 1}/{args.repeat}: cold {cold[-1]['total_ms']:.0f} ms, "
+                      f"warm {warm[-1]['total_ms']:.0f} ms")
+
+            results['results'][str(size)] = {
+                'corpus': counts,
+                'cold': median_runs(cold),
+                'warm': median_runs(warm),
+            }
+            if not args.workdir:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_results(results)
+
+    args.results.mkdir(parents=True, exist_ok=True)
+    suffix = '-dirty' if git['dirty'] else ''
+    out_path = args.results / f"{time.strftime('%Y%m%d-%H%M%S')}-{git['commit']}{suffix}.json"
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nSaved results to {out_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Build Cache Script
+
+Persistent build manifest for incremental preprocessing.
+Stores a content hash + mtime/size per markdown file together with its
+extracted metadata, and an input fingerprint + cached result per stage
+(hierarchy, tasks, calendar). Unchanged inputs reuse the cached results.
+
+The manifest is invalidated as a whole when the preprocessing scripts,
+the content directory or the exclude patterns change.
+"""
+
+import os
+import copy
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_PATH = Path('uu_framework/.cache/build_manifest.json')
+
+# Scripts whose source determines the cached results
+SCRIPT_DIR = Path(__file__).parent
+STAGE_SCRIPTS = [
+    'build_cache.py',
+    'extract_metadata.py',
+    'generate_indices.py',
+    'aggregate_tasks.py',
+    'process_calendar_topics.py',
+    'file_index.py',
+    'exclusion.py',
+    'search_index.py',
+]
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return SHA-256 hex digest of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Fingerprint arbitrary JSON-serializable inputs.
+    Used to key stage results on everything they depend on.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hash_bytes(payload.encode('utf-8'))
+
+
+def scripts_fingerprint() -> str:
+    """Fingerprint the source of the preprocessing scripts."""
+    digests = []
+    for name in STAGE_SCRIPTS:
+        try:
+            digests.append(hash_bytes((SCRIPT_DIR / name).read_bytes()))
+        except OSError:
+            digests.append('')
+    return fingerprint(digests)
+
+
+def decode_text(data: bytes) -> str:
+    """
+    Decode file bytes the same way open(..., encoding='utf-8') does,
+    including universal newline translation.
+    """
+    text = data.decode('utf-8')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class BuildCache:
+    """
+    Incremental build manifest.
+
+    Layout on disk:
+        {
+            "version": 1,
+            "context": "<fingerprint of scripts + content dir + exclude>",
+            "files": {"rel/path.md": {"mtime_ns", "size", "hash", "metadata"}},
+            "stages": {"hierarchy": {"fingerprint", "result"}, ...}
+        }
+    """
+
+    def __init__(self, path: Path, context: Dict[str, Any], verbose: bool = False):
+        self.path = Path(path)
+        self.verbose = verbose
+        self.context = fingerprint(CACHE_VERSION, scripts_fingerprint(), context)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.seen: set = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load manifest from disk, discarding it if stale or unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if manifest.get('version') != CACHE_VERSION or manifest.get('context') != self.context:
+            if self.verbose:
+                print("      Build cache invalidated (scripts or config changed)")
+            self.dirty = True
+            return
+
+        self.files = manifest.get('files', {})
+        self.stages = manifest.get('stages', {})
+
+    def file_metadata(
+        self,
+        rel_path: str,
+        filepath: Path,
+        extract: Callable[[Path, Optional[str]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Return metadata for a file, reusing the cached entry when the file
+        is unchanged. On a miss `extract` receives (filepath, decoded content),
+        with content None if the cache could not read the file itself.
+        """
+        metadata, pending = self.lookup(rel_path, filepath)
+        if pending is None:
+            return metadata
+
+        metadata = extract(filepath, pending.pop('content'))
+        self.store(rel_path, pending, metadata)
+        return metadata
+
+    def lookup(
+        self,
+        rel_path: str,
+        filepath: Path,
+        st: Optional[os.stat_result] = None
+    ) -> tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Look up cached metadata for a file. `st` may carry a stat result
+        already fetched by the FileIndex.
+
+        A matching mtime/size skips reading the file; otherwise the content
+        hash decides whether the cached entry is still valid.
+
+        Returns:
+            (metadata, None) on a hit, or ({}, pending) on a miss where
+            pending holds the file stamp and its decoded 'content' (None if
+            unreadable) to be passed on to store() after extraction
+        """
+        self.seen.add(rel_path)
+        entry = self.files.get(rel_path)
+
+        if st is None:
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                return {}, None
+
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            self.hits += 1
+            return entry['metadata'], None
+
+        pending = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'hash': None, 'content': None}
+
+        try:
+            data = Path(filepath).read_bytes()
+            pending['content'] = decode_text(data)
+        except (OSError, UnicodeDecodeError):
+            self.misses += 1
+            return {}, pending
+
+        pending['hash'] = hash_bytes(data)
+        self.dirty = True
+
+        if entry and entry['hash'] == pending['hash']:
+            # Touched but not modified
+            entry['mtime_ns'] = st.st_mtime_ns
+            entry['size'] = st.st_size
+            self.hits += 1
+            return entry['metadata'], None
+
+        self.misses += 1
+        return {}, pending
+
+    def store(self, rel_path: str, pending: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """Record freshly extracted metadata for a file missed by lookup()."""
+        if not metadata or not pending.get('hash'):
+            return
+        self.files[rel_path] = {
+            'mtime_ns': pending['mtime_ns'],
+            'size': pending['size'],
+            'hash': pending['hash'],
+            'metadata': metadata,
+        }
+
+    def stage(self, name: str, stage_fingerprint: str) -> Optional[Any]:
+        """
+        Return a copy of the cached stage result if its input fingerprint
+        matches. Callers may mutate the copy freely.
+        """
+        entry = self.stages.get(name)
+        if entry and entry.get('fingerprint') == stage_fingerprint:
+            return copy.deepcopy(entry['result'])
+        return None
+
+    def store_stage(self, name: str, stage_fingerprint: str, result: Any) -> None:
+        """Record a freshly computed stage result (as a JSON snapshot)."""
+        snapshot = json.loads(json.dumps(result, ensure_ascii=False))
+        self.stages[name] = {'fingerprint': stage_fingerprint, 'result': snapshot}
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        Write manifest to disk (atomically), dropping entries for files
+        that were not seen during this run.
+        """
+        stale = [rel for rel in self.files if rel not in self.seen]
+        for rel in stale:
+            del self.files[rel]
+        if stale:
+            self.dirty = True
+
+        if not self.dirty:
+            return
+
+        manifest = {
+            'version': CACHE_VERSION,
+            'context': self.context,
+            'files': self.files,
+            'stages': self.stages,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        """One-line summary of per-file cache usage."""
+        return f"{self.hits} cached, {self.misses} extracted"
+
+
+def run_stage(
+    cache: Optional[BuildCache],
+    name: str,
+    stage_fingerprint: str,
+    compute: Callable[[], Any]
+) -> tuple[Any, bool]:
+    """
+    Run a stage through the cache.
+
+    Returns:
+        Tuple of (result, reused) where reused is True on a cache hit
+    """
+    if cache is not None:
+        result = cache.stage(name, stage_fingerprint)
+        if result is not None:
+            return result, True
+
+    result = compute()
+    if cache is not None:
+        cache.store_stage(name, stage_fingerprint, result)
+    return result, False
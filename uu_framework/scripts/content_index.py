@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Content Index Script
+
+Content-addressed index of clase/ used by sync_check.py to find where a
+student file was copied from when its name alone does not say (the file
+was renamed or moved by the professor, or several clase/ files share its
+name, like app.py or Dockerfile in the container labs).
+
+Two lookups, both built lazily on first use and then shared:
+
+- exact: file digest -> clase/ files with that content (git blob IDs or
+  SHA-256, whichever sync_check compares with)
+- similar: for text files, an inverted index of normalized lines (one
+  per file extension, built when a file of that extension is looked up).
+  A student file is scored against every clase/ file it shares lines
+  with (Dice coefficient over distinct lines), so copies the student
+  has since edited are still recognized. Lines found in many files
+  (boilerplate, closing braces) are ignored.
+
+Both are linear in the total size of clase/; nothing is compared
+pairwise.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from file_index import FileIndex
+
+
+MAX_TEXT_BYTES = 256 * 1024
+MIN_LINE_LENGTH = 4
+MAX_LINE_FILES = 8       # Lines shared by more clase/ files carry no signal
+MIN_SIMILARITY = 0.4
+
+
+def text_lines(filepath: Path) -> Optional[Set[bytes]]:
+    """
+    Distinct lines of a text file, without surrounding whitespace.
+
+    Returns:
+        Set of lines, or None if the file is binary, too large or
+        unreadable
+    """
+    try:
+        if os.path.getsize(filepath) > MAX_TEXT_BYTES:
+            return None
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if b'\0' in data:
+        return None
+
+    lines = set(map(bytes.strip, data.splitlines()))
+    return {line for line in lines if len(line) >= MIN_LINE_LENGTH}
+
+
+class ContentIndex:
+    """
+    Lazily built digest and line-shingle index of a clase/ tree.
+
+    Usage:
+        content = ContentIndex(clase_index, digest=lambda path: ...)
+        content.exact(digest)                  # ['05_bash/run.sh', ...]
+        content.similar(student_path, '.sh')   # [('05_bash/run.sh', 0.8), ...]
+    """
+
+    def __init__(self, clase_index: FileIndex, digest: Callable[[Path], str]):
+        self.clase_index = clase_index
+        self.digest = digest
+        self.lock = threading.Lock()
+        self._by_digest: Optional[Dict[str, List[str]]] = None
+        # Per extension: (line -> relative paths, lines too common to use,
+        # relative path -> number of usable lines)
+        self._by_line: Dict[Optional[str], Tuple[Dict[bytes, List[str]], Set[bytes], Dict[str, int]]] = {}
+
+    def files(self, suffix: Optional[str] = None) -> List[str]:
+        """Relative paths of clase/ files (with an extension), in walk order."""
+        return [
+            entry.rel for entry in self.clase_index.walk_files()
+            if suffix is None or entry.suffix == suffix
+        ]
+
+    def by_digest(self) -> Dict[str, List[str]]:
+        """digest -> relative paths, built on first use."""
+        with self.lock:
+            if self._by_digest is None:
+                by_digest: Dict[str, List[str]] = {}
+                for rel in self.files():
+                    digest = self.digest(self.clase_index.path(rel))
+                    if digest:
+                        by_digest.setdefault(digest, []).append(rel)
+                self._by_digest = by_digest
+            return self._by_digest
+
+    def by_line(self, suffix: Optional[str] = None) -> Tuple[Dict[bytes, List[str]], Set[bytes], Dict[str, int]]:
+        """
+        Inverted line index of the text files with an extension (all files
+        if None), built on first use.
+
+        Returns:
+            Tuple of (line -> relative paths, common lines left out,
+            relative path -> number of indexed lines)
+        """
+        with self.lock:
+            if suffix not in self._by_line:
+                by_line: Dict[bytes, List[str]] = {}
+                for rel in self.files(suffix):
+                    for line in text_lines(self.clase_index.path(rel)) or ():
+                        by_line.setdefault(line, []).append(rel)
+
+                common = {line for line, rels in by_line.items() if len(rels) > MAX_LINE_FILES}
+                for line in common:
+                    del by_line[line]
+                counts: Dict[str, int] = {}
+                for rels in by_line.values():
+                    for rel in rels:
+                        counts[rel] = counts.get(rel, 0) + 1
+                self._by_line[suffix] = (by_line, common, counts)
+            return self._by_line[suffix]
+
+    def exact(self, digest: str) -> List[str]:
+        """clase/ files whose content is exactly `digest`."""
+        if not digest:
+            return []
+        return self.by_digest().get(digest, [])
+
+    def similar(self, filepath: Path, suffix: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        clase/ text files sharing enough lines with `filepath` (optionally
+        only those with the same extension).
+
+        Returns:
+            List of (relative path, similarity), best first
+        """
+        by_line, common, counts = self.by_line(suffix)
+        lines = (text_lines(filepath) or set()) - common
+        if not lines:
+            return []
+
+        shared: Dict[str, int] = {}
+        for line in lines:
+            for rel in by_line.get(line, ()):
+                shared[rel] = shared.get(rel, 0) + 1
+
+        scored = []
+        for rel, count in shared.items():
+            similarity = 2 * count / (len(lines) + counts[rel])
+            if similarity >= MIN_SIMILARITY:
+                scored.append((rel, similarity))
+        scored.sort(key=lambda item: -item[1])
+        return scored
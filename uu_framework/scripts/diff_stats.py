@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Diff Stats Script
+
+Compact line-diff statistics (lines added/removed, changed hunks) between
+a student's copy and the current clase/ file, shown by sync_check.py for
+each stale file instead of asking the student to run diff by hand.
+
+Binary files (a NUL byte near the start) and files above MAX_DIFF_BYTES
+are never diffed, only labelled, so PDFs, images and datasets cost a
+short read at most. Many files are diffed in a process pool (difflib is
+pure Python), few are diffed inline.
+"""
+
+import os
+import difflib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+MAX_DIFF_BYTES = 512 * 1024
+BINARY_SNIFF_BYTES = 8192
+PARALLEL_MIN_DIFFS = 8       # Below this, pool startup costs more than it saves
+
+
+def read_text_lines(filepath: Path) -> Tuple[str, Optional[List[bytes]]]:
+    """
+    Read a file for diffing.
+
+    Returns:
+        (status, lines) where status is 'ok', 'binary', 'too_large' or
+        'unreadable', and lines is None unless status is 'ok'
+    """
+    try:
+        if os.path.getsize(filepath) > MAX_DIFF_BYTES:
+            return 'too_large', None
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return 'unreadable', None
+    if b'\0' in data[:BINARY_SNIFF_BYTES]:
+        return 'binary', None
+    return 'ok', data.splitlines()
+
+
+def diff_stats(old_file: Path, new_file: Path) -> Dict[str, Any]:
+    """
+    Line changes needed to turn old_file into new_file.
+
+    Returns:
+        Dict with 'status' ('ok', 'binary', 'too_large', 'unreadable')
+        and, when 'ok', 'added', 'removed' and 'hunks'
+    """
+    old_status, old_lines = read_text_lines(old_file)
+    if old_status != 'ok':
+        return {'status': old_status}
+    new_status, new_lines = read_text_lines(new_file)
+    if new_status != 'ok':
+        return {'status': new_status}
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    added = removed = hunks = 0
+    for group in matcher.get_grouped_opcodes(0):
+        hunks += 1
+        for tag, i1, i2, j1, j2 in group:
+            removed += i2 - i1
+            added += j2 - j1
+    return {'status': 'ok', 'added': added, 'removed': removed, 'hunks': hunks}
+
+
+def _diff_pair(pair: Tuple[str, str]) -> Dict[str, Any]:
+    return diff_stats(Path(pair[0]), Path(pair[1]))
+
+
+def diff_stats_many(pairs: List[Tuple[Path, Path]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    diff_stats for (old_file, new_file) pairs, in input order; in a
+    process pool when there are enough of them.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = [(str(old), str(new)) for old, new in pairs]
+    if workers > 1 and len(items) >= PARALLEL_MIN_DIFFS:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return list(executor.map(_diff_pair, items, chunksize=4))
+    return [_diff_pair(item) for item in items]
+
+
+def format_diff_stats(stats: Dict[str, Any]) -> str:
+    """Short Spanish description of diff stats for terminal output."""
+    status = stats.get('status')
+    if status == 'binary':
+        return "archivo binario (no se compara)"
+    if status == 'too_large':
+        return f"archivo mayor a {MAX_DIFF_BYTES // 1024} KB (usa diff)"
+    if status != 'ok':
+        return "no se pudo leer"
+    hunks = stats['hunks']
+    return f"+{stats['added']} -{stats['removed']} lineas en {hunks} bloque{'s' if hunks != 1 else ''}"
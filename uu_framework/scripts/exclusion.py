@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Exclusion Matching Script
+
+Compiles the `source.exclude` patterns from site.yaml into a single
+matcher used by every preprocessing stage.
+
+Two kinds of patterns are supported:
+
+- Plain names (no glob characters, no leading/trailing slash) keep the
+  original substring semantics for compatibility: "images" excludes any
+  path containing "images".
+- Gitignore-style globs, recognised by `*`, `?`, `[` or a leading/trailing
+  slash:
+    *.pdf          any file or directory named *.pdf, at any depth
+    /README.md     only at the root of the content directory
+    drafts/        directories only (and everything below them)
+    a/**/tmp       `**` matches across directory levels
+  Patterns containing an inner slash are anchored to the root, as in
+  .gitignore. Negation (`!pattern`) is not supported.
+
+A directory that matches excludes everything below it, so walkers can
+prune it without descending.
+"""
+
+import os
+import re
+from typing import List, Optional, Union
+
+
+GLOB_CHARS = set('*?[')
+
+
+def is_glob(pattern: str) -> bool:
+    """True if pattern uses gitignore-style syntax rather than a substring."""
+    return bool(GLOB_CHARS & set(pattern)) or pattern.startswith('/') or pattern.endswith('/')
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate one gitignore-style glob (without slashes at the ends) to a regex."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2 if pattern[i + 1:i + 2] in ('!', ']') else i + 1)
+            if end < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+class ExcludeMatcher:
+    """
+    All exclude patterns compiled into (at most) two regular expressions:
+    one for any path, and one for dir-only patterns matching the path itself.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+
+        any_parts = []
+        dir_parts = []
+        for pattern in self.patterns:
+            if not pattern:
+                continue
+            if not is_glob(pattern):
+                any_parts.append(re.escape(pattern))
+                continue
+
+            dir_only = pattern.endswith('/')
+            body = pattern.strip('/')
+            if not body:
+                continue
+            anchored = pattern.startswith('/') or '/' in body
+            prefix = '^' if anchored else '(?:^|/)'
+            regex = prefix + translate_glob(body)
+
+            if dir_only:
+                # Anything below the directory; the directory itself needs is_dir
+                any_parts.append(regex + '/')
+                dir_parts.append(regex + '$')
+            else:
+                any_parts.append(regex + '(?:/|$)')
+
+        self.regex = re.compile('|'.join(any_parts)) if any_parts else None
+        self.dir_regex = re.compile('|'.join(dir_parts)) if dir_parts else None
+
+    def matches(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        True if a path (relative to the content directory) is excluded.
+        """
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        if self.regex is not None and self.regex.search(rel_path):
+            return True
+        if is_dir and self.dir_regex is not None and self.dir_regex.search(rel_path):
+            return True
+        return False
+
+    def __bool__(self) -> bool:
+        return self.regex is not None or self.dir_regex is not None
+
+    def __repr__(self) -> str:
+        return f"ExcludeMatcher({self.patterns!r})"
+
+
+def compile_exclude(exclude: Optional[Union[List[str], ExcludeMatcher]]) -> ExcludeMatcher:
+    """Compile exclude patterns, passing already-compiled matchers through."""
+    if isinstance(exclude, ExcludeMatcher):
+        return exclude
+    return ExcludeMatcher(exclude or [])
@@ -11,6 +11,15 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+from exclusion import compile_exclude
+from file_index import FileIndex
+from search_index import document_terms
+
+
+# Parallel extraction tuning
+PARALLEL_MIN_FILES = 32      # Below this, pool startup costs more than it saves
+BATCHES_PER_WORKER = 4       # Smaller batches balance uneven file sizes
+
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """
@@ -129,7 +138,7 @@ def get_order_from_filename(filepath: Path) -> int:
     return 999
 
 
-def extract_file_metadata(filepath: Path, verbose: bool = False) -> Dict[str, Any]:
+def extract_file_metadata(filepath: Path, verbose: bool = False, search: bool = False) -> Dict[str, Any]:
     """Extract metadata from a single markdown file."""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -139,68 +148,179 @@ def extract_file_metadata(filepath: Path, verbose: bool = False) -> Dict[str, An
             print(f"      Warning: Could not read {filepath}: {e}")
         return {}
 
+    return metadata_from_content(filepath, content, search)
+
+
+def metadata_from_content(filepath: Path, content: str, search: bool = False) -> Dict[str, Any]:
+    """
+    Build the metadata record for a file from its already-read content.
+    With search=True the record also carries the file's weighted search
+    terms ('search_terms', see search_index.py).
+    """
     # Parse frontmatter
     frontmatter, body = parse_frontmatter(content)
 
     # Extract components
     components = extract_components(body)
 
+    title = frontmatter.get('title') or extract_h1_title(body) or title_from_filename(filepath)
+    tags = frontmatter.get('tags', [])
+
     # Build metadata
     metadata = {
         'path': str(filepath),
-        'title': frontmatter.get('title') or extract_h1_title(body) or title_from_filename(filepath),
+        'title': title,
         'type': frontmatter.get('type', 'lesson'),
         'order': frontmatter.get('order') or get_order_from_filename(filepath),
         'date': frontmatter.get('date'),
         'summary': frontmatter.get('summary'),
-        'tags': frontmatter.get('tags', []),
+        'tags': tags,
         'due_date': frontmatter.get('due_date'),
         'components': components,
         'has_frontmatter': bool(frontmatter),
     }
 
+    if search:
+        # Search index input; not written to metadata.json
+        metadata['search_terms'] = document_terms(title, body, tags)
+
     return metadata
 
 
+def _extract_batch(batch: List[tuple], verbose: bool = False, search: bool = False) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: extract metadata for a batch of (filepath, content)
+    pairs. Content is None when the file still has to be read.
+    """
+    results = []
+    for filepath, content in batch:
+        if content is None:
+            results.append(extract_file_metadata(filepath, verbose, search))
+        else:
+            results.append(metadata_from_content(filepath, content, search))
+    return results
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Resolve a worker count: None/1 = serial, 0 = one per CPU core."""
+    if workers is None:
+        return 1
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def extract_parallel(
+    items: List[tuple],
+    workers: int,
+    verbose: bool = False,
+    search: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Extract metadata for (filepath, content) pairs in a process pool.
+
+    Work is split into contiguous batches (several per worker, to balance
+    uneven file sizes) and results are returned in input order, so the
+    output is identical to a serial run.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    batch_size = max(1, -(-len(items) // (workers * BATCHES_PER_WORKER)))
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        for batch_results in executor.map(partial(_extract_batch, verbose=verbose, search=search), batches):
+            results.extend(batch_results)
+    return results
+
+
 def extract_all_metadata(
     content_dir: Path,
     exclude: List[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    cache=None,
+    workers: Optional[int] = None,
+    index: Optional[FileIndex] = None,
+    search: bool = False
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extract metadata from all markdown files in content directory.
 
+    Files are taken from a shared FileIndex (scanned here if not given).
+
+    If a BuildCache is given, unchanged files reuse their cached metadata
+    instead of being re-read and re-parsed.
+
+    With workers > 1 (or 0 for one per CPU core) the files that need
+    parsing are processed in a process pool. Output order matches the
+    serial run exactly.
+
+    With search=True each record also carries its search terms.
+
     Returns:
         Dict mapping file paths to their metadata
     """
     exclude = exclude or []
     metadata = {}
+    workers = resolve_workers(workers)
 
     content_path = Path(content_dir)
     if not content_path.exists():
         print(f"      Warning: Content directory {content_dir} does not exist")
         return metadata
 
+    if index is None:
+        index = FileIndex(content_path, exclude)
+
+    # Resolve cache hits first; collect everything else for extraction
+    results: List[Optional[Dict[str, Any]]] = []
+    rel_paths: List[str] = []
+    pending: List[tuple] = []  # (position, filepath, content, cache stamp)
+
     # Find all markdown files
-    md_files = list(content_path.rglob('*.md'))
+    for entry in index.walk_files('.md'):
+        rel_path = entry.rel
+        filepath = index.path(rel_path)
 
-    for filepath in md_files:
         # Check exclusions
-        rel_path = filepath.relative_to(content_path)
-        skip = False
-        for excl in exclude:
-            if excl in str(rel_path):
-                skip = True
-                break
-
-        if skip:
+        if entry.excluded:
             if verbose:
                 print(f"      Skipping excluded: {rel_path}")
             continue
 
-        file_meta = extract_file_metadata(filepath, verbose)
+        content = None
+        stamp = None
+        if cache is not None:
+            file_meta, stamp = cache.lookup(rel_path, filepath, index.stat(rel_path))
+            if stamp is None:
+                rel_paths.append(rel_path)
+                results.append(file_meta)
+                continue
+            content = stamp.pop('content')
+
+        pending.append((len(results), filepath, content, stamp))
+        rel_paths.append(rel_path)
+        results.append(None)
+
+    # Extract the remaining files, in parallel when worthwhile
+    items = [(filepath, content) for _, filepath, content, _ in pending]
+    if workers > 1 and len(items) >= PARALLEL_MIN_FILES:
+        if verbose:
+            print(f"      Extracting {len(items)} files with {workers} workers")
+        extracted = extract_parallel(items, workers, verbose, search)
+    else:
+        extracted = _extract_batch(items, verbose, search)
+
+    for (slot, _, _, stamp), file_meta in zip(pending, extracted):
+        results[slot] = file_meta
+        if cache is not None:
+            cache.store(rel_paths[slot], stamp, file_meta)
+
+    for rel_path, file_meta in zip(rel_paths, results):
         if file_meta:
-            metadata[str(rel_path)] = file_meta
+            metadata[rel_path] = file_meta
 
             if verbose:
                 print(f"      Processed: {rel_path}")
@@ -208,6 +328,48 @@ def extract_all_metadata(
     return metadata
 
 
+def update_metadata(
+    metadata: Dict[str, Dict[str, Any]],
+    content_dir: Path,
+    rel_paths: List[str],
+    exclude: List[str] = None,
+    verbose: bool = False,
+    search: bool = False
+) -> List[str]:
+    """
+    Re-extract metadata for specific files in place (used by watch mode).
+    Files that no longer exist or are excluded are removed.
+
+    Returns:
+        List of relative paths whose metadata entry changed
+    """
+    matcher = compile_exclude(exclude)
+    content_path = Path(content_dir)
+    changed = []
+
+    for rel_path in rel_paths:
+        filepath = content_path / rel_path
+        excluded = matcher.matches(rel_path)
+
+        file_meta = {}
+        if not excluded and filepath.is_file():
+            file_meta = extract_file_metadata(filepath, verbose, search)
+
+        if file_meta:
+            if metadata.get(rel_path) != file_meta:
+                metadata[rel_path] = file_meta
+                changed.append(rel_path)
+                if verbose:
+                    print(f"      Updated: {rel_path}")
+        elif rel_path in metadata:
+            del metadata[rel_path]
+            changed.append(rel_path)
+            if verbose:
+                print(f"      Removed: {rel_path}")
+
+    return changed
+
+
 if __name__ == '__main__':
     import sys
     import json
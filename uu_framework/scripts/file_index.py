@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+File Index Script
+
+Scans a directory tree once with os.scandir and keeps an in-memory index
+(relative paths, dirent types, lazily fetched stat info and exclusion
+verdicts) that is shared by every preprocessing stage, so that metadata
+extraction, hierarchy generation and the build cache agree on what exists
+without each walking the tree again.
+
+Excluded directories are pruned: they are recorded (with their verdict)
+but never descended into. Symlinked directories are listed but not
+descended into either (same as Path.rglob).
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Iterator
+
+from exclusion import compile_exclude
+
+
+class FileEntry:
+    """A single directory entry in the index."""
+
+    __slots__ = ('rel', 'name', 'is_dir', 'is_symlink', 'excluded')
+
+    def __init__(self, rel: str, name: str, is_dir: bool, is_symlink: bool, excluded: bool):
+        self.rel = rel
+        self.name = name
+        self.is_dir = is_dir
+        self.is_symlink = is_symlink
+        self.excluded = excluded
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.name)[1]
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.name)[0]
+
+    def __repr__(self) -> str:
+        kind = 'dir' if self.is_dir else 'file'
+        return f"FileEntry({self.rel!r}, {kind}{', excluded' if self.excluded else ''})"
+
+
+class FileIndex:
+    """
+    In-memory index of a directory tree.
+
+    Paths are relative to the root and use the OS separator, matching
+    str(path.relative_to(root)). The root itself has the relative path ''.
+    Directory listings keep os.scandir order, so walking the index yields
+    files in the same order as Path.rglob.
+    """
+
+    def __init__(self, root: Path, exclude=None):
+        self.root = Path(root)
+        self.exclude = compile_exclude(exclude)
+        self.entries: Dict[str, FileEntry] = {}
+        self.children: Dict[str, List[FileEntry]] = {}
+        self.stats: Dict[str, Optional[os.stat_result]] = {}
+        if self.root.is_dir():
+            self.scan()
+
+    def is_excluded(self, rel: str, is_dir: bool = False) -> bool:
+        """Exclusion verdict for a relative path (see exclusion.py)."""
+        return self.exclude.matches(rel, is_dir)
+
+    def scan(self, rel: str = '') -> None:
+        """Scan the directory at `rel` and everything below it."""
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            listing = []
+            try:
+                with os.scandir(self.path(current)) as it:
+                    for dirent in it:
+                        child_rel = os.path.join(current, dirent.name) if current else dirent.name
+                        try:
+                            is_dir = dirent.is_dir()
+                            is_symlink = dirent.is_symlink()
+                        except OSError:
+                            continue
+                        entry = FileEntry(child_rel, dirent.name, is_dir, is_symlink,
+                                          self.is_excluded(child_rel, is_dir))
+                        self.entries[child_rel] = entry
+                        listing.append(entry)
+            except OSError:
+                pass
+            self.children[current] = listing
+
+            # Reverse so subdirectories are processed in scandir order;
+            # excluded directories are pruned
+            for entry in reversed(listing):
+                if entry.is_dir and not entry.is_symlink and not entry.excluded:
+                    stack.append(entry.rel)
+
+    def refresh(self, rel: str = '') -> None:
+        """Forget everything at or below `rel` and scan it again."""
+        prefix = rel + os.sep if rel else ''
+        for key in [k for k in self.entries if k == rel or k.startswith(prefix)]:
+            del self.entries[key]
+        for key in [k for k in self.children if k == rel or k.startswith(prefix)]:
+            del self.children[key]
+        for key in [k for k in self.stats if k == rel or k.startswith(prefix)]:
+            del self.stats[key]
+
+        if rel:
+            parent = os.path.dirname(rel)
+            listing = [e for e in self.children.get(parent, []) if e.rel != rel]
+            full_path = self.path(rel)
+            if full_path.exists():
+                is_dir = full_path.is_dir()
+                entry = FileEntry(rel, os.path.basename(rel), is_dir,
+                                  full_path.is_symlink(), self.is_excluded(rel, is_dir))
+                self.entries[rel] = entry
+                listing.append(entry)
+            if parent in self.children:
+                self.children[parent] = listing
+            entry = self.entries.get(rel)
+            if entry is not None and entry.is_dir and not entry.excluded:
+                self.scan(rel)
+        elif self.root.is_dir():
+            self.scan()
+
+    def path(self, rel: str) -> Path:
+        """Filesystem path for a relative path."""
+        return self.root / rel if rel else self.root
+
+    def get(self, rel: str) -> Optional[FileEntry]:
+        return self.entries.get(rel)
+
+    def exists(self, rel: str) -> bool:
+        return rel == '' or rel in self.entries
+
+    def is_file(self, rel: str) -> bool:
+        entry = self.entries.get(rel)
+        return entry is not None and not entry.is_dir
+
+    def list_dir(self, rel: str = '') -> List[FileEntry]:
+        """Entries directly inside a directory, in scandir order."""
+        return self.children.get(rel, [])
+
+    def stat(self, rel: str) -> Optional[os.stat_result]:
+        """Stat a file once per run (fetched lazily, then memoized)."""
+        if rel not in self.stats:
+            try:
+                self.stats[rel] = os.stat(self.path(rel))
+            except OSError:
+                self.stats[rel] = None
+        return self.stats[rel]
+
+    def walk_files(self, suffix: str = None, rel: str = '') -> Iterator[FileEntry]:
+        """
+        Yield files below `rel` in Path.rglob order: each directory's own
+        files first, then its subdirectories, depth-first.
+        """
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            listing = self.children.get(current, [])
+            for entry in listing:
+                if not entry.is_dir and (suffix is None or entry.name.endswith(suffix)):
+                    yield entry
+            for entry in reversed(listing):
+                if entry.is_dir and not entry.is_symlink:
+                    stack.append(entry.rel)
+
+    def listing(self, suffixes: List[str]) -> List[List]:
+        """
+        Sorted [relative path, is_dir] pairs for all directories and for
+        files with the given suffixes. Used to fingerprint tree structure.
+        """
+        return sorted(
+            [e.rel, e.is_dir] for e in self.entries.values()
+            if e.is_dir or e.suffix in suffixes
+        )
+
+    def count(self) -> Dict[str, int]:
+        """Number of directories and files in the index."""
+        dirs = sum(1 for e in self.entries.values() if e.is_dir)
+        return {'dirs': dirs, 'files': len(self.entries) - dirs}
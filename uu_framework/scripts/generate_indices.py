@@ -16,6 +16,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from file_index import FileIndex
+
 
 def get_sort_key(name: str) -> tuple:
     """
@@ -70,11 +72,15 @@ def build_tree(
     metadata: Dict[str, Any],
     base_path: Path,
     exclude: List[str],
-    depth: int = 0
+    depth: int = 0,
+    index: Optional[FileIndex] = None
 ) -> Dict[str, Any]:
     """
     Recursively build hierarchy tree from directory.
 
+    Directory listings come from a shared FileIndex rooted at base_path
+    (scanned here if not given).
+
     Returns:
         Dict with structure:
         {
@@ -87,17 +93,20 @@ def build_tree(
             'children': [...]
         }
     """
-    rel_path = dir_path.relative_to(base_path)
+    if index is None:
+        index = FileIndex(base_path, exclude)
+
+    rel_path = str(dir_path.relative_to(base_path))
     name = dir_path.name
 
     # Check exclusions
-    for excl in exclude:
-        if excl in str(rel_path):
-            return None
+    entry = index.get(rel_path)
+    if entry is not None and entry.excluded:
+        return None
 
     node = {
         'name': name,
-        'path': str(rel_path),
+        'path': rel_path,
         'type': 'directory',
         'order': get_sort_key(name),
         'children': [],
@@ -105,10 +114,9 @@ def build_tree(
     }
 
     # Get title from index file if exists
-    index_path = dir_path / '00_index.md'
-    rel_index = str(rel_path / '00_index.md')
+    rel_index = os.path.join(rel_path, '00_index.md')
 
-    if index_path.exists() and rel_index in metadata:
+    if index.exists(rel_index) and rel_index in metadata:
         node['has_index'] = True
         node['title'] = metadata[rel_index].get('title', name)
     else:
@@ -118,23 +126,17 @@ def build_tree(
     # Process children
     children = []
 
-    for item in sorted(dir_path.iterdir(), key=lambda x: get_sort_key(x.name)):
+    for item in sorted(index.list_dir(rel_path), key=lambda x: get_sort_key(x.name)):
         # Skip hidden files
         if item.name.startswith('.'):
             continue
 
         # Check exclusions
-        rel_item = item.relative_to(base_path)
-        skip = False
-        for excl in exclude:
-            if excl in str(rel_item):
-                skip = True
-                break
-        if skip:
+        if item.excluded:
             continue
 
-        if item.is_dir():
-            child = build_tree(item, metadata, base_path, exclude, depth + 1)
+        if item.is_dir:
+            child = build_tree(index.path(item.rel), metadata, base_path, exclude, depth + 1, index)
             if child:
                 children.append(child)
         elif item.suffix == '.md':
@@ -142,7 +144,7 @@ def build_tree(
             if item.name == '00_index.md':
                 continue
 
-            rel_file = str(rel_item)
+            rel_file = item.rel
             file_meta = metadata.get(rel_file, {})
 
             children.append({
@@ -157,7 +159,7 @@ def build_tree(
             # Python files
             children.append({
                 'name': item.name,
-                'path': str(rel_item),
+                'path': item.rel,
                 'type': 'code',
                 'title': item.name,
                 'order': get_sort_key(item.name),
@@ -263,10 +265,12 @@ def generate_hierarchy(
     content_dir: Path,
     metadata: Dict[str, Any],
     exclude: List[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    index: Optional[FileIndex] = None
 ) -> Dict[str, Any]:
     """
     Generate complete hierarchy tree for content directory.
+    Uses a shared FileIndex of the content directory (scanned here if not given).
     """
     exclude = exclude or []
     content_path = Path(content_dir)
@@ -274,6 +278,9 @@ def generate_hierarchy(
     if not content_path.exists():
         return {'children': []}
 
+    if index is None:
+        index = FileIndex(content_path, exclude)
+
     # Build tree starting from content directory
     tree = {
         'name': content_path.name,
@@ -283,21 +290,16 @@ def generate_hierarchy(
         'children': [],
     }
 
-    for item in sorted(content_path.iterdir(), key=lambda x: get_sort_key(x.name)):
+    for item in sorted(index.list_dir(), key=lambda x: get_sort_key(x.name)):
         if item.name.startswith('.'):
             continue
 
         # Check exclusions
-        skip = False
-        for excl in exclude:
-            if excl in item.name:
-                skip = True
-                break
-        if skip:
+        if item.excluded:
             continue
 
-        if item.is_dir():
-            child = build_tree(item, metadata, content_path, exclude)
+        if item.is_dir:
+            child = build_tree(index.path(item.rel), metadata, content_path, exclude, index=index)
             if child:
                 tree['children'].append(child)
                 if verbose:
@@ -327,12 +329,167 @@ def generate_hierarchy(
     tree['children'] = sorted(tree['children'], key=lambda x: x['order'])
 
     # Validate hierarchy for sequence gaps (always print warnings)
+    print_sequence_warnings(tree, verbose)
+
+    return tree
+
+
+def print_sequence_warnings(tree: Dict[str, Any], verbose: bool = False) -> None:
+    """Validate hierarchy and print sequence warnings, if any."""
     warnings = validate_hierarchy(tree, verbose=verbose)
     if warnings:
         print("\n      Sequence warnings (file numbering issues):")
         for warning in warnings:
             print(f"      {warning}")
 
+
+def page_url(path: str) -> str:
+    """Site URL of a content page, as rendered by Eleventy."""
+    if path.endswith('.md'):
+        path = path[:-3]
+    return '/' + path + '/'
+
+
+def hierarchy_number(path: str) -> str:
+    """
+    Hierarchical number of a content page from its path, matching the
+    sidebar numbering (e.g. "a_stack/02_llms/01_conceptos.md" -> "A.2.1").
+    """
+    clean = re.sub(r'\.md$', '', path)
+    clean = re.sub(r'/00_index$', '', clean)
+
+    numbers = []
+    for part in clean.split('/'):
+        letter_match = re.match(r'^([a-zA-Z])_', part)
+        if letter_match:
+            numbers.append(letter_match.group(1).upper())
+            continue
+        num_match = re.match(r'^(\d+)[_-]', part)
+        if num_match and int(num_match.group(1)) > 0:
+            numbers.append(str(int(num_match.group(1))))
+    return '.'.join(numbers)
+
+
+def build_navigation(tree: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Flatten the hierarchy into an ordered navigation index keyed by page
+    path (as in metadata.json), so templates can look up a page's
+    neighbours and ancestors without walking the tree.
+
+    Pages are listed in sidebar order; a directory with an index file is
+    the page at 'dir/00_index.md' and comes before its children.
+
+    Returns:
+        Dict of page path -> {
+            'path', 'url', 'title', 'number',
+            'depth': directory depth (0 = top level),
+            'parent': path of the parent directory ('' for top level),
+            'ancestors': [{'path', 'title', 'url'}] from the top down
+                         ('url' is None for directories without an index),
+            'position': 0-based position among its siblings,
+            'siblings': number of siblings (including itself),
+            'index': 0-based position in reading order,
+            'prev', 'next': neighbouring page paths or None
+        }
+    """
+    pages = []
+
+    def add_page(path, node, depth, parent, ancestors, position, siblings):
+        pages.append({
+            'path': path,
+            'url': page_url(path),
+            'title': node.get('title', node['name']),
+            'number': '' if node.get('no_number') else hierarchy_number(path),
+            'depth': depth,
+            'parent': parent,
+            'ancestors': ancestors,
+            'position': position,
+            'siblings': siblings,
+        })
+
+    def visit(node, depth, ancestors):
+        items = [c for c in node.get('children', []) if c['type'] in ('file', 'directory')]
+        for position, child in enumerate(items):
+            if child['type'] == 'file':
+                add_page(child['path'], child, depth, node.get('path', ''), ancestors,
+                         position, len(items))
+                continue
+
+            index_path = os.path.join(child['path'], '00_index.md')
+            if child.get('has_index'):
+                add_page(index_path, child, depth, node.get('path', ''), ancestors,
+                         position, len(items))
+            crumb = {
+                'path': child['path'],
+                'title': child.get('title', child['name']),
+                'url': page_url(index_path) if child.get('has_index') else None,
+            }
+            visit(child, depth + 1, ancestors + [crumb])
+
+    visit(tree, 0, [])
+
+    navigation = {}
+    for i, page in enumerate(pages):
+        page['index'] = i
+        page['prev'] = pages[i - 1]['path'] if i > 0 else None
+        page['next'] = pages[i + 1]['path'] if i + 1 < len(pages) else None
+        navigation[page['path']] = page
+    return navigation
+
+
+def update_hierarchy(
+    tree: Dict[str, Any],
+    content_dir: Path,
+    metadata: Dict[str, Any],
+    changed: List[str],
+    exclude: List[str] = None,
+    verbose: bool = False,
+    index: Optional[FileIndex] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild only the top-level subtrees that contain changed paths
+    (used by watch mode). Changes at the root of the content directory
+    fall back to a full rebuild. If a FileIndex is given, only the
+    affected subtrees are rescanned.
+
+    Returns:
+        The updated tree (the same object unless fully rebuilt)
+    """
+    exclude = exclude or []
+    content_path = Path(content_dir)
+
+    if index is None:
+        index = FileIndex(content_path, exclude)
+
+    tops = set()
+    for rel_path in changed:
+        parts = Path(rel_path).parts
+        if len(parts) < 2:
+            index.refresh()
+            return generate_hierarchy(content_dir, metadata, exclude, verbose, index)
+        tops.add(parts[0])
+
+    children = tree.get('children', [])
+    for top in sorted(tops):
+        position = next((i for i, c in enumerate(children)
+                         if c['name'] == top and c['type'] == 'directory'), None)
+        index.refresh(top)
+        entry = index.get(top)
+
+        if position is None or entry is None or not entry.is_dir:
+            # Chapter added or removed
+            index.refresh()
+            return generate_hierarchy(content_dir, metadata, exclude, verbose, index)
+
+        node = build_tree(index.path(top), metadata, content_path, exclude, index=index)
+        if node:
+            children[position] = node
+        else:
+            del children[position]
+        if verbose:
+            print(f"      Rebuilt: {top}")
+
+    print_sequence_warnings(tree, verbose)
     return tree
 
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Git Index Script
+
+Reads blob object IDs for tracked files from the git index in a single
+`git ls-files -s --debug` call, so sync_check.py can compare files
+without reading them.
+
+A blob ID is only trusted while the working-tree file still matches the
+stat data git recorded for it (size, mtime, ctime, inode) and the entry
+is not "racily clean" (modified in the same tick the index was written).
+Dirty, untracked or racy files get None and the caller hashes them
+itself, in the same format (see hash_cache.hash_blob).
+"""
+
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# One index entry: "<mode> <oid> <stage>\t<path>\0" followed by the
+# --debug stat lines
+ENTRY_RE = re.compile(
+    rb'(\d{6}) ([0-9a-f]+) (\d)\t([^\0]*)\0'
+    rb'\s*ctime: (\d+):(\d+)\n'
+    rb'\s*mtime: (\d+):(\d+)\n'
+    rb'\s*dev: \d+\tino: (\d+)\n'
+    rb'\s*uid: \d+\tgid: \d+\n'
+    rb'\s*size: (\d+)\tflags: [0-9a-f]+\n'
+)
+
+REGULAR_FILE_MODES = (b'100644', b'100755')
+
+
+class GitIndex:
+    """
+    Blob IDs of tracked files below some pathspecs.
+
+    Usage:
+        index = GitIndex.load(repo_root, ['clase', 'estudiantes/alice'])
+        oid = index.blob_id(path) if index else None
+    """
+
+    def __init__(self, repo_root: Path, entries: Dict[str, Tuple[str, int, int, int, int]], index_mtime_ns: int):
+        self.repo_root = Path(repo_root)
+        # Absolute path -> (oid, mtime_ns, ctime_ns, ino, size)
+        self.entries = entries
+        self.index_mtime_ns = index_mtime_ns
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, repo_root: Path, pathspecs: List[str]) -> Optional['GitIndex']:
+        """
+        Read the index entries below `pathspecs` (relative to repo_root).
+
+        Returns:
+            GitIndex, or None if git is unavailable or repo_root is not
+            the top of a work tree
+        """
+        repo_root = Path(repo_root)
+        try:
+            toplevel = subprocess.run(
+                ['git', 'rev-parse', '--show-toplevel', '--git-path', 'index'],
+                cwd=repo_root, capture_output=True, text=True, check=True
+            ).stdout.splitlines()
+            if Path(toplevel[0]).resolve() != repo_root.resolve():
+                return None
+            index_path = repo_root / toplevel[1]
+            index_mtime_ns = os.stat(index_path).st_mtime_ns
+
+            output = subprocess.run(
+                ['git', 'ls-files', '-s', '--debug', '-z', '--'] + pathspecs,
+                cwd=repo_root, capture_output=True, check=True
+            ).stdout
+        except (OSError, IndexError, subprocess.CalledProcessError):
+            return None
+
+        entries = {}
+        for match in ENTRY_RE.finditer(output):
+            mode, oid, stage, path, ctime_s, ctime_ns, mtime_s, mtime_ns, ino, size = match.groups()
+            if stage != b'0' or mode not in REGULAR_FILE_MODES:
+                continue
+            entries[str(repo_root / os.fsdecode(path))] = (
+                oid.decode('ascii'),
+                int(mtime_s) * 10**9 + int(mtime_ns),
+                int(ctime_s) * 10**9 + int(ctime_ns),
+                int(ino),
+                int(size),
+            )
+        return cls(repo_root, entries, index_mtime_ns)
+
+    def blob_id(self, filepath: Path, st: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        Blob ID of a file if it is tracked and unmodified, else None.
+        `st` may carry a stat result the caller already has.
+        """
+        entry = self.entries.get(str(filepath))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        oid, mtime_ns, ctime_ns, ino, size = entry
+        try:
+            if st is None:
+                st = os.stat(filepath)
+        except OSError:
+            self.misses += 1
+            return None
+
+        # The index stores sizes modulo 2^32
+        clean = (
+            st.st_mtime_ns == mtime_ns
+            and st.st_ctime_ns == ctime_ns
+            and st.st_size % 2**32 == size
+            and (ino == 0 or st.st_ino % 2**32 == ino)
+            and mtime_ns < self.index_mtime_ns
+        )
+        if not clean:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return oid
+
+    def summary(self) -> str:
+        """One-line summary of index usage."""
+        return f"{self.hits} from git index, {self.misses} not tracked or modified"
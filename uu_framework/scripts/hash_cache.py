@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Hash Cache Script
+
+Persistent content-hash cache for sync_check.py. Each entry stores the
+SHA-256 of a file together with its inode, size, mtime_ns and ctime_ns;
+while all are unchanged the stored digest is reused without reading the
+file. ctime catches rewrites whose mtime was restored (cp + touch -d).
+
+Misses are hashed in fixed-size chunks, so memory use does not depend on
+file size (PDFs, datasets).
+
+One cache can be shared by worker threads (sync_check.py --all).
+
+As in git's index, files modified within RACY_WINDOW_NS of being hashed
+are not cached: a second write in the same timestamp tick could change
+the content without changing size or mtime.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_PATH = Path('uu_framework/.cache/sync_hashes.json')
+
+CHUNK_SIZE = 1024 * 1024
+RACY_WINDOW_NS = 2 * 10**9
+
+
+def _hash_chunks(f, digest) -> int:
+    """Feed an open file to a hashlib object. Returns bytes read."""
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        n = f.readinto(buffer)
+        if not n:
+            return total
+        digest.update(view[:n])
+        total += n
+
+
+def hash_file(filepath: Path) -> str:
+    """SHA-256 of a file, read in CHUNK_SIZE pieces."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb', buffering=0) as f:
+        _hash_chunks(f, digest)
+    return digest.hexdigest()
+
+
+def hash_blob(filepath: Path) -> str:
+    """
+    Git blob ID of a file (as `git hash-object` without filters), read in
+    CHUNK_SIZE pieces.
+    """
+    with open(filepath, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        digest = hashlib.sha1(b'blob %d\0' % size)
+        if _hash_chunks(f, digest) != size:
+            raise OSError(f"{filepath} changed while hashing")
+    return digest.hexdigest()
+
+
+HASHERS = {
+    'sha256': hash_file,
+    'git-blob': hash_blob,
+}
+
+
+class HashCache:
+    """
+    On-disk cache of file digests.
+
+    `algorithm` is 'sha256' or 'git-blob' (digests comparable with blob
+    IDs from the git index); a cache written with the other algorithm is
+    discarded.
+
+    Layout on disk:
+        {
+            "version": 2,
+            "algorithm": "sha256",
+            "files": {"/abs/path": [inode, size, mtime_ns, ctime_ns, "digest"]}
+        }
+
+    Usage:
+        cache = HashCache(DEFAULT_CACHE_PATH)
+        digest = cache.digest(path)
+        cache.save()
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, algorithm: str = 'sha256'):
+        self.path = Path(path)
+        self.algorithm = algorithm
+        self.hasher = HASHERS[algorithm]
+        self.files: Dict[str, List] = {}
+        self.seen: set = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache, starting empty if it is missing or unreadable."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION and data.get('algorithm', 'sha256') == self.algorithm:
+            self.files = data.get('files', {})
+
+    def digest(self, filepath: Path, st: Optional[os.stat_result] = None) -> str:
+        """
+        Digest of a file, from the cache when inode, size, mtime and ctime
+        match.
+        `st` may carry a stat result the caller already has.
+
+        Returns:
+            Hex digest, or '' if the file cannot be read
+        """
+        key = str(filepath)
+        try:
+            if st is None:
+                st = os.stat(filepath)
+        except OSError:
+            return ''
+
+        stamp = [st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns]
+        with self.lock:
+            self.seen.add(key)
+            entry = self.files.get(key)
+            if entry and entry[:4] == stamp:
+                self.hits += 1
+                return entry[4]
+            self.misses += 1
+
+        try:
+            digest = self.hasher(filepath)
+        except OSError:
+            return ''
+
+        with self.lock:
+            if time.time_ns() - st.st_mtime_ns > RACY_WINDOW_NS:
+                self.files[key] = stamp + [digest]
+                self.dirty = True
+            elif key in self.files:
+                del self.files[key]
+                self.dirty = True
+        return digest
+
+    def save(self) -> None:
+        """
+        Write the cache to disk (atomically), dropping entries for files
+        that no longer exist.
+
+        Entries not looked up during this run are kept while their file
+        exists: a single-student run must not throw away the digests that
+        --all cached for everyone else.
+        """
+        stale = [key for key in self.files if key not in self.seen and not os.path.exists(key)]
+        for key in stale:
+            del self.files[key]
+        if stale:
+            self.dirty = True
+
+        if not self.dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'algorithm': self.algorithm, 'files': self.files},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def summary(self) -> str:
+        """One-line summary of cache usage."""
+        return f"{self.hits} cached, {self.misses} hashed"
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Output Writer Script
+
+Writes preprocessing outputs (_data/*.json, clase/README.md) only when
+their content changes. Each output is serialized in memory and its hash
+compared with the file on disk; unchanged files keep their mtime, so
+Eleventy's watcher does not rebuild the site after a no-op run.
+
+Changed files are written atomically (temp file in the same directory,
+then os.replace), so readers never see a half-written output.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import List, Any
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file's bytes, or '' if it cannot be read."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+    except OSError:
+        return ''
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Atomically write data to path unless the file already holds exactly
+    these bytes.
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    path = Path(path)
+    try:
+        same_size = os.stat(path).st_size == len(data)
+    except OSError:
+        same_size = False
+    if same_size and file_digest(path) == hashlib.sha256(data).hexdigest():
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Hidden temp name so file watchers skip it
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def serialize_json(data: Any) -> bytes:
+    """Serialize a _data output exactly as json.dump(indent=2) would."""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+class OutputWriter:
+    """
+    Skip-unchanged writer that remembers which outputs changed.
+
+    Usage:
+        writer = OutputWriter()
+        writer.write_json(output / 'metadata.json', metadata)
+        print(writer.summary())
+    """
+
+    def __init__(self):
+        self.changed: List[Path] = []
+        self.unchanged: List[Path] = []
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """Write raw bytes if changed. Returns True if written."""
+        written = write_if_changed(path, data)
+        (self.changed if written else self.unchanged).append(Path(path))
+        return written
+
+    def write_text(self, path: Path, text: str) -> bool:
+        """Write UTF-8 text if changed. Returns True if written."""
+        return self.write_bytes(path, text.encode('utf-8'))
+
+    def write_json(self, path: Path, data: Any) -> bool:
+        """Write a JSON output if changed. Returns True if written."""
+        return self.write_bytes(path, serialize_json(data))
+
+    def reset(self) -> None:
+        """Forget recorded outputs (e.g. between watch-mode batches)."""
+        self.changed = []
+        self.unchanged = []
+
+    def summary(self) -> str:
+        """One-line summary of which outputs changed."""
+        if not self.changed:
+            return f"all {len(self.unchanged)} outputs unchanged"
+        names = ', '.join(p.name for p in self.changed)
+        return f"{len(self.changed)} written ({names}), {len(self.unchanged)} unchanged"
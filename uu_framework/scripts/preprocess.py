@@ -9,25 +9,40 @@ Runs all preprocessing steps in order:
 3. Generate hierarchy tree
 4. Aggregate tasks (homework, exams, projects)
 
+Results are cached in a build manifest (see build_cache.py) so that
+unchanged files and stages are reused on the next run.
+
 Usage:
-    python3 preprocess.py [--config CONFIG_PATH] [--content CONTENT_DIR]
+    python3 preprocess.py [--config CONFIG_PATH] [--content CONTENT_DIR] [--no-cache] [--jobs N]
+    python3 preprocess.py --watch [--poll]
+    python3 preprocess.py --profile [--profile-json FILE] [--profile-trace FILE]
 """
 
 import os
 import sys
 import argparse
-import json
 import re
+import time
+from datetime import date
 from pathlib import Path
 
 # Add scripts directory to path
 SCRIPT_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from extract_metadata import extract_all_metadata
-from generate_indices import generate_hierarchy
-from aggregate_tasks import aggregate_all_tasks
+from extract_metadata import extract_all_metadata, update_metadata
+from generate_indices import (
+    build_navigation, generate_hierarchy, print_sequence_warnings, update_hierarchy
+)
+from aggregate_tasks import aggregate_all_tasks, update_tasks
 from process_calendar_topics import process_calendar_topics
+from build_cache import BuildCache, DEFAULT_CACHE_PATH, fingerprint, hash_bytes, run_stage
+from exclusion import ExcludeMatcher, compile_exclude
+from file_index import FileIndex
+from watch import FULL_RESCAN, create_watcher, wait_for_changes
+from profiler import StageProfiler
+from output_writer import OutputWriter
+from search_index import strip_search_terms, update_search_index
 
 
 def detect_git_info(verbose: bool = False) -> dict:
@@ -144,7 +159,7 @@ def load_config(config_path: Path) -> dict:
         return {}
 
 
-def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False) -> dict:
+def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False, index: FileIndex = None) -> dict:
     """
     Generate hierarchy for documentation from uu_framework/docs/.
     Returns a hierarchy dict to be merged into main hierarchy.
@@ -155,9 +170,12 @@ def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False) -> dict:
             print(f"      Docs directory not found: {docs_dir}")
         return None
 
+    if index is None:
+        index = FileIndex(docs_dir)
+
     docs_children = []
-    for item in sorted(docs_dir.iterdir()):
-        if item.is_dir() and item.name in ['dev', 'profesor', 'estudiante']:
+    for item in sorted(index.list_dir(), key=lambda e: e.name):
+        if item.is_dir and item.name in ['dev', 'profesor', 'estudiante']:
             section = {
                 "name": item.name,
                 "path": f"docs/{item.name}",
@@ -174,13 +192,13 @@ def generate_docs_hierarchy(docs_dir: Path, verbose: bool = False) -> dict:
             }
 
             # Add children (files in directory)
-            for child in sorted(item.iterdir()):
-                if child.is_file() and child.suffix == '.md':
+            for child in sorted(index.list_dir(item.rel), key=lambda e: e.name):
+                if not child.is_dir and child.suffix == '.md':
                     child_entry = {
                         "name": child.stem,
                         "path": f"docs/{item.name}/{child.stem}",
                         "type": "file",
-                        "title": get_title_from_file(child),
+                        "title": get_title_from_file(index.path(child.rel)),
                         "has_index": False,
                         "no_number": True,  # Docs don't show numbers
                         "children": []
@@ -226,10 +244,11 @@ def get_title_from_file(file_path: Path) -> str:
     return name.replace('_', ' ').title()
 
 
-def generate_landing_page(config: dict, verbose: bool = False) -> bool:
+def generate_landing_page(config: dict, verbose: bool = False, writer: OutputWriter = None) -> bool:
     """
     Auto-generate clase/README.md from root README.md.
-    Adds frontmatter and auto-generated notice.
+    Adds frontmatter and auto-generated notice. The file is only rewritten
+    when its content changes.
 
     Returns True if successful, False otherwise.
     """
@@ -290,11 +309,15 @@ eleventyExcludeFromCollections: true
             web_content = re.sub(pattern_root, r"[\1]({{ '/' | url }})", web_content)
 
         # Write to clase/README.md
-        with open(clase_readme, 'w', encoding='utf-8') as f:
-            f.write(frontmatter + web_content)
+        if writer is None:
+            writer = OutputWriter()
+        written = writer.write_text(clase_readme, frontmatter + web_content)
 
         if verbose:
-            print(f"      Generated {clase_readme} from {root_readme}")
+            if written:
+                print(f"      Generated {clase_readme} from {root_readme}")
+            else:
+                print(f"      {clase_readme} unchanged")
 
         return True
 
@@ -303,6 +326,211 @@ eleventyExcludeFromCollections: true
         return False
 
 
+def compose_hierarchy(hierarchy: dict, docs_hierarchy: dict) -> dict:
+    """Return the content hierarchy with the docs section appended."""
+    if docs_hierarchy and 'children' in hierarchy:
+        return {**hierarchy, 'children': hierarchy['children'] + [docs_hierarchy]}
+    return hierarchy
+
+
+def classify_changes(changed: set, args, exclude: ExcludeMatcher, state: dict) -> dict:
+    """
+    Sort changed paths into what they affect: the landing page, docs,
+    calendar, individual markdown files, or the content tree structure.
+    """
+    result = {
+        'landing': False,
+        'docs': False,
+        'calendar': False,
+        'md_files': set(),
+        'structure': set(),
+    }
+    csv_path = args.content / 'calendario_temas.csv'
+
+    for path in changed:
+        if path == Path('README.md'):
+            result['landing'] = True
+            continue
+        if path == args.docs or args.docs in path.parents:
+            result['docs'] = True
+            continue
+        if path == csv_path:
+            result['calendar'] = True
+            continue
+
+        try:
+            rel = path.relative_to(args.content)
+        except ValueError:
+            continue
+        rel_str = str(rel)
+
+        # Hidden files (editor swap files, .git) and excluded paths
+        if any(part.startswith('.') for part in rel.parts):
+            continue
+        if exclude.matches(rel_str, path.is_dir()):
+            continue
+
+        if path.suffix == '.md':
+            result['md_files'].add(rel_str)
+        elif path.is_dir():
+            # New or moved-in directory: pick up the files it brought
+            result['structure'].add(rel_str)
+            for md in path.rglob('*.md'):
+                result['md_files'].add(str(md.relative_to(args.content)))
+        elif not path.exists():
+            # Deleted file or directory; a directory may have a dot in its
+            # name (08_containers.v2/), so check for pages under it whatever
+            # the suffix and drop them
+            prefix = rel_str + os.sep
+            contained = {k for k in state['metadata'] if k.startswith(prefix)}
+            if contained or path.suffix in ('', '.py'):
+                result['structure'].add(rel_str)
+            result['md_files'].update(contained)
+        elif path.suffix == '.py':
+            result['structure'].add(rel_str)
+
+    return result
+
+
+def apply_changes(changed: set, args, config: dict, exclude: ExcludeMatcher, state: dict) -> list:
+    """
+    Patch the in-memory state for a batch of changed paths and rewrite
+    the affected outputs.
+
+    Returns:
+        Names of the output files whose content changed
+    """
+    outputs = set()
+    writer = OutputWriter()
+
+    if changed is FULL_RESCAN:
+        print("      Events lost, rescanning everything")
+        state['index'] = FileIndex(args.content, exclude)
+        state['metadata'] = extract_all_metadata(
+            args.content, exclude, args.verbose, index=state['index'], search=search_enabled(config))
+        state['hierarchy'] = generate_hierarchy(
+            args.content, state['metadata'], exclude, args.verbose, state['index'])
+        state['docs_hierarchy'] = generate_docs_hierarchy(args.docs, args.verbose)
+        state['tasks'] = aggregate_all_tasks(args.content, state['metadata'], args.verbose)
+        state['calendar_topics'] = process_calendar_topics(
+            args.content / 'calendario_temas.csv', args.verbose)
+        generate_landing_page(config, args.verbose, writer)
+        outputs.update(['metadata', 'hierarchy', 'tasks', 'calendar_topics'])
+    else:
+        changes = classify_changes(changed, args, exclude, state)
+
+        if changes['landing']:
+            generate_landing_page(config, args.verbose, writer)
+
+        changed_files = update_metadata(
+            state['metadata'], args.content, sorted(changes['md_files']), exclude, args.verbose,
+            search_enabled(config))
+        if changed_files:
+            outputs.add('metadata')
+            update_tasks(state['tasks'], args.content, state['metadata'], changed_files, args.verbose)
+            outputs.add('tasks')
+
+        hierarchy_paths = set(changed_files) | changes['structure']
+        if hierarchy_paths:
+            state['hierarchy'] = update_hierarchy(
+                state['hierarchy'], args.content, state['metadata'],
+                sorted(hierarchy_paths), exclude, args.verbose, state['index'])
+            outputs.add('hierarchy')
+
+        if changes['docs']:
+            state['docs_hierarchy'] = generate_docs_hierarchy(args.docs, args.verbose)
+            outputs.add('hierarchy')
+
+        if changes['calendar']:
+            state['calendar_topics'] = process_calendar_topics(
+                args.content / 'calendario_temas.csv', args.verbose)
+            outputs.add('calendar_topics')
+
+    # Overdue flags go stale at midnight
+    if date.today() != state['date']:
+        state['date'] = date.today()
+        state['tasks'] = aggregate_all_tasks(args.content, state['metadata'], args.verbose)
+        outputs.add('tasks')
+
+    if 'hierarchy' in outputs:
+        state['navigation'] = build_navigation(state['hierarchy'])
+        writer.write_json(args.output / 'navigation.json', state['navigation'])
+    if outputs & {'metadata', 'hierarchy'}:
+        build_search(args, config, state['metadata'], state['navigation'], writer)
+
+    for name in sorted(outputs):
+        if name == 'hierarchy':
+            data = compose_hierarchy(state['hierarchy'], state['docs_hierarchy'])
+        elif name == 'metadata':
+            data = strip_search_terms(state['metadata'])
+        else:
+            data = state[name]
+        writer.write_json(args.output / f'{name}.json', data)
+
+    return [path.name for path in writer.changed]
+
+
+def search_enabled(config: dict) -> bool:
+    """True if features.search is on in site.yaml."""
+    return bool(config.get('features', {}).get('search'))
+
+
+def build_search(args, config: dict, metadata: dict, navigation: dict, writer: OutputWriter) -> None:
+    """
+    Update the sharded search index (if enabled) and write search.json,
+    which tells templates whether to load the search client.
+    """
+    enabled = search_enabled(config)
+    writer.write_json(args.output / 'search.json', {
+        'enabled': enabled,
+        'manifest': '/search/manifest.json',
+    })
+    if not enabled:
+        return
+
+    stats = update_search_index(metadata, navigation, args.search_output, OutputWriter(), args.verbose)
+    if stats is None:
+        print("      Search index unchanged")
+        return
+    print(f"      Indexed {stats['docs']} pages, {stats['terms']} terms in {stats['shards']} shards "
+          f"to {args.search_output}")
+    print(f"      Size: {stats['gzip_bytes'] / 1024:.1f} KB gzipped "
+          f"(manifest {stats['manifest_gzip_bytes'] / 1024:.1f} KB, "
+          f"shards avg {stats['avg_shard_gzip_bytes'] / 1024:.1f} KB / "
+          f"max {stats['max_shard_gzip_bytes'] / 1024:.1f} KB)")
+
+
+def run_watch(args, config: dict, exclude: ExcludeMatcher, state: dict) -> int:
+    """
+    Watch sources and keep outputs up to date until interrupted.
+    """
+    watcher = create_watcher(
+        [args.content, args.docs],
+        [Path('README.md')],
+        poll=args.poll
+    )
+    print(f"\nWatching {args.content}/, {args.docs}/ and README.md "
+          f"({type(watcher).__name__}). Press Ctrl+C to stop.")
+
+    try:
+        while True:
+            changed = wait_for_changes(watcher, args.debounce)
+            start = time.perf_counter()
+            outputs = apply_changes(changed, args, config, exclude, state)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if outputs:
+                print(f"[watch] Updated {', '.join(outputs)} "
+                      f"in {elapsed_ms:.0f} ms")
+            elif args.verbose:
+                print(f"[watch] No output changes ({len(changed or [])} paths)")
+    except KeyboardInterrupt:
+        print("\n[watch] Stopped")
+    finally:
+        watcher.close()
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='uu_framework preprocessor')
     parser.add_argument('--config', type=Path,
@@ -317,6 +545,33 @@ def main():
     parser.add_argument('--output', type=Path,
                         default=Path('uu_framework/eleventy/_data'),
                         help='Path to output data directory')
+    parser.add_argument('--search-output', type=Path,
+                        default=Path('uu_framework/eleventy/src/search'),
+                        help='Output directory for search index shards')
+    parser.add_argument('--cache', type=Path,
+                        default=DEFAULT_CACHE_PATH,
+                        help='Path to incremental build manifest')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the build manifest and recompute everything')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Worker processes for metadata extraction (0 = one per CPU core, 1 = serial)')
+    parser.add_argument('--watch', '-w', action='store_true',
+                        help='Keep running and update outputs when sources change')
+    parser.add_argument('--poll', action='store_true',
+                        help='Watch by polling instead of inotify (e.g. Docker bind mounts on macOS)')
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help='Seconds of quiet before applying a burst of changes (watch mode)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print per-stage timing profile')
+    parser.add_argument('--profile-json', type=Path,
+                        help='Save the stage profile as JSON (implies --profile)')
+    parser.add_argument('--profile-trace', type=Path,
+                        help='Save the stage profile as a Chrome trace (implies --profile)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='Also trace Python allocations with tracemalloc (implies --profile; '
+                             'stages run several times slower)')
+    # Timings only is now the default; still accepted for existing scripts
+    parser.add_argument('--profile-no-memory', action='store_true', help=argparse.SUPPRESS)
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
 
@@ -324,95 +579,200 @@ def main():
 
     # Ensure output directory exists
     args.output.mkdir(parents=True, exist_ok=True)
+    writer = OutputWriter()
+
+    profiler = StageProfiler(
+        enabled=bool(args.profile or args.profile_memory or args.profile_json or args.profile_trace),
+        trace_memory=args.profile_memory and not args.profile_no_memory)
 
     # Load configuration
-    config = load_config(args.config)
+    with profiler.stage('config'):
+        config = load_config(args.config)
     if args.verbose:
         print(f"Loaded config from {args.config}")
 
-    # Get exclude patterns from config
-    exclude = config.get('source', {}).get('exclude', [])
+    # Get exclude patterns from config, compiled once for all stages
+    exclude_patterns = config.get('source', {}).get('exclude', [])
+    exclude = compile_exclude(exclude_patterns)
 
     print("=" * 60)
     print("uu_framework Preprocessing")
     print("=" * 60)
 
+    # Incremental build manifest
+    cache = None
+    if not args.no_cache:
+        cache = BuildCache(args.cache, {
+            'content': str(args.content),
+            'exclude': exclude_patterns,
+            'search': search_enabled(config),
+        }, args.verbose)
+
+    # Scan content and docs once; every stage works from these indices
+    with profiler.stage('scan') as record:
+        content_index = FileIndex(args.content, exclude)
+        docs_index = FileIndex(args.docs)
+        counts = content_index.count()
+        record['items'] = counts['files'] + counts['dirs']
+    if args.verbose:
+        print(f"Indexed {counts['files']} files in {counts['dirs']} directories under {args.content}")
+
     # Step 0: Generate landing page from root README.md
     print("\n[0/5] Generating landing page...")
-    generate_landing_page(config, args.verbose)
+    with profiler.stage('landing_page'):
+        generate_landing_page(config, args.verbose, writer)
 
     # Step 1: Extract metadata from all markdown files
     print("\n[1/5] Extracting metadata from markdown files...")
-    metadata = extract_all_metadata(args.content, exclude, args.verbose)
-
-    # Save metadata
-    metadata_path = args.output / 'metadata.json'
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
-    print(f"      Saved {len(metadata)} file metadata records to {metadata_path}")
+    with profiler.stage('metadata') as record:
+        metadata = extract_all_metadata(args.content, exclude, args.verbose,
+                                        cache=cache, workers=args.jobs, index=content_index,
+                                        search=search_enabled(config))
+        record['items'] = len(metadata)
+        if cache is not None:
+            print(f"      Build cache: {cache.summary()}")
+        public_metadata = strip_search_terms(metadata)
+        metadata_fingerprint = fingerprint(public_metadata)
+
+        # Save metadata
+        metadata_path = args.output / 'metadata.json'
+        with profiler.stage('write'):
+            writer.write_json(metadata_path, public_metadata)
+        print(f"      Saved {len(metadata)} file metadata records to {metadata_path}")
 
     # Step 2: Generate hierarchy tree
     print("\n[2/5] Generating hierarchy tree...")
-    hierarchy = generate_hierarchy(args.content, metadata, exclude, args.verbose)
+    with profiler.stage('hierarchy'):
+        hierarchy, reused = run_stage(
+            cache, 'hierarchy',
+            fingerprint(metadata_fingerprint, content_index.listing(['.md', '.py'])),
+            lambda: generate_hierarchy(args.content, metadata, exclude, args.verbose, content_index)
+        )
+        if reused:
+            print("      Hierarchy unchanged (cached)")
+            print_sequence_warnings(hierarchy, args.verbose)
+
+        # Flat navigation index (prev/next, breadcrumbs) for templates
+        navigation = build_navigation(hierarchy)
+        navigation_path = args.output / 'navigation.json'
+        with profiler.stage('write'):
+            writer.write_json(navigation_path, navigation)
+        print(f"      Saved navigation index for {len(navigation)} pages to {navigation_path}")
 
     # Add documentation hierarchy (from uu_framework/docs/, rendered to /docs/)
     print("\n[2b/5] Adding documentation hierarchy...")
-    docs_hierarchy = generate_docs_hierarchy(args.docs, args.verbose)
-    if docs_hierarchy and 'children' in hierarchy:
-        hierarchy['children'].append(docs_hierarchy)
-        print(f"      Added docs section with {len(docs_hierarchy['children'])} subsections")
-    else:
-        print("      No documentation found")
-
-    # Save hierarchy
-    hierarchy_path = args.output / 'hierarchy.json'
-    with open(hierarchy_path, 'w', encoding='utf-8') as f:
-        json.dump(hierarchy, f, indent=2, ensure_ascii=False)
-    print(f"      Saved hierarchy to {hierarchy_path}")
+    with profiler.stage('docs_hierarchy'):
+        docs_hierarchy = generate_docs_hierarchy(args.docs, args.verbose, docs_index)
+        if docs_hierarchy and 'children' in hierarchy:
+            print(f"      Added docs section with {len(docs_hierarchy['children'])} subsections")
+        else:
+            print("      No documentation found")
+
+        # Save hierarchy
+        hierarchy_path = args.output / 'hierarchy.json'
+        with profiler.stage('write'):
+            writer.write_json(hierarchy_path, compose_hierarchy(hierarchy, docs_hierarchy))
+        print(f"      Saved hierarchy to {hierarchy_path}")
 
     # Step 3: Aggregate tasks (homework, exams, projects)
     print("\n[3/5] Aggregating tasks...")
-    tasks = aggregate_all_tasks(args.content, metadata, args.verbose)
+    with profiler.stage('tasks') as record:
+        # Overdue flags depend on today's date
+        tasks, reused = run_stage(
+            cache, 'tasks',
+            fingerprint(metadata_fingerprint, date.today().isoformat()),
+            lambda: aggregate_all_tasks(args.content, metadata, args.verbose)
+        )
+        if reused:
+            print("      Tasks unchanged (cached)")
+        record['items'] = sum(len(v) for v in tasks.values())
 
-    # Save tasks
-    tasks_path = args.output / 'tasks.json'
-    with open(tasks_path, 'w', encoding='utf-8') as f:
-        json.dump(tasks, f, indent=2, ensure_ascii=False)
-    print(f"      Saved {sum(len(v) for v in tasks.values())} tasks to {tasks_path}")
+        # Save tasks
+        tasks_path = args.output / 'tasks.json'
+        with profiler.stage('write'):
+            writer.write_json(tasks_path, tasks)
+        print(f"      Saved {sum(len(v) for v in tasks.values())} tasks to {tasks_path}")
 
     # Step 4: Process calendar topics from CSV
     print("\n[4/5] Processing calendar topics...")
-    csv_path = args.content / 'calendario_temas.csv'
-    calendar_topics = process_calendar_topics(csv_path, args.verbose)
-
-    # Save calendar topics
-    calendar_path = args.output / 'calendar_topics.json'
-    with open(calendar_path, 'w', encoding='utf-8') as f:
-        json.dump(calendar_topics, f, indent=2, ensure_ascii=False)
-    print(f"      Saved {len(calendar_topics)} calendar entries to {calendar_path}")
-
-    # Save site config for templates
-    site_path = args.output / 'site.json'
-    with open(site_path, 'w', encoding='utf-8') as f:
-        json.dump(config.get('site', {}), f, indent=2, ensure_ascii=False)
+    with profiler.stage('calendar') as record:
+        csv_path = args.content / 'calendario_temas.csv'
+        if csv_path.exists():
+            calendar_topics, reused = run_stage(
+                cache, 'calendar',
+                hash_bytes(csv_path.read_bytes()),
+                lambda: process_calendar_topics(csv_path, args.verbose)
+            )
+            if reused:
+                print("      Calendar unchanged (cached)")
+        else:
+            # Creates the placeholder CSV; cached on the next run
+            calendar_topics = process_calendar_topics(csv_path, args.verbose)
+        record['items'] = len(calendar_topics)
+
+        # Save calendar topics
+        calendar_path = args.output / 'calendar_topics.json'
+        with profiler.stage('write'):
+            writer.write_json(calendar_path, calendar_topics)
+        print(f"      Saved {len(calendar_topics)} calendar entries to {calendar_path}")
+
+        # Save site config for templates
+        site_path = args.output / 'site.json'
+        writer.write_json(site_path, config.get('site', {}))
+
+    # Step 4b: Build search index
+    print("\n[4b/5] Building search index...")
+    with profiler.stage('search') as record:
+        build_search(args, config, metadata, navigation, writer)
+        if not search_enabled(config):
+            print("      Search disabled (features.search in site.yaml)")
+        record['items'] = len(navigation)
+
+    if cache is not None:
+        with profiler.stage('cache_save'):
+            cache.save()
 
     # Step 5: Auto-detect and save repository config
     print("\n[5/5] Detecting repository configuration...")
-    git_info = detect_git_info(args.verbose)
-    repo_config = merge_repo_config(config, git_info, args.verbose)
+    with profiler.stage('repo_detection'):
+        git_info = detect_git_info(args.verbose)
+        repo_config = merge_repo_config(config, git_info, args.verbose)
+
+        # Validate and fail if configuration is invalid
+        validate_repo_config(repo_config, git_info)
+
+        repo_path = args.output / 'repo.json'
+        writer.write_json(repo_path, repo_config)
+        print(f"      Saved repository config to {repo_path}")
 
-    # Validate and fail if configuration is invalid
-    validate_repo_config(repo_config, git_info)
+    if profiler.enabled:
+        profiler.print_table()
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+            print(f"\nSaved profile to {args.profile_json}")
+        if args.profile_trace:
+            profiler.write_chrome_trace(args.profile_trace)
+            print(f"Saved Chrome trace to {args.profile_trace}")
 
-    repo_path = args.output / 'repo.json'
-    with open(repo_path, 'w', encoding='utf-8') as f:
-        json.dump(repo_config, f, indent=2, ensure_ascii=False)
-    print(f"      Saved repository config to {repo_path}")
+    print(f"\nOutputs: {writer.summary()}")
 
     print("\n" + "=" * 60)
     print("Preprocessing complete!")
     print("=" * 60)
 
+    if args.watch:
+        state = {
+            'metadata': metadata,
+            'hierarchy': hierarchy,
+            'docs_hierarchy': docs_hierarchy,
+            'tasks': tasks,
+            'calendar_topics': calendar_topics,
+            'date': date.today(),
+            'index': content_index,
+            'navigation': navigation,
+        }
+        return run_watch(args, config, exclude, state)
+
     return 0
 
 
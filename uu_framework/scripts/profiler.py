@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler Script
+
+Records per-stage timing and memory for `preprocess.py --profile`:
+wall time, CPU time (including worker processes) and peak RSS. With
+`--profile-memory` it also records the Python heap peak and, for
+top-level stages, the top allocating source lines (tracemalloc).
+Tracemalloc slows allocation-heavy stages several times over (importing
+PyYAML alone goes from ~30 ms to ~500 ms), so timings from a traced run
+are only comparable with other traced runs.
+
+Results can be printed as a table, saved as JSON (for tracking across
+commits) or saved as a Chrome trace (open in chrome://tracing or
+https://ui.perfetto.dev).
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+TOP_ALLOCATORS = 5
+
+
+def max_rss_kb() -> int:
+    """Peak resident set size of this process so far, in KB (0 if unknown)."""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def children_cpu_s() -> float:
+    """CPU time used by terminated child processes (e.g. pool workers)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class StageProfiler:
+    """
+    Collects nested stage records. When disabled, stage() is a cheap no-op
+    so the orchestrator can be instrumented unconditionally.
+
+    Usage:
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage('metadata') as record:
+            metadata = extract_all_metadata(...)
+            record['items'] = len(metadata)
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.records: List[Dict[str, Any]] = []
+        self.stack: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block as a stage (nested stages allowed)."""
+        record: Dict[str, Any] = {'name': name, 'depth': len(self.stack)}
+        if not self.enabled:
+            yield record
+            return
+
+        parent = self.stack[-1] if self.stack else None
+        self.stack.append(record)
+        self.records.append(record)
+
+        # Snapshots are slow (hundreds of ms on a large heap) and a nested
+        # stage's snapshots would run inside its parents' timers, so only
+        # top-level stages record allocators; nested ones keep the cheap
+        # heap peak
+        snapshot = None
+        prev_peak = 0
+        if self.trace_memory:
+            prev_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            if parent is None:
+                snapshot = self.snapshot()
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        start_child_cpu = children_cpu_s()
+        try:
+            yield record
+        finally:
+            record['start_ms'] = (start_wall - self.origin) * 1000
+            record['wall_ms'] = (time.perf_counter() - start_wall) * 1000
+            record['cpu_ms'] = (time.process_time() - start_cpu) * 1000
+            record['child_cpu_ms'] = (children_cpu_s() - start_child_cpu) * 1000
+            record['max_rss_kb'] = max_rss_kb()
+
+            items = record.get('items')
+            if items and record['wall_ms'] > 0:
+                record['items_per_s'] = items / (record['wall_ms'] / 1000)
+
+            if self.trace_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], record.pop('_peak_carry', 0))
+                record['py_peak_kb'] = peak / 1024
+                if snapshot is not None:
+                    record['top_allocators'] = self.top_allocators(snapshot)
+                if parent is not None:
+                    # The child reset the peak counter; carry it to the parent
+                    parent['_peak_carry'] = max(parent.get('_peak_carry', 0), prev_peak, peak)
+
+            self.stack.pop()
+
+    def snapshot(self):
+        """tracemalloc snapshot without the profiler's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def top_allocators(self, before) -> List[Dict[str, Any]]:
+        """Source lines that allocated the most memory since `before`."""
+        stats = [s for s in self.snapshot().compare_to(before, 'lineno') if s.size_diff > 0]
+        stats.sort(key=lambda s: s.size_diff, reverse=True)
+        top = []
+        for stat in stats[:TOP_ALLOCATORS]:
+            frame = stat.traceback[0]
+            top.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_kb': stat.size_diff / 1024,
+                'count': stat.count_diff,
+            })
+        return top
+
+    def print_table(self) -> None:
+        """Print the stage records as a text table."""
+        if not self.records:
+            return
+
+        print("\n" + "=" * 60)
+        print("Preprocessing profile")
+        print("=" * 60)
+        header = f"{'Stage':28s} {'Wall ms':>9s} {'CPU ms':>9s} {'Items':>6s} {'Items/s':>9s}"
+        if self.trace_memory:
+            header += f" {'Py peak KB':>10s}"
+        header += f" {'Max RSS KB':>10s}"
+        print(header)
+
+        for r in self.records:
+            name = '  ' * r['depth'] + r['name']
+            cpu = r['cpu_ms'] + r['child_cpu_ms']
+            items = str(r.get('items', ''))
+            rate = f"{r['items_per_s']:.0f}" if 'items_per_s' in r else ''
+            line = f"{name:28s} {r['wall_ms']:9.1f} {cpu:9.1f} {items:>6s} {rate:>9s}"
+            if self.trace_memory:
+                line += f" {r['py_peak_kb']:10.0f}"
+            line += f" {r['max_rss_kb']:10d}"
+            print(line)
+
+        total = sum(r['wall_ms'] for r in self.records if r['depth'] == 0)
+        print(f"{'Total':28s} {total:9.1f}")
+        if self.trace_memory:
+            print("(times include tracemalloc overhead; run without --profile-memory for timings)")
+
+        if self.trace_memory:
+            print("\nTop allocators per stage:")
+            for r in self.records:
+                if r['depth'] != 0 or not r.get('top_allocators'):
+                    continue
+                print(f"  {r['name']}:")
+                for alloc in r['top_allocators']:
+                    print(f"    {alloc['size_kb']:8.1f} KB  {alloc['count']:6d} blocks  {alloc['location']}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Profile as a JSON-serializable dict."""
+        return {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'pid': os.getpid(),
+            'stages': self.records,
+        }
+
+    def write_json(self, path: Path) -> None:
+        """Save the profile as JSON."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Save the profile in Chrome trace event format."""
+        pid = os.getpid()
+        events = []
+        for r in self.records:
+            events.append({
+                'name': r['name'],
+                'cat': 'preprocess',
+                'ph': 'X',
+                'ts': r['start_ms'] * 1000,
+                'dur': r['wall_ms'] * 1000,
+                'pid': pid,
+                'tid': 0,
+                'args': {k: v for k, v in r.items()
+                         if k not in ('name', 'depth', 'start_ms', 'wall_ms', 'top_allocators')},
+            })
+            if 'max_rss_kb' in r:
+                events.append({
+                    'name': 'max_rss_kb',
+                    'ph': 'C',
+                    'ts': (r['start_ms'] + r['wall_ms']) * 1000,
+                    'pid': pid,
+                    'args': {'max_rss_kb': r['max_rss_kb']},
+                })
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Search Index Script
+
+Builds a static full-text search index for the site, split into small
+files so the browser only downloads what a query needs.
+
+- Tokenization folds accents and case ("Configuración" -> "configuracion")
+  and drops Spanish stopwords; the same rules are applied by the client
+  (eleventy/src/js/search.js), which reads them from the manifest.
+- Each page contributes weighted term scores from its title, headings,
+  tags and body text. These are computed per file during metadata
+  extraction (document_terms), so they are cached in the build manifest
+  and only recomputed for changed files.
+- Terms are sharded by prefix: a shard is split by one more character
+  while it is larger than SHARD_TARGET_BYTES. A query term only needs the
+  shards whose key is a prefix of it (or that it is a prefix of, for
+  prefix matches).
+- Page titles/URLs are stored in fixed-size chunks, fetched only for the
+  results being shown.
+
+File names carry a content hash, so unchanged shards keep their URL and
+stay in the browser cache across rebuilds. Layout of the output directory:
+
+    manifest.json     {"version", "docs", "chunk", "doc_files", "shards", ...}
+    t-<hash>.json     {"t": [sorted terms], "p": [[doc delta, score, ...], ...]}
+    d-<hash>.json     [[url, title], ...]
+"""
+
+import re
+import gzip
+import json
+import hashlib
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+
+from build_cache import fingerprint
+
+
+INDEX_VERSION = 1
+
+# Term weights per occurrence
+TITLE_WEIGHT = 8
+HEADING_WEIGHT = 3
+TAG_WEIGHT = 3
+BODY_WEIGHT = 1
+MAX_TERM_SCORE = 255
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 40
+
+SHARD_TARGET_BYTES = 16 * 1024   # Uncompressed; split shards larger than this
+MAX_PREFIX_LENGTH = 4
+DOCS_PER_CHUNK = 200
+
+STOPWORDS = frozenset('''
+    al algo algunas algunos ante antes aqui asi aun cada como con contra cual
+    cuales cuando de del desde donde dos e el ella ellas ello ellos en entre
+    era eran es esa esas ese eso esos esta estan estas este esto estos fue
+    fueron ha han hasta hay la las le les lo los mas me mi mis muy ni no nos
+    o otra otras otro otros para pero por porque que quien se sea ser si sin
+    sobre son su sus tambien te tiene tienen todo todos tu tus un una unas
+    uno unos y ya yo
+    a an and are as at be by for from in is it of on or the this to with
+'''.split())
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+COMBINING_RE = re.compile(r'[\u0300-\u036f]')
+
+# Markup that should not be indexed as text
+COMPONENT_RE = re.compile(r'^:::\w*(?:\{[^}]*\})?\s*$', re.MULTILINE)
+LINK_TARGET_RE = re.compile(r'\]\([^)]*\)')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+URL_RE = re.compile(r'https?://\S+')
+HEADING_RE = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents (ñ -> n, á -> a)."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return COMBINING_RE.sub('', unicodedata.normalize('NFD', text))
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into folded search terms, dropping stopwords."""
+    return [
+        token for token in TOKEN_RE.findall(fold(text))
+        if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ]
+
+
+def document_terms(title: str, body: str, tags: Iterable = ()) -> Dict[str, int]:
+    """
+    Weighted term scores for one page.
+
+    Returns:
+        Dict of term -> score (capped at MAX_TERM_SCORE)
+    """
+    scores: Counter = Counter()
+
+    def add(text, weight):
+        counts = Counter(TOKEN_RE.findall(fold(text)))
+        for token, count in counts.items():
+            if MIN_TERM_LENGTH <= len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS:
+                scores[token] += count * weight
+
+    text = COMPONENT_RE.sub('', body)
+    text = LINK_TARGET_RE.sub(']', text)
+    text = URL_RE.sub(' ', text)
+    text = HTML_TAG_RE.sub(' ', text)
+
+    add(str(title or ''), TITLE_WEIGHT)
+    for tag in tags if isinstance(tags, (list, tuple)) else []:
+        add(str(tag), TAG_WEIGHT)
+    for heading in HEADING_RE.findall(text):
+        add(heading, HEADING_WEIGHT - BODY_WEIGHT)
+    add(text, BODY_WEIGHT)
+
+    return {term: min(score, MAX_TERM_SCORE) for term, score in scores.items()}
+
+
+def strip_search_terms(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata without the per-file search terms (as written to metadata.json)."""
+    return {
+        rel: {k: v for k, v in meta.items() if k != 'search_terms'}
+        for rel, meta in metadata.items()
+    }
+
+
+def compact_json(data: Any) -> bytes:
+    """Serialize without whitespace."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def hashed_name(prefix: str, data: bytes) -> str:
+    """Content-addressed file name."""
+    return f"{prefix}-{hashlib.sha256(data).hexdigest()[:12]}.json"
+
+
+def encode_shard(terms: List[str], postings: Dict[str, List[tuple]]) -> bytes:
+    """Serialize a shard with delta-encoded document ids."""
+    encoded = []
+    for term in terms:
+        flat = []
+        previous = 0
+        for doc_id, score in postings[term]:
+            flat += [doc_id - previous, score]
+            previous = doc_id
+        encoded.append(flat)
+    return compact_json({'t': terms, 'p': encoded})
+
+
+def split_shards(prefix: str, terms: List[str], postings: Dict[str, List[tuple]]) -> Dict[str, bytes]:
+    """
+    Recursively split a group of terms sharing `prefix` until each shard is
+    at most SHARD_TARGET_BYTES (or the prefix reaches MAX_PREFIX_LENGTH).
+
+    Returns:
+        Dict of shard key -> serialized shard
+    """
+    data = encode_shard(terms, postings)
+    if len(data) <= SHARD_TARGET_BYTES or len(prefix) >= MAX_PREFIX_LENGTH:
+        return {prefix: data}
+
+    groups: Dict[str, List[str]] = {}
+    for term in terms:
+        # Terms no longer than the prefix stay in the prefix's own shard
+        key = term[:len(prefix) + 1] if len(term) > len(prefix) else prefix
+        groups.setdefault(key, []).append(term)
+
+    if len(groups) == 1 and prefix in groups:
+        return {prefix: data}
+
+    shards = {}
+    for key, group in groups.items():
+        if key == prefix:
+            shards[key] = encode_shard(group, postings)
+        else:
+            shards.update(split_shards(key, group, postings))
+    return shards
+
+
+def build_search_index(
+    metadata: Dict[str, Any],
+    navigation: Dict[str, Dict[str, Any]],
+    index_fingerprint: str = ''
+) -> Dict[str, Any]:
+    """
+    Build the sharded index for every page in the navigation index.
+
+    Returns:
+        Dict with 'manifest' (dict) and 'files' (file name -> bytes,
+        including manifest.json)
+    """
+    docs = []
+    postings: Dict[str, List[tuple]] = {}
+    for path, page in navigation.items():
+        terms = metadata.get(path, {}).get('search_terms')
+        if not terms:
+            continue
+        doc_id = len(docs)
+        title = f"{page['number']} {page['title']}" if page.get('number') else page['title']
+        docs.append([page['url'], title])
+        for term, score in terms.items():
+            postings.setdefault(term, []).append((doc_id, score))
+
+    files: Dict[str, bytes] = {}
+
+    doc_files = []
+    for start in range(0, len(docs), DOCS_PER_CHUNK):
+        data = compact_json(docs[start:start + DOCS_PER_CHUNK])
+        name = hashed_name('d', data)
+        files[name] = data
+        doc_files.append(name)
+
+    groups: Dict[str, List[str]] = {}
+    for term in sorted(postings):
+        groups.setdefault(term[0], []).append(term)
+
+    shards = {}
+    for prefix, terms in groups.items():
+        for key, data in split_shards(prefix, terms, postings).items():
+            name = hashed_name('t', data)
+            files[name] = data
+            shards[key] = name
+
+    manifest = {
+        'version': INDEX_VERSION,
+        'fingerprint': index_fingerprint,
+        'docs': len(docs),
+        'terms': len(postings),
+        'chunk': DOCS_PER_CHUNK,
+        'doc_files': doc_files,
+        'shards': dict(sorted(shards.items())),
+        'min_length': MIN_TERM_LENGTH,
+        'stopwords': sorted(STOPWORDS),
+    }
+    files['manifest.json'] = compact_json(manifest)
+    return {'manifest': manifest, 'files': files}
+
+
+def search_fingerprint(metadata: Dict[str, Any], navigation: Dict[str, Dict[str, Any]]) -> str:
+    """Fingerprint of everything the index is built from."""
+    return fingerprint(
+        INDEX_VERSION,
+        [[path, page['url'], page['title'], page.get('number'),
+          metadata.get(path, {}).get('search_terms')]
+         for path, page in navigation.items()]
+    )
+
+
+def write_search_index(index: Dict[str, Any], output_dir: Path, writer) -> Dict[str, Any]:
+    """
+    Write index files through an OutputWriter (unchanged files are left
+    alone) and delete shard/doc files that are no longer referenced.
+
+    Returns:
+        Size statistics (see index_stats)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, data in index['files'].items():
+        writer.write_bytes(output_dir / name, data)
+
+    for stale in output_dir.glob('[td]-*.json'):
+        if stale.name not in index['files']:
+            stale.unlink()
+
+    return index_stats(index)
+
+
+def index_stats(index: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index size and per-query download (gzip sizes, as served over HTTP).
+    """
+    files = index['files']
+    shard_names = set(index['manifest']['shards'].values())
+    shard_gz = [len(gzip.compress(files[n], 6)) for n in shard_names]
+    return {
+        'docs': index['manifest']['docs'],
+        'terms': index['manifest']['terms'],
+        'files': len(files),
+        'shards': len(shard_names),
+        'bytes': sum(len(d) for d in files.values()),
+        'gzip_bytes': sum(len(gzip.compress(d, 6)) for d in files.values()),
+        'manifest_gzip_bytes': len(gzip.compress(files['manifest.json'], 6)),
+        'max_shard_gzip_bytes': max(shard_gz, default=0),
+        'avg_shard_gzip_bytes': sum(shard_gz) // len(shard_gz) if shard_gz else 0,
+    }
+
+
+def update_search_index(
+    metadata: Dict[str, Any],
+    navigation: Dict[str, Dict[str, Any]],
+    output_dir: Path,
+    writer,
+    verbose: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild the index unless the one on disk was built from the same
+    inputs.
+
+    Returns:
+        Size statistics, or None if the existing index is up to date
+    """
+    output_dir = Path(output_dir)
+    index_fingerprint = search_fingerprint(metadata, navigation)
+    previous = load_manifest(output_dir)
+    if previous.get('fingerprint') == index_fingerprint and all(
+            (output_dir / name).exists()
+            for name in list(previous.get('shards', {}).values()) + previous.get('doc_files', [])):
+        if verbose:
+            print(f"      Search index up to date ({previous.get('docs', 0)} pages)")
+        return None
+
+    index = build_search_index(metadata, navigation, index_fingerprint)
+    return write_search_index(index, output_dir, writer)
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Read the manifest of a previously written index ({} if missing)."""
+    try:
+        with open(Path(output_dir) / 'manifest.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
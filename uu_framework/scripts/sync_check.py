@@ -7,16 +7,33 @@ have been updated by the professor.
 
 Usage:
     python3 sync_check.py <github_username>
+    python3 sync_check.py --all [--json report.json]
+
+--all checks every folder in estudiantes/ concurrently and prints a
+class-wide report (per student and per clase/ file) for the professor.
 
 This script is called by flow.sh after pulling from upstream.
 It compares file hashes to detect updates and warns the student.
+Inside a git checkout, tracked and unmodified files are compared by the
+blob IDs already stored in the git index (see git_index.py); only dirty
+or untracked files are read. Those hashes are cached in
+uu_framework/.cache/sync_hashes.json (see hash_cache.py), so repeated
+checks only re-read files that changed.
 """
 
 import os
 import sys
-import hashlib
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
+
+from file_index import FileIndex
+from content_index import ContentIndex
+from diff_stats import diff_stats_many, format_diff_stats
+from git_index import GitIndex
+from hash_cache import HashCache, DEFAULT_CACHE_PATH, hash_file, hash_blob
 
 
 # ANSI color codes for terminal output
@@ -26,23 +43,133 @@ GREEN = '\033[0;32m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'  # No Color
 
+HIDDEN = ['.*']
+
+# Score bonus per shared directory name when matching by content
+PATH_WEIGHT = 0.05
 
-def get_file_hash(filepath: Path) -> str:
-    """Calculate MD5 hash of file content."""
+
+def get_file_hash(
+    filepath: Path,
+    cache: Optional[HashCache] = None,
+    st: Optional[os.stat_result] = None,
+    git_index: Optional[GitIndex] = None
+) -> str:
+    """
+    Digest of file content: its git blob ID when `git_index` is given
+    (from the index if the file is clean), SHA-256 otherwise. A `cache`
+    must use the matching algorithm ('git-blob' or 'sha256').
+    """
+    if git_index is not None:
+        oid = git_index.blob_id(filepath, st)
+        if oid:
+            return oid
+    if cache is not None:
+        return cache.digest(filepath, st)
     try:
-        with open(filepath, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
-    except:
+        return hash_blob(filepath) if git_index is not None else hash_file(filepath)
+    except OSError:
         return ''
 
 
+def build_filename_index(clase_index: FileIndex) -> Dict[str, List[str]]:
+    """
+    Map each file name in clase/ to the relative paths that have it, in
+    Path.rglob order.
+    """
+    by_name: Dict[str, List[str]] = {}
+    for entry in clase_index.walk_files():
+        by_name.setdefault(entry.name, []).append(entry.rel)
+    return by_name
+
+
+def common_suffix_length(a: List[str], b: List[str]) -> int:
+    """Number of trailing path components two paths share."""
+    n = 0
+    while n < len(a) and n < len(b) and a[-1 - n] == b[-1 - n]:
+        n += 1
+    return n
+
+
+def best_candidate(candidates: List[str], student_rel: str) -> str:
+    """
+    Pick the clase/ file a student file was most likely copied from: the
+    candidate sharing the longest path suffix with it (e.g. a student's
+    05_bash/ejercicios/run.sh prefers clase/05_bash/ejercicios/run.sh over
+    clase/06_git/run.sh). Ties keep the first candidate in walk order.
+    """
+    return closest_paths(candidates, student_rel)[0]
+
+
+def closest_paths(candidates: List[str], student_rel: str) -> List[str]:
+    """Candidates sharing the longest path suffix with student_rel, in order."""
+    if len(candidates) == 1:
+        return candidates
+    student_parts = student_rel.split(os.sep)
+    scores = [common_suffix_length(rel.split(os.sep), student_parts) for rel in candidates]
+    best = max(scores)
+    return [rel for rel, score in zip(candidates, scores) if score == best]
+
+
+def find_origin(
+    student_dir: Path,
+    student_rel: str,
+    by_name: Dict[str, List[str]],
+    content: Optional[ContentIndex] = None
+) -> Optional[str]:
+    """
+    Relative clase/ path a student file was copied from, or None.
+
+    A single clase/ file with the same name (or one whose path is
+    closest) is taken directly. Otherwise, if a content index is given,
+    content decides: an exact copy anywhere in clase/ (the professor may
+    have renamed it since), else the most similar text file with the
+    same extension (the student may have edited their copy), with shared
+    directory names breaking near-ties.
+    """
+    name = os.path.basename(student_rel)
+    closest = closest_paths(by_name[name], student_rel) if name in by_name else []
+    if len(closest) == 1 or (closest and content is None):
+        return closest[0]
+    if content is None:
+        return None
+
+    student_path = student_dir / student_rel
+    exact = content.exact(content.digest(student_path))
+    if exact:
+        preferred = [rel for rel in exact if rel in closest] or exact
+        return best_candidate(preferred, student_rel)
+
+    similar = content.similar(student_path, os.path.splitext(name)[1])
+    if closest:
+        # Same-named candidates tied on path: take the most similar one
+        ranked = [rel for rel, _ in similar if rel in closest]
+        return ranked[0] if ranked else closest[0]
+    if not similar:
+        return None
+
+    student_dirs = student_rel.split(os.sep)[:-1]
+    return max(
+        similar,
+        key=lambda item: item[1] + PATH_WEIGHT * common_suffix_length(
+            item[0].split(os.sep)[:-1], student_dirs)
+    )[0]
+
+
 def find_matching_files(
     clase_dir: Path,
-    student_dir: Path
+    student_dir: Path,
+    by_name: Optional[Dict[str, List[str]]] = None,
+    content: Optional[ContentIndex] = None
 ) -> List[Tuple[Path, Path]]:
     """
     Find files in student directory that match files in clase directory.
 
+    Both trees are scanned once; each student file is then looked up by
+    name in the clase/ index (pass `by_name` to reuse one across calls),
+    falling back to `content` when the name is missing or ambiguous (see
+    find_origin).
+
     Returns list of (clase_file, student_file) tuples.
     """
     matches = []
@@ -50,60 +177,170 @@ def find_matching_files(
     if not student_dir.exists():
         return matches
 
-    # Get all files in student directory
-    for student_file in student_dir.rglob('*'):
-        if student_file.is_dir():
-            continue
+    if by_name is None:
+        by_name = build_filename_index(FileIndex(clase_dir))
 
-        # Skip hidden files
-        if any(part.startswith('.') for part in student_file.parts):
+    # Hidden files and directories are skipped (and not descended into)
+    student_index = FileIndex(student_dir, exclude=HIDDEN)
+    for entry in student_index.walk_files():
+        if entry.excluded:
             continue
 
-        # Look for matching file in clase/
         # Student might have copied from various subdirectories
-        filename = student_file.name
-
-        for clase_file in clase_dir.rglob(filename):
-            if clase_file.is_file():
-                matches.append((clase_file, student_file))
-                break
+        clase_rel = find_origin(student_dir, entry.rel, by_name, content)
+        if clase_rel is not None:
+            matches.append((clase_dir / clase_rel, student_dir / entry.rel))
 
     return matches
 
 
+def build_content_index(
+    clase_index: FileIndex,
+    cache: Optional[HashCache] = None,
+    git_index: Optional[GitIndex] = None
+) -> ContentIndex:
+    """Content index of clase/ using the same digests as the comparisons."""
+    return ContentIndex(clase_index, lambda path: get_file_hash(path, cache, None, git_index))
+
+
+def check_matches(
+    matches: List[Tuple[Path, Path]],
+    cache: Optional[HashCache] = None,
+    git_index: Optional[GitIndex] = None
+) -> List[Dict]:
+    """
+    Find matched pairs whose clase/ copy is newer and differs.
+
+    Only pairs whose clase/ copy is newer are hashed, and pairs of
+    different sizes are known to differ without hashing.
+
+    Returns list of dicts with update information.
+    """
+    updates = []
+
+    for clase_file, student_file in matches:
+        try:
+            clase_st = clase_file.stat()
+            student_st = student_file.stat()
+        except OSError:
+            continue
+
+        if clase_st.st_mtime <= student_st.st_mtime:
+            continue
+
+        if clase_st.st_size == student_st.st_size:
+            clase_hash = get_file_hash(clase_file, cache, clase_st, git_index)
+            student_hash = get_file_hash(student_file, cache, student_st, git_index)
+            if clase_hash == student_hash:
+                continue
+
+        # Files differ and clase file is newer - profesor may have updated
+        updates.append({
+            'clase_file': str(clase_file),
+            'student_file': str(student_file),
+            'type': 'updated',
+        })
+
+    return updates
+
+
 def check_for_updates(
     clase_dir: Path,
     student_dir: Path,
-    verbose: bool = False
+    verbose: bool = False,
+    cache: Optional[HashCache] = None,
+    git_index: Optional[GitIndex] = None
 ) -> List[Dict]:
     """
     Check for files that have been updated in clase/ but not in student directory.
 
     Returns list of dicts with update information.
     """
-    updates = []
-    matches = find_matching_files(clase_dir, student_dir)
-
-    for clase_file, student_file in matches:
-        clase_hash = get_file_hash(clase_file)
-        student_hash = get_file_hash(student_file)
-
-        if clase_hash != student_hash:
-            # Files differ - profesor may have updated
-            clase_mtime = clase_file.stat().st_mtime
-            student_mtime = student_file.stat().st_mtime
-
-            if clase_mtime > student_mtime:
-                # Clase file is newer
-                updates.append({
-                    'clase_file': str(clase_file),
-                    'student_file': str(student_file),
-                    'type': 'updated',
-                })
+    clase_index = FileIndex(clase_dir)
+    matches = find_matching_files(
+        clase_dir, student_dir,
+        build_filename_index(clase_index),
+        build_content_index(clase_index, cache, git_index)
+    )
+    updates = check_matches(matches, cache, git_index)
+
+    if verbose and git_index is not None:
+        print(f"[SYNC] Git index: {git_index.summary()}")
+    if verbose and cache is not None:
+        print(f"[SYNC] Hash cache: {cache.summary()}")
 
     return updates
 
 
+def check_roster(
+    clase_dir: Path,
+    estudiantes_dir: Path,
+    cache: Optional[HashCache] = None,
+    jobs: Optional[int] = None,
+    git_index: Optional[GitIndex] = None
+) -> Dict:
+    """
+    Check every student directory under estudiantes/ concurrently.
+
+    The clase/ filename and content indexes, the git index and the hash
+    cache are shared by all workers. Paths in the report are relative to
+    the repository root.
+
+    Returns:
+        Dict with 'students' (per-student matched/stale files), 'files'
+        (clase/ file -> students with a stale copy) and 'summary'
+    """
+    root = clase_dir.parent
+    clase_index = FileIndex(clase_dir)
+    by_name = build_filename_index(clase_index)
+    content = build_content_index(clase_index, cache, git_index)
+    student_dirs = sorted(
+        (d for d in estudiantes_dir.iterdir() if d.is_dir() and not d.name.startswith('.')),
+        key=lambda d: d.name.lower()
+    )
+
+    def check_student(student_dir: Path) -> Dict:
+        matches = find_matching_files(clase_dir, student_dir, by_name, content)
+        stale = [
+            {
+                'clase_file': os.path.relpath(u['clase_file'], root),
+                'student_file': os.path.relpath(u['student_file'], root),
+                'type': u['type'],
+            }
+            for u in check_matches(matches, cache, git_index)
+        ]
+        return {'student': student_dir.name, 'matched': len(matches), 'stale': stale}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        students = list(pool.map(check_student, student_dirs))
+
+    files: Dict[str, List[str]] = {}
+    for result in students:
+        for update in result['stale']:
+            files.setdefault(update['clase_file'], []).append(result['student'])
+
+    return {
+        'students': students,
+        'files': dict(sorted(files.items(), key=lambda item: (-len(item[1]), item[0]))),
+        'summary': {
+            'students': len(students),
+            'students_stale': sum(1 for r in students if r['stale']),
+            'matched': sum(r['matched'] for r in students),
+            'stale': sum(len(r['stale']) for r in students),
+        },
+    }
+
+
+def add_diff_stats(updates: List[Dict], root: Path = Path('.')) -> None:
+    """
+    Attach line-diff stats (student copy -> clase/ version) to each
+    update as 'diff'. Paths relative to `root` are resolved against it.
+    """
+    pairs = [(root / u['student_file'], root / u['clase_file']) for u in updates]
+    for update, stats in zip(updates, diff_stats_many(pairs)):
+        update['diff'] = stats
+
+
 def print_warnings(updates: List[Dict], username: str):
     """Print warnings about updated files."""
     if not updates:
@@ -121,6 +358,8 @@ def print_warnings(updates: List[Dict], username: str):
     for update in updates:
         print(f"  {BLUE}Archivo:{NC} {update['student_file']}")
         print(f"  {BLUE}Fuente:{NC}  {update['clase_file']}")
+        if 'diff' in update:
+            print(f"  {BLUE}Cambios:{NC} {format_diff_stats(update['diff'])}")
         print()
 
     print(f"{YELLOW}Para ver las diferencias, usa:{NC}")
@@ -136,32 +375,114 @@ def print_warnings(updates: List[Dict], username: str):
     print()
 
 
+def print_roster(report: Dict):
+    """Print the class-wide report as text."""
+    summary = report['summary']
+    print(f"\n{YELLOW}{'=' * 60}{NC}")
+    print(f"{YELLOW}[SYNC] Revision de {summary['students']} estudiantes{NC}")
+    print(f"{YELLOW}{'=' * 60}{NC}")
+    print()
+    print(f"  {'Estudiante':30s} {'Archivos':>9s} {'Desactualizados':>16s}")
+    for result in report['students']:
+        color = RED if result['stale'] else GREEN
+        print(f"  {result['student']:30s} {result['matched']:9d} "
+              f"{color}{len(result['stale']):16d}{NC}")
+    print()
+    print(f"  {summary['students_stale']} de {summary['students']} estudiantes con "
+          f"{summary['stale']} de {summary['matched']} archivos desactualizados")
+
+    if report['files']:
+        copies: Dict[str, List[Dict]] = {}
+        for result in report['students']:
+            for update in result['stale']:
+                copies.setdefault(update['clase_file'], []).append(update)
+        print()
+        print(f"{YELLOW}Archivos de clase/ con copias desactualizadas:{NC}")
+        for clase_file, students in report['files'].items():
+            print(f"  {BLUE}{clase_file}{NC} ({len(students)})")
+            for update in copies[clase_file]:
+                diff = f": {format_diff_stats(update['diff'])}" if 'diff' in update else ''
+                print(f"    {update['student_file']}{diff}")
+    print()
+
+
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(
+        description='Verifica si hay archivos actualizados por el profesor.'
+    )
+    parser.add_argument('username', nargs='?', help='Usuario de GitHub (estudiantes/<usuario>)')
+    parser.add_argument('--all', action='store_true',
+                        help='Revisar todos los estudiantes (reporte para el profesor)')
+    parser.add_argument('--json', metavar='PATH',
+                        help="Con --all, guardar el reporte en JSON ('-' para stdout)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Con --all, numero de hilos (default: automatico)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='No usar ni actualizar el cache de hashes')
+    parser.add_argument('--no-diff', action='store_true',
+                        help='No calcular estadisticas de diff de los archivos desactualizados')
+    parser.add_argument('--no-git', action='store_true',
+                        help='No usar los hashes del indice de git (leer todos los archivos)')
+    args = parser.parse_args()
+
+    if not args.username and not args.all:
         print(f"Uso: {sys.argv[0]} <github_username>")
         print("Este script verifica si hay archivos actualizados por el profesor.")
         sys.exit(1)
 
-    username = sys.argv[1]
-
     # Paths
     repo_root = Path.cwd()
     clase_dir = repo_root / 'clase'
-    student_dir = repo_root / 'estudiantes' / username
+    estudiantes_dir = repo_root / 'estudiantes'
 
     if not clase_dir.exists():
         print(f"{RED}Error: No se encontro el directorio clase/{NC}")
         sys.exit(1)
 
-    if not student_dir.exists():
-        # Student directory doesn't exist yet - nothing to check
-        sys.exit(0)
-
-    # Check for updates
-    updates = check_for_updates(clase_dir, student_dir)
-
-    # Print warnings
-    print_warnings(updates, username)
+    # Blob IDs of clean tracked files come from the git index (one git call)
+    git_index = None
+    if not args.no_git:
+        scope = 'estudiantes' if args.all else f"estudiantes/{args.username}"
+        git_index = GitIndex.load(repo_root, ['clase', scope])
+
+    # Digests of other files are cached between runs
+    algorithm = 'git-blob' if git_index is not None else 'sha256'
+    cache = None if args.no_cache else HashCache(repo_root / DEFAULT_CACHE_PATH, algorithm)
+
+    if args.all:
+        if not estudiantes_dir.is_dir():
+            print(f"{RED}Error: No se encontro el directorio estudiantes/{NC}")
+            sys.exit(1)
+        report = check_roster(clase_dir, estudiantes_dir, cache, args.jobs, git_index)
+        if not args.no_diff:
+            add_diff_stats([u for r in report['students'] for u in r['stale']], repo_root)
+        if args.json == '-':
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            print_roster(report)
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2, ensure_ascii=False)
+                print(f"Reporte JSON: {args.json}")
+    else:
+        student_dir = estudiantes_dir / args.username
+        if not student_dir.exists():
+            # Student directory doesn't exist yet - nothing to check
+            sys.exit(0)
+
+        # Check for updates
+        updates = check_for_updates(clase_dir, student_dir, cache=cache, git_index=git_index)
+        if not args.no_diff:
+            add_diff_stats(updates)
+
+        # Print warnings
+        print_warnings(updates, args.username)
+
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError:
+            pass
 
     # Return 0 even if there are updates (don't block the sync)
     sys.exit(0)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+File Watching Script
+
+Watches content directories and individual files for changes, used by
+`preprocess.py --watch` to keep _data/*.json up to date while authoring.
+
+Uses inotify on Linux (via ctypes, no extra dependencies) and falls back
+to polling mtimes elsewhere or when inotify is unavailable (e.g. bind
+mounts from macOS into Docker do not deliver inotify events).
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Returned instead of a set of paths when events were lost and
+# the caller should rescan everything
+FULL_RESCAN = None
+
+# inotify constants (from <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """
+    Recursive inotify watcher.
+
+    Directories are watched recursively (new subdirectories are added as
+    they appear). Individual files are watched through their parent
+    directory, so editors that save via rename are handled correctly.
+    """
+
+    def __init__(self, dirs: List[Path], files: List[Path]):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.wds: Dict[int, Path] = {}
+        self.recursive: Set[Path] = set()
+        # Parent dir -> names of individually watched files
+        self.file_names: Dict[Path, Set[str]] = {}
+
+        for d in dirs:
+            if d.is_dir():
+                self.recursive.add(d)
+                self.add_tree(d)
+        for f in files:
+            parent = f.parent
+            self.file_names.setdefault(parent, set()).add(f.name)
+            if not any(parent == r or r in parent.parents for r in self.recursive):
+                self.add_watch(parent)
+
+    def add_watch(self, path: Path) -> None:
+        """Watch a single directory."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.wds[wd] = path
+
+    def add_tree(self, root: Path) -> None:
+        """Watch a directory and all of its subdirectories."""
+        self.add_watch(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self.add_watch(Path(dirpath) / name)
+
+    def is_recursive(self, path: Path) -> bool:
+        """True if path lives under a recursively watched directory."""
+        return any(path == r or r in path.parents for r in self.recursive)
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        """
+        Wait up to `timeout` seconds (None = forever) for events.
+
+        Returns:
+            Set of changed paths (empty on timeout), or FULL_RESCAN
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                return FULL_RESCAN
+            if mask & IN_IGNORED:
+                self.wds.pop(wd, None)
+                continue
+
+            parent = self.wds.get(wd)
+            if parent is None:
+                continue
+            path = parent / name if name else parent
+
+            if not self.is_recursive(path):
+                # Parent of an individually watched file
+                if name not in self.file_names.get(parent, set()):
+                    continue
+            elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self.add_tree(path)
+
+            changed.add(path)
+
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Portable watcher that compares (mtime, size) snapshots at an interval.
+    """
+
+    def __init__(self, dirs: List[Path], files: List[Path], interval: float = 1.0):
+        self.dirs = [d for d in dirs if d.is_dir()]
+        self.files = list(files)
+        self.interval = interval
+        self.state = self.snapshot()
+
+    def snapshot(self) -> Dict[Path, Tuple[int, int, bool]]:
+        """Stat every watched path."""
+        state = {}
+        for root in self.dirs:
+            for dirpath, dirnames, filenames in os.walk(root):
+                base = Path(dirpath)
+                for name in dirnames:
+                    state[base / name] = (0, 0, True)
+                for name in filenames:
+                    try:
+                        st = os.stat(base / name)
+                    except OSError:
+                        continue
+                    state[base / name] = (st.st_mtime_ns, st.st_size, False)
+        for f in self.files:
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            state[f] = (st.st_mtime_ns, st.st_size, False)
+        return state
+
+    def read(self, timeout: Optional[float]) -> Optional[Set[Path]]:
+        """
+        Poll until something changes or `timeout` seconds pass (None = forever).
+
+        Returns:
+            Set of changed paths (empty on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self.snapshot()
+            changed = {p for p in current.keys() | self.state.keys()
+                       if current.get(p) != self.state.get(p)}
+            self.state = current
+            if changed:
+                return changed
+
+            if deadline is None:
+                time.sleep(self.interval)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def create_watcher(
+    dirs: List[Path],
+    files: List[Path],
+    poll: bool = False,
+    interval: float = 1.0
+):
+    """
+    Create the best available watcher: inotify on Linux, polling otherwise
+    (or when poll=True).
+    """
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(dirs, files)
+        except (OSError, AttributeError) as e:
+            print(f"      Warning: inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(dirs, files, interval)
+
+
+def wait_for_changes(watcher, debounce: float = 0.3) -> Optional[Set[Path]]:
+    """
+    Block until something changes, then keep collecting events until
+    `debounce` seconds pass without new ones. Bursts of saves (editor
+    temp files, git checkouts) are reported as a single batch.
+
+    Returns:
+        Set of changed paths, or FULL_RESCAN
+    """
+    changed = watcher.read(None)
+    if changed is FULL_RESCAN:
+        return FULL_RESCAN
+
+    while True:
+        more = watcher.read(debounce)
+        if more is FULL_RESCAN:
+            return FULL_RESCAN
+        if not more:
+            return changed
+        changed |= more